@@ -1,99 +1,173 @@
+import time
+_STARTUP = time.perf_counter()
+
+import logging
 import tkinter as tk
 from tkinter import ttk, messagebox, font
 import os
 
-# Safe Pillow import — if not installed, we'll fallback to placeholders without crashing.
-try:
-    from PIL import Image, ImageTk
-    PIL_AVAILABLE = True
-except Exception:
-    PIL_AVAILABLE = False
-    print("Pillow not available — poster images will use placeholders.")
+import numpy as np
 
+from primeflix import metrics
+from primeflix.client import HttpClient
+from primeflix.core import Primeflix
+from primeflix.favourites import FavouritesStore
+from primeflix.atlas import open_atlas, write_atlas
+from primeflix.posters import POSTER_CACHE, PosterLoader, PosterPipeline
 
-BG_PATH = "/Users/ralphblesson/Desktop/selsnium/Untitled design (2).png"
-OVERLAY_PATH = "/Users/ralphblesson/Downloads/NETFLIXBG2.png"
 
-root = tk.Tk()
-root.title("PRIMEFLIX 🎬")
-root.attributes("-fullscreen", True)   # fullscreen; press Esc to exit
+log = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO, format="%(message)s")
 
-favourites = []
 
-# --- Poster preprocessing helper (paste after MOVIES list) ---
-def preprocess_movie_posters(movies, dest_dir="/tmp/primeflix_posters", size=(200, 300), overwrite=False):
+def log_phase(name):
+    """Startup timing: milliseconds since the script started."""
+    log.info("[startup] %s: %.0f ms", name, (time.perf_counter() - _STARTUP) * 1000)
+
+log_phase("imports")
+
+# Pillow is imported the first time a poster is drawn, not at startup.
+# If it's not installed, posters fall back to placeholders without crashing.
+_IMAGETK = None
+
+def _imagetk():
+    """PIL.ImageTk, or None if Pillow is not installed."""
+    global _IMAGETK
+    if _IMAGETK is None:
+        try:
+            from PIL import ImageTk
+            _IMAGETK = ImageTk
+        except Exception:
+            _IMAGETK = False
+            print("Pillow not available — poster images will use placeholders.")
+    return _IMAGETK or None
+
+
+# posters are decoded on worker threads; results are picked up by _pump_posters
+POSTER_LOADER = PosterLoader(POSTER_CACHE)
+
+# PRIMEFLIX_POSTER_ATLAS=posters.atlas (python -m primeflix.atlas posters.atlas)
+# serves posters from one memory-mapped file, keyed by movie id, at every size
+# drawn here; posters missing from it still come from the source files.
+POSTER_ATLAS = open_atlas(os.environ.get("PRIMEFLIX_POSTER_ATLAS"))
+
+
+def draw_poster(canvas, path, size, font_size=12, movie_id=None):
     """
-    - Ensures each movie with an 'image' path is valid.
-    - Resizes images to `size` and writes them into dest_dir.
-    - Updates movie['image'] to the resized file path for consistent use by Browse.
-    - Prints missing/invalid paths so you can fix them.
+    Show the poster at `path` on `canvas` (sized `size`). Cached posters are
+    drawn at once; otherwise a placeholder is drawn now and the poster is
+    swapped in when a worker thread has read it from the atlas (looked up by
+    `movie_id`, used only if made from the current file) or decoded the file. Drawing again on the same canvas (a recycled tile, a new
+    selection) cancels the previous request.
     """
-    if not PIL_AVAILABLE:
-        print("Pillow not available — skipping poster preprocessing.")
+    w, h = size
+    POSTER_LOADER.cancel(canvas)
+    canvas.delete("all")
+    canvas.image = None
+
+    def placeholder(text):
+        canvas.create_rectangle(4, 4, w - 4, h - 4, outline="#333", width=2, fill="#222")
+        canvas.create_text(w // 2, h // 2, text=text, fill="white", font=("Arial", font_size), justify="center")
+
+    requested = time.perf_counter()
+
+    def show(img, error):
+        metrics.observe("poster_shown_seconds", time.perf_counter() - requested)
+        if not canvas.winfo_exists():
+            return
+        canvas.delete("all")
+        if isinstance(error, FileNotFoundError):
+            placeholder("Poster\nPlaceholder")
+        elif error is not None:
+            print(f"Failed to load poster '{path}': {error}")
+            metrics.inc("poster_errors_total")
+            placeholder("Poster\nUnavailable")
+        else:
+            photo = _imagetk().PhotoImage(img)
+            canvas.create_image(0, 0, image=photo, anchor="nw")
+            canvas.image = photo  # keep ref to avoid GC
+
+    if not (path and _imagetk()):
+        placeholder("Poster\nPlaceholder")
         return
+    img = POSTER_CACHE.peek(path, size)
+    if img is not None:
+        show(img, None)
+        return
+    placeholder("Loading…")
+    load = None
+    if POSTER_ATLAS is not None and movie_id is not None:
+        def load():  # on the worker: the atlas read, JPEG decode and stat stay off the Tk thread
+            return POSTER_ATLAS.get(movie_id, size, source=path) or POSTER_CACHE.get(path, size)
+    POSTER_LOADER.request(canvas, path, size, show, load=load)
 
-    os.makedirs(dest_dir, exist_ok=True)
-    from PIL import Image
 
-    missing = []
-    count = 0
-    for m in movies:
-        p = m.get("image")
-        if not p:
-            missing.append((m.get("title", "<unknown>"), "no path set"))
-            continue
+BG_PATH = "/Users/ralphblesson/Desktop/selsnium/Untitled design (2).png"
+OVERLAY_PATH = "/Users/ralphblesson/Downloads/NETFLIXBG2.png"
 
-        # normalize path
-        p = os.path.expanduser(p)
-        p = os.path.abspath(p)
+root = tk.Tk()
+root.title("PRIMEFLIX 🎬")
+root.attributes("-fullscreen", True)   # fullscreen; press Esc to exit
+root.configure(bg="black")             # until the backgrounds are loaded
 
-        if not os.path.exists(p):
-            missing.append((m.get("title", "<unknown>"), p))
-            continue
+# hand posters decoded off-thread back to Tk (widgets may only be touched here)
+def _pump_posters():
+    POSTER_LOADER.drain()
+    root.after(15, _pump_posters)
 
-        # destination path
-        safe_name = f"{m['title'].strip().replace(' ', '_')}_{m.get('year','').__str__()}"
-        # remove characters that might break filenames
-        safe_name = "".join(ch for ch in safe_name if ch.isalnum() or ch in ("_", "-"))
-        ext = ".jpg"
-        out_path = os.path.join(dest_dir, safe_name + ext)
+_pump_posters()
 
-        # skip if exists and not overwrite
-        if not overwrite and os.path.exists(out_path):
-            m["image"] = out_path
-            continue
 
-        try:
-            img = Image.open(p)
-            img = img.convert("RGB")
-            img = img.resize(size, Image.LANCZOS)
-            img.save(out_path, quality=90)
-            m["image"] = out_path
-            count += 1
-        except Exception as e:
-            missing.append((m.get("title", "<unknown>"), f"failed to process: {e}"))
-
-    print(f"Poster preprocessing done — processed {count} images. {len(missing)} missing/fails:")
-    for t, reason in missing:
-        print(" -", t, "->", reason)
+def _page_timer(page):
+    """Record how long `page` takes from now until Tk is idle again (built and laid out)."""
+    if metrics.enabled():
+        start = time.perf_counter()
+        root.after_idle(lambda: metrics.observe("page_build_seconds", time.perf_counter() - start, page=page))
 
-# call it immediately after YOUR MOVIES list definition:
-# preprocess_movie_posters(MOVIES, dest_dir="/mnt/data/primeflix_posters", size=(200,300))
+def describe(movie):
+    """Text for the description labels of the detail views."""
+    return "Description:\n" + (movie.get("description") or "No synopsis yet.")
 
+# --- Poster preprocessing helper (paste after MOVIES list) ---
+def preprocess_movie_posters(movies, dest_dir="/tmp/primeflix_posters", size=(200, 300), overwrite=False, workers=1):
+    """
+    - Resizes each movie's 'image' to `size` into dest_dir (see primeflix.posters.PosterPipeline).
+    - Only new or changed posters are redone; dest_dir/manifest.json tracks the sources.
+    - Updates movie['image'] to the resized file path for consistent use by Browse.
+    - Returns a PipelineReport (counts, throughput, failures) and logs missing/invalid paths.
+    Runs inline by default: pool workers would re-import this script (and open Tk).
+    For big refreshes use the CLI instead: python -m primeflix.posters movies.json --dest DIR
+    """
+    return PosterPipeline(dest_dir, size=size, workers=workers).run(movies, overwrite=overwrite)
 
-# --- Load background images (keep references to avoid GC) ---
-bg_image = tk.PhotoImage(file=BG_PATH)
-overlay_image = tk.PhotoImage(file=OVERLAY_PATH)
+# call it immediately after YOUR MOVIES list definition:
+# preprocess_movie_posters(MOVIES, dest_dir="/mnt/data/primeflix_posters", size=(200,300))
 
+def preprocess_poster_atlas(catalog, path="/tmp/primeflix_posters.atlas", fmt="jpeg", workers=1):
+    """
+    - Packs every poster of `catalog`, at every size the UI draws, into the atlas at `path`.
+    - Only new or changed sources are decoded; the rest is copied from the previous atlas.
+    - Start the app with PRIMEFLIX_POSTER_ATLAS=path to draw posters from it.
+    - Returns a PipelineReport. CLI: python -m primeflix.atlas posters.atlas [--catalog catalog.pfx]
+    """
+    return write_atlas(catalog, path, fmt=fmt, workers=workers)
 
-root._bg_image = bg_image
-root._overlay_image = overlay_image
 
-# Place background and overlay
-bg_label = tk.Label(root, image=bg_image)
-bg_label.place(x=0, y=0, relwidth=1, relheight=1)
-overlay_label = tk.Label(root, image=overlay_image)
-overlay_label.place(x=0, y=0, relwidth=1, relheight=1)
+# --- Background images ---
+# Decoding two full-screen PNGs is the slowest part of startup, so they are
+# loaded once the window is up and slid in below everything else.
+def load_backgrounds():
+    for attr, path in (("_overlay_image", OVERLAY_PATH), ("_bg_image", BG_PATH)):
+        try:
+            image = tk.PhotoImage(file=path)
+        except tk.TclError as e:
+            print(f"Background not loaded: {e}")
+            continue
+        setattr(root, attr, image)  # keep a reference to avoid GC
+        label = tk.Label(root, image=image)
+        label.place(x=0, y=0, relwidth=1, relheight=1)
+        label.lower()  # overlay first, then the background below it
+    log_phase("backgrounds")
 
 # --- Navbar ---
 navbar_height = 80
@@ -110,8 +184,292 @@ search_text_label = tk.Label(
 )
 search_text_label.place(relx=0.5, rely=0.4, anchor="center")
 
+# --- Virtual result list (search results) ---
+class VirtualResultView:
+    """
+    A Treeview over any number of ranked results that only holds the rows in view.
+    The scrollbar, mouse wheel and arrow / page keys move a window over the
+    `total` matches and those few rows are refilled, so 100k results open as
+    fast as 10. In relevance order the ids come from fetch(limit, cursor), a
+    page past the last one loaded at a time, as the window reaches them.
+    Clicking Title / Year / Rating fetches every match once (fetch(None, None))
+    and sorts it through the catalog's precomputed orders (Catalog.sort_ids);
+    a second click reverses, a third goes back to relevance order. Row iids
+    are movie ids.
+    """
+
+    SORTABLE = {"Title": "title", "Year": "year", "Rating": "rating"}
+
+    def __init__(self, tree, scrollbar, page, fetch, row_height):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.row_height = row_height
+        self.fetch = fetch
+        self.total = page.total
+        self.cursor = page.cursor  # of the last relevance-ordered id loaded, None = all loaded
+        self.relevance = np.asarray(page.ids, np.int64)
+        self.ids = self.relevance
+        self.top = 0
+        self.rows = 1
+        self.selected = None      # movie id
+        self.selected_pos = None  # its position in self.ids
+        self.sort = None          # (column, descending) or None = relevance
+        scrollbar.configure(command=self.yview)
+        for col in tree["columns"]:
+            tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+        tree.bind("<Configure>", self._on_resize)
+        tree.bind("<<TreeviewSelect>>", self._on_select, add="+")
+        tree.bind("<MouseWheel>", lambda e: self.scroll(-3 if e.delta > 0 else 3))
+        tree.bind("<Button-4>", lambda e: self.scroll(-3))
+        tree.bind("<Button-5>", lambda e: self.scroll(3))
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-page"), ("<Next>", "page"),
+                          ("<Home>", "home"), ("<End>", "end")):
+            tree.bind(key, lambda e, s=step: self._on_key(s))
+
+    def __len__(self):
+        return self.total
+
+    def _load(self, end):
+        """Fetch relevance-ordered ids up to position `end` (one request)."""
+        missing = end - len(self.relevance)
+        if missing <= 0 or self.cursor is None:
+            return
+        page = self.fetch(max(missing, SEARCH_PAGE_SIZE), self.cursor)
+        self.relevance = np.concatenate([self.relevance, np.asarray(page.ids, np.int64)])
+        self.cursor = page.cursor
+        if self.cursor is None:
+            self.total = len(self.relevance)
+        if self.sort is None:
+            self.ids = self.relevance
+
+    def render(self):
+        if self.sort is None:
+            self._load(min(self.top, self.total - self.rows) + self.rows)
+        n = len(self)
+        self.top = max(0, min(self.top, n - self.rows))
+        window = self.ids[self.top:self.top + self.rows]
+        self.tree.delete(*self.tree.get_children())
+        for m in MOVIES.rows(window):
+            self.tree.insert("", "end", iid=str(m.id), values=(m["title"], m["year"], m["rating"], ", ".join(m["genres"])))
+        if self.selected_pos is not None and self.top <= self.selected_pos < self.top + self.rows:
+            self.tree.selection_set(str(self.selected))
+            self.tree.focus(str(self.selected))
+        self.scrollbar.set(self.top / n if n else 0, (self.top + len(window)) / n if n else 1)
+
+    def scroll(self, rows):
+        self.top += rows
+        self.render()
+        return "break"
+
+    def yview(self, *args):
+        """Scrollbar command: ("moveto", fraction) or ("scroll", n, "units" | "pages")."""
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self))
+            self.render()
+        elif args[0] == "scroll":
+            self.scroll(int(args[1]) * (self.rows if args[2] == "pages" else 1))
+
+    def select_pos(self, pos):
+        if not len(self):
+            return
+        pos = max(0, min(pos, len(self) - 1))
+        if self.sort is None:
+            self._load(pos + 1)
+            pos = min(pos, len(self.ids) - 1)
+        if pos < self.top:
+            self.top = pos
+        elif pos >= self.top + self.rows:
+            self.top = pos - self.rows + 1
+        self.selected, self.selected_pos = int(self.ids[pos]), pos
+        self.render()
+
+    def sort_by(self, column):
+        by = self.SORTABLE.get(column)
+        if by is None:
+            return
+        first = column != "Title"  # numbers start high-to-low, titles A-Z
+        if self.sort is None or self.sort[0] != column:
+            self.sort = (column, first)
+        elif self.sort[1] == first:
+            self.sort = (column, not first)
+        else:
+            self.sort = None
+        if self.sort is not None and self.cursor is not None:
+            # the column orders need every match; they are in relevance order too
+            page = self.fetch(None, None)
+            self.relevance, self.cursor, self.total = np.asarray(page.ids, np.int64), None, len(page.ids)
+        self.ids = self.relevance if self.sort is None else MOVIES.sort_ids(self.relevance, by, self.sort[1])
+        for col in self.tree["columns"]:
+            arrow = "" if self.sort is None or self.sort[0] != col else (" ▼" if self.sort[1] else " ▲")
+            self.tree.heading(col, text=col + arrow)
+        self.top = 0
+        if self.selected is not None:
+            self.select_pos(int(np.flatnonzero(self.ids == self.selected)[0]))
+        else:
+            self.render()
+
+    def _on_resize(self, event):
+        header = self.row_height + 4
+        rows = max(1, (event.height - header) // self.row_height)
+        if rows != self.rows:
+            self.rows = rows
+            self.render()
+
+    def _on_select(self, event=None):
+        sel = self.tree.selection()
+        if sel:
+            self.selected = int(sel[0])
+            self.selected_pos = self.top + self.tree.index(sel[0])
+
+    def _on_key(self, step):
+        pos = self.selected_pos if self.selected_pos is not None else self.top
+        if step == "home":
+            pos = 0
+        elif step == "end":
+            pos = len(self) - 1
+        elif step in ("page", "-page"):
+            pos += self.rows if step == "page" else -self.rows
+        else:
+            pos += step
+        self.select_pos(pos)
+        return "break"
+
+
+# --- Virtualized poster grid (Browse page) ---
+class VirtualPosterGrid:
+    """
+    Shows `movies` as a `cols`-wide grid of poster tiles on a scrolling canvas,
+    but only builds tiles for the rows in view (+ `overscan` rows each side).
+    scroll_frame (canvas item `window_id`) is just a band as tall as those rows:
+    it is moved down the canvas as you scroll, and tiles that leave the view are
+    rebound to the movies coming in, so widget count stays constant for any
+    catalog size (and no widget gets taller than the screen).
+    """
+
+    TILE_W = 260   # 200px poster + frame/grid padding
+    TILE_H = 440   # poster + up to 3 title lines + rating line
+
+    def __init__(self, canvas, scroll_frame, window_id, movies, on_click, cols=4, overscan=1):
+        self.canvas = canvas
+        self.frame = scroll_frame
+        self.window_id = window_id
+        self.movies = movies
+        self.on_click = on_click
+        self.cols = cols
+        self.overscan = overscan
+        self.rows = -(-len(movies) // cols)
+        self.x = 0
+        self.band_top = 0
+        self.tiles = {}   # movie index -> tile currently showing it
+        self.spare = []   # built but unbound tiles
+        scroll_frame.configure(width=cols * self.TILE_W, height=self.TILE_H)
+
+    @property
+    def width(self):
+        return self.cols * self.TILE_W
+
+    @property
+    def height(self):
+        return max(self.rows, 1) * self.TILE_H
+
+    def center(self):
+        """Center the grid horizontally and size the scroll region to the full grid."""
+        canvas_width = self.canvas.winfo_width()
+        self.x = max((canvas_width - self.width) // 2, 0)
+        self.canvas.coords(self.window_id, self.x, self.band_top)
+        self.canvas.configure(scrollregion=(0, 0, max(canvas_width, self.width), self.height))
+
+    def _make_tile(self):
+        frame = tk.Frame(self.frame, bg="black", padx=10, pady=10)
+        poster = tk.Canvas(frame, width=200, height=300, bg="#333", highlightthickness=0, cursor="hand2")
+        poster.pack()
+        label = tk.Label(frame, fg="white", bg="black", font=("Arial", 14, "bold"),
+                         cursor="hand2", wraplength=200, justify="center")
+        label.pack(pady=5)
+        meta = tk.Label(frame, fg="white", bg="black", font=("Arial", 10))
+        meta.pack()
+        tile = {"frame": frame, "poster": poster, "label": label, "meta": meta, "movie": None}
+        # bound once; the tile's current movie is looked up at click time
+        poster.bind("<Button-1>", lambda e, t=tile: self.on_click(t["movie"]))
+        label.bind("<Button-1>", lambda e, t=tile: self.on_click(t["movie"]))
+        return tile
+
+    def _bind(self, tile, index):
+        movie = self.movies[index]
+        tile["movie"] = movie
+        tile["label"].config(text=movie["title"])
+        tile["meta"].config(text=f"⭐ {movie['rating']} | {movie['year']}")
+
+        draw_poster(tile["poster"], movie.get("image"), (200, 300), movie_id=movie.id)
+
+    def visible_rows(self):
+        """[first, last) grid rows that should have tiles right now."""
+        top = self.canvas.canvasy(0)
+        bottom = top + max(self.canvas.winfo_height(), self.TILE_H)
+        first = max(int(top // self.TILE_H) - self.overscan, 0)
+        last = min(int(bottom // self.TILE_H) + 1 + self.overscan, self.rows)
+        return first, max(last, first)
+
+    def refresh(self):
+        with metrics.timer("grid_refresh_seconds"):
+            self._refresh()
+
+    def _refresh(self):
+        first, last = self.visible_rows()
+        start, stop = first * self.cols, min(last * self.cols, len(self.movies))
+        for index in [i for i in self.tiles if not start <= i < stop]:
+            tile = self.tiles.pop(index)
+            tile["frame"].place_forget()
+            POSTER_LOADER.cancel(tile["poster"])
+            self.spare.append(tile)
+
+        # move the band to the first rendered row, then lay tiles out inside it
+        self.band_top = first * self.TILE_H
+        self.frame.configure(height=max(last - first, 1) * self.TILE_H)
+        self.canvas.coords(self.window_id, self.x, self.band_top)
+        for index in range(start, stop):
+            tile = self.tiles.get(index)
+            if tile is None:
+                tile = self.spare.pop() if self.spare else self._make_tile()
+                self._bind(tile, index)
+                self.tiles[index] = tile
+            row, col = divmod(index, self.cols)
+            tile["frame"].place(x=col * self.TILE_W + 20, y=(row - first) * self.TILE_H + 20)
+
+
+# --- Browse feed ---
+class FeedRows:
+    """
+    Rows of the Browse feed for `favourite_ids` (see Primeflix.feed_page), as a
+    sequence VirtualPosterGrid can index: pages are requested from SERVICE
+    the first time the grid reaches them. The feed is kept per session, so
+    reopening Browse with the same favourites shows it again without rescoring.
+    """
+
+    def __init__(self, favourite_ids, page_size=None):
+        self.favourite_ids = favourite_ids
+        self.page_size = page_size or BROWSE_PAGE_SIZE
+        first = SERVICE.feed_page(favourite_ids, self.page_size, 0, session=FEED_SESSION)
+        self.ids = list(first.ids)
+        self.total = first.total
+
+    def __len__(self):
+        return self.total
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.total:
+            raise IndexError(i)
+        if i >= len(self.ids):
+            # a scrollbar drag may jump far ahead: one request up to the next page boundary
+            need = i + 1 - len(self.ids)
+            limit = -(-need // self.page_size) * self.page_size
+            self.ids.extend(SERVICE.feed_page(self.favourite_ids, limit, len(self.ids), session=FEED_SESSION).ids)
+        return MOVIES.rows((self.ids[i],))[0]
+
+
 # Function to open a new page
 def open_page(page_name):
+    _page_timer(page_name)
     new_window = tk.Toplevel(root)
     new_window.title(page_name)
     new_window.attributes("-fullscreen", True)
@@ -139,16 +497,9 @@ def open_page(page_name):
         scroll_frame = tk.Frame(canvas, bg="black")
         window_id = canvas.create_window((0, 0), window=scroll_frame, anchor="nw")
 
-        # keep image refs to avoid GC
-        new_window._images = []
-
         # center function (defined early so detail panel can call it)
         def center_grid(event=None):
-            canvas_width = canvas.winfo_width()
-            frame_reqw = scroll_frame.winfo_reqwidth()
-            x = max((canvas_width - frame_reqw) // 2, 0)
-            canvas.coords(window_id, x, 0)
-            canvas.configure(scrollregion=canvas.bbox("all"))
+            grid.center()
 
         # In-place detail panel (seamless — no extra Toplevel)
         detail_panel = None
@@ -178,28 +529,13 @@ def open_page(page_name):
             # poster in detail panel (try image)
             poster_box = tk.Canvas(detail_panel, width=260, height=390, bg="#111", highlightthickness=0)
             poster_box.pack(pady=8)
-            poster_path = m.get("image")
-            if poster_path and PIL_AVAILABLE and os.path.exists(poster_path):
-                try:
-                    img = Image.open(poster_path)
-                    img = img.resize((260, 390), Image.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    poster_box.create_image(0, 0, image=photo, anchor="nw")
-                    poster_box.image = photo
-                    new_window._images.append(photo)
-                except Exception:
-                    poster_box.create_rectangle(4, 4, 256, 386, outline="#333", width=2, fill="#222")
-                    poster_box.create_text(130, 195, text="Poster\nUnavailable", fill="white", font=("Arial", 14))
-            else:
-                poster_box.create_rectangle(4, 4, 256, 386, outline="#333", width=2, fill="#222")
-                poster_box.create_text(130, 195, text="Poster\nPlaceholder", fill="white", font=("Arial", 14))
+            draw_poster(poster_box, m.get("image"), (260, 390), font_size=14, movie_id=m.id)
 
-            tk.Label(detail_panel, text="Description:\n(Replace with real synopsis)", bg="#0d0d0d", fg="#bfbfbf",
+            tk.Label(detail_panel, text=describe(m), bg="#0d0d0d", fg="#bfbfbf",
                      font=("Arial", 11), wraplength=380, justify="left").pack(padx=12, pady=(12,8))
 
             def _addfav():
-                if m not in favourites:
-                    favourites.append(m)
+                if favourites.add(m.id):
                     messagebox.showinfo("Favourites", f"{m['title']} added to favourites!")
                 else:
                     messagebox.showinfo("Favourites", f"{m['title']} is already in favourites.")
@@ -208,64 +544,38 @@ def open_page(page_name):
                                 bg="#16A085", fg="red", bd=0, relief="flat", command=_addfav)
             fav_btn.pack(pady=(8,18))
 
+            # "More like this": precomputed neighbours, one table row per movie
+            similar = MOVIES.rows(SERVICE.similar_ids(m.id, n=5))
+            if similar:
+                tk.Label(detail_panel, text="More like this", bg="#0d0d0d", fg="white",
+                         font=("Arial", 13, "bold")).pack(anchor="w", padx=12, pady=(0,4))
+            for s in similar:
+                lbl = tk.Label(detail_panel, text=f"{s['title']} ({s['year']})  •  ⭐ {s['rating']}", bg="#0d0d0d",
+                               fg="#8ab4f8", font=("Arial", 11), cursor="hand2", wraplength=380, justify="left")
+                lbl.pack(anchor="w", padx=20, pady=1)
+                lbl.bind("<Button-1>", lambda e, s=s: show_details_in_panel(s))
+
             # re-center grid so layout stays nice with panel open
             center_grid()
 
-        # display random movies in a stable 4-column grid
-        import random
-        displayed_movies = random.sample(MOVIES, min(20, len(MOVIES)))
-
-        cols = 4
-        row = 0
-        col = 0
-        for movie in displayed_movies:
-            frame = tk.Frame(scroll_frame, bg="black", padx=10, pady=10)
-            frame.grid(row=row, column=col, padx=20, pady=20)
-
-            # Poster canvas (with safe image loading)
-            canvas_poster = tk.Canvas(frame, width=200, height=300, bg="#333", highlightthickness=0, cursor="hand2")
-            canvas_poster.pack()
-
-            poster_path = movie.get("image")
-            if poster_path and PIL_AVAILABLE and os.path.exists(poster_path):
-                try:
-                    img = Image.open(poster_path)
-                    img = img.resize((200, 300), Image.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    canvas_poster.create_image(0, 0, image=photo, anchor="nw")
-                    canvas_poster.image = photo
-                    new_window._images.append(photo)
-                except Exception as e:
-                    print(f"Failed to load poster '{poster_path}': {e}")
-                    canvas_poster.create_text(100, 150, text="Poster\nUnavailable", fill="white", font=("Arial", 12))
-            else:
-                canvas_poster.create_text(100, 150, text="Poster\nPlaceholder", fill="white", font=("Arial", 12))
-
-            label = tk.Label(frame, text=movie["title"], fg="white", bg="black", font=("Arial", 14, "bold"),
-                             cursor="hand2", wraplength=200, justify="center")
-            label.pack(pady=5)
-
-            tk.Label(frame, text=f"⭐ {movie['rating']} | {movie['year']}", fg="white", bg="black", font=("Arial", 10)).pack()
-
-            # Correctly capture movie and bind clicks (outside function definition)
-            def on_click(event, m=movie):
-                show_details_in_panel(m)
+        # the whole catalog as a personalized feed, fetched a page at a time as
+        # the grid reaches it; only the tiles in view are built
+        grid = VirtualPosterGrid(canvas, scroll_frame, window_id, FeedRows(list(favourites)),
+                                 on_click=show_details_in_panel)
 
-            canvas_poster.bind("<Button-1>", on_click)
-            label.bind("<Button-1>", on_click)
-
-            col += 1
-            if col == cols:
-                col = 0
-                row += 1
+        # scrolling (wheel, keys, scrollbar) moves the view -> rebind tiles
+        def _on_yscroll(first, last):
+            scrollbar.set(first, last)
+            grid.refresh()
+        canvas.configure(yscrollcommand=_on_yscroll)
 
         # finalize layout and ensure scrollregion correct
         scroll_frame.update_idletasks()
-        canvas.configure(scrollregion=canvas.bbox("all"))
         center_grid()
+        grid.refresh()
 
         # bind canvas resize to recenter
-        canvas.bind("<Configure>", center_grid)
+        canvas.bind("<Configure>", lambda e: (center_grid(), grid.refresh()))
         new_window.bind("<Configure>", lambda e: canvas.after(50, center_grid))
 
         # --- Reliable mouse-wheel / trackpad scrolling (only when over browse area) ---
@@ -300,12 +610,18 @@ def open_page(page_name):
     elif page_name == "My List":
         new_window.configure(bg="black")
         tk.Label(new_window, text="MY LIST (Favourites)", font=("IMPACT", 48, "bold"), fg="#FF4747",bg="black").pack(pady=30)
-        if not favourites:
+        saved = MOVIES.rows(i for i in favourites if i < MOVIES.size and MOVIES.alive[i])
+        if not saved:
             tk.Label(new_window, text="You have no favourites yet!", font=("Arial", 16),bg="black").pack(pady=20)
         else:
-            for f in favourites:
+            for f in saved:
                 line = f"{f['title']} ({f['year']}) — {', '.join(f['genres'])} | ⭐️ {f['rating']}"
                 tk.Label(new_window, text=line, font=("Arial", 18),bg="black").pack(anchor="w", padx=60, pady=8)
+            recommended = MOVIES.rows(SERVICE.recommend_ids([f.id for f in saved], k=5))
+            if recommended:
+                tk.Label(new_window, text="Recommended for you", font=("Arial", 22, "bold"), fg="#FF4747", bg="black").pack(anchor="w", padx=60, pady=(24, 6))
+                for r in recommended:
+                    tk.Label(new_window, text=f"{r['title']} ({r['year']}) | ⭐️ {r['rating']}", font=("Arial", 16), bg="black").pack(anchor="w", padx=80, pady=4)
         tk.Label(new_window, text="Double-click movies in results to view details. Use the button to add to favourites.", font=("Arial", 14, "italic")).pack(pady=(20,0))
 
     elif page_name == "More":
@@ -317,20 +633,108 @@ def open_page(page_name):
 
 
 
-def browse_genre(parent, genre):
-    """Pop up a fullscreen listing filtered by genre."""
+BROWSE_PAGE_SIZE = 100
+
+def browse_genre(parent, genre=None):
+    """
+    Fullscreen genre browser: tick any genres (all must match), pick a year range
+    and minimum rating. Counts next to each genre are for the current result;
+    rows load a page at a time as you scroll (see Primeflix.browse).
+    """
+    _page_timer("Genres")
     genre_win = tk.Toplevel(parent)
-    genre_win.title(f"{genre} Movies")
+    genre_win.title(f"{genre or 'All'} Movies")
     genre_win.attributes("-fullscreen", True)
+    genre_win.configure(bg="black")
     genre_win.bind("<Escape>", lambda e: genre_win.attributes("-fullscreen", False))
-    tk.Label(genre_win, text=f"{genre} Movies", font=("Arial", 36, "bold"), fg=genres.get(genre,"#FF4747")).pack(pady=24)
-    filtered = [m for m in MOVIES if genre in m["genres"]]
-    if not filtered:
-        tk.Label(genre_win, text="No movies found in this genre.", font=("Arial",18)).pack(pady=20)
-        return
-    for m in filtered:
-        desc = f"{m['title']} ({m['year']}) - Rating: {m['rating']}"
-        tk.Label(genre_win, text=desc, font=("Arial", 18)).pack(anchor="w", padx=70, pady=6)
+    heading = tk.Label(genre_win, text=f"{genre or 'All'} Movies", font=("Arial", 36, "bold"),
+                       fg=genres.get(genre, "#FF4747"), bg="black")
+    heading.pack(pady=24)
+
+    filters = tk.Frame(genre_win, bg="black")
+    filters.pack(fill="x", padx=70)
+    checks = {}
+    for n, name in enumerate(MOVIES.genre_names):
+        var = tk.BooleanVar(value=(name == genre))
+        cb = tk.Checkbutton(filters, text=name, variable=var, command=lambda: refresh(), font=("Arial", 12),
+                            fg="white", bg="black", selectcolor="#333", activebackground="black", anchor="w")
+        cb.grid(row=n // 8, column=n % 8, sticky="w", padx=4, pady=2)
+        checks[name] = (var, cb)
+
+    ranges = tk.Frame(genre_win, bg="black")
+    ranges.pack(fill="x", padx=70, pady=(8, 0))
+    tk.Label(ranges, text="Year", font=("Arial", 12), fg="white", bg="black").pack(side="left")
+    year_from = tk.Spinbox(ranges, from_=1870, to=2100, width=6, font=("Arial", 12), command=lambda: refresh())
+    year_to = tk.Spinbox(ranges, from_=1870, to=2100, width=6, font=("Arial", 12), command=lambda: refresh())
+    for box in (year_from, year_to):
+        box.delete(0, tk.END)
+        box.bind("<Return>", lambda e: refresh())
+    year_from.pack(side="left", padx=(6, 2))
+    tk.Label(ranges, text="to", font=("Arial", 12), fg="white", bg="black").pack(side="left")
+    year_to.pack(side="left", padx=(2, 20))
+    tk.Label(ranges, text="Min rating", font=("Arial", 12), fg="white", bg="black").pack(side="left")
+    min_rating = tk.Scale(ranges, from_=0, to=10, resolution=0.5, orient="horizontal", length=200,
+                          fg="white", bg="black", highlightthickness=0, command=lambda v: schedule_refresh())
+    min_rating.pack(side="left", padx=6)
+    summary = tk.Label(ranges, font=("Arial", 12), fg="#cccccc", bg="black")
+    summary.pack(side="right")
+
+    cols = ("Title", "Year", "Rating", "Genres")
+    body = tk.Frame(genre_win, bg="black")
+    body.pack(fill="both", expand=True, padx=70, pady=20)
+    tree = ttk.Treeview(body, columns=cols, show="headings", selectmode="browse")
+    for c, width in zip(cols, (420, 100, 100, 300)):
+        tree.heading(c, text=c)
+        tree.column(c, width=width, anchor="w" if c in ("Title", "Genres") else "center")
+    scrollbar = ttk.Scrollbar(body, orient="vertical", command=tree.yview)
+    scrollbar.pack(side="right", fill="y")
+    tree.pack(fill="both", expand=True)
+
+    state = {"query": None, "offset": 0, "total": 0, "pending": False, "job": None}
+
+    def year(box):
+        text = box.get().strip()
+        return int(text) if text.isdigit() else None
+
+    def insert_rows(ids):
+        for m in MOVIES.rows(ids):
+            tree.insert("", "end", iid=str(m.id), values=(m["title"], m["year"], m["rating"], ", ".join(m["genres"])))
+        state["offset"] += len(ids)
+
+    def schedule_refresh():
+        if state["job"] is not None:
+            genre_win.after_cancel(state["job"])
+        state["job"] = genre_win.after(150, refresh)
+
+    def refresh():
+        state["job"] = None
+        years = (year(year_from), year(year_to))
+        query = {"genres": [name for name, (var, _) in checks.items() if var.get()],
+                 "years": years if years != (None, None) else None,
+                 "min_rating": float(min_rating.get()) or None}
+        page = SERVICE.browse(**query, limit=BROWSE_PAGE_SIZE)
+        state.update(query=query, offset=0, total=page.total, pending=False)
+        tree.delete(*tree.get_children())
+        insert_rows(page.ids)
+        for name, (_, cb) in checks.items():
+            cb.config(text=f"{name} ({page.facets['genres'].get(name, 0)})")
+        decades = sorted(page.facets["decades"].items(), key=lambda kv: -kv[1])[:3]
+        summary.config(text=f"{page.total} movies" + "".join(f"  •  {d}s: {n}" for d, n in decades)
+                       if page.total else "No movies match these filters.")
+
+    def load_more():
+        state["pending"] = False
+        if state["offset"] < state["total"]:
+            insert_rows(SERVICE.browse(**state["query"], limit=BROWSE_PAGE_SIZE, offset=state["offset"]).ids)
+
+    def on_tree_scroll(first, last):
+        scrollbar.set(first, last)
+        if float(last) > 0.9 and state["offset"] < state["total"] and not state["pending"]:
+            state["pending"] = True
+            genre_win.after_idle(load_more)
+
+    tree.configure(yscrollcommand=on_tree_scroll)
+    refresh()
 
 
 
@@ -378,9 +782,16 @@ for g, color in genres.items():
     )
     lbl.pack(side="left", padx=5)
     lbl.bind("<Button-1>", lambda e, gen=g: insert_genre(gen))
+    lbl.bind("<Double-Button-1>", lambda e, gen=g: browse_genre(root, gen))
     lbl.bind("<Enter>", lambda e, l=lbl: l.config(fg="white"))
     lbl.bind("<Leave>", lambda e, l=lbl, c=color: l.config(fg=c))
 
+# every genre in the catalog, with combinations / year / rating filters
+more_genres = tk.Label(genre_frame, text="All genres ▸", font=("Arial", 25), fg="white", bg="black",
+                       padx=12, pady=6, cursor="hand2")
+more_genres.pack(side="left", padx=5)
+more_genres.bind("<Button-1>", lambda e: browse_genre(root))
+
 # --- Search entry ---
 entry = tk.Entry(
     root,
@@ -403,164 +814,54 @@ def on_entry_focus_out(event):
     if not entry.get():
         entry.insert(0, "Search...")
         entry.config(fg='gray')
+    # close suggestions unless focus went into them (checked once the click lands)
+    root.after(150, lambda: root.focus_get() not in (entry, suggest_box) and hide_suggestions())
 
 entry.bind("<FocusIn>", on_entry_focus_in)
 entry.bind("<FocusOut>", on_entry_focus_out)
 
-# Sample movie database
-MOVIES = [
-    {"title": "Space Warriors", "year": 2018, "rating": 8.0, "genres": ["Action", "Sci-Fi"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 22 AM.jpeg"},
-    {"title": "Bangalore Days", "year": 2014, "rating": 8.2, "genres": ["Romance", "Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/Bangalore Days Poster.jpg"},
-    {"title": "Kahaani", "year": 2012, "rating": 8.1, "genres": ["Thriller", "Mystery"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (1).jpeg"},
-    {"title": "Premam", "year": 2015, "rating": 8.2, "genres": ["Romance", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/1d0248dfb942f6ea6a75d4130c01b727.jpg"},
-    {"title": "Sairat", "year": 2016, "rating": 8.6, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 27 AM.jpeg"},
-    {"title": "Lucifer", "year": 2019, "rating": 8.0, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (3).jpeg"},
-    {"title": "Andhadhun", "year": 2018, "rating": 8.3, "genres": ["Thriller", "Comedy"], "image": "//Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (4).jpeg"},
-    {"title": "Uyare", "year": 2019, "rating": 8.2, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 22 AM.jpeg"},
-    {"title": "Thappad", "year": 2020, "rating": 7.6, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (5).jpeg"},
-    {"title": "Soorarai Pottru", "year": 2020, "rating": 8.7, "genres": ["Drama", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (6).jpeg"},
-    {"title": "Drishyam 2", "year": 2021, "rating": 8.5, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (7).jpeg"},
-    {"title": "Joji", "year": 2021, "rating": 8.0, "genres": ["Drama", "Crime"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (8).jpeg"},
-    {"title": "Minnal Murali", "year": 2021, "rating": 7.9, "genres": ["Action", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApuhweg2).jpeg"},
-    {"title": "C U Soon", "year": 2020, "rating": 7.8, "genres": ["Thriller", "Mystery"], "image":"/Users/ralphblesson/Desktop/selsnium/nb .jpeg"},
-    {"title": "Kumbalangi Nights", "year": 2019, "rating": 8.6, "genres": ["Drama", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 22 AM.jpeg"},
-    {"title": "Bahubali: The Beginning", "year": 2015, "rating": 8.1, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/seyfg.jpeg"},
-    {"title": "Bahubali 2: The Conclusion", "year": 2017, "rating": 8.2, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/sefs.jpeg"},
-    {"title": "Tumbbad", "year": 2018, "rating": 8.3, "genres": ["Horror", "Fantasy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 46 AM.jpeg"},
-    {"title": "Gully Boy", "year": 2019, "rating": 8.0, "genres": ["Drama", "Music"], "image": "/Users/ralphblesson/Desktop/selsnium/sefsg.jpeg"},
-    {"title": "Stree", "year": 2018, "rating": 7.6, "genres": ["Horror", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/rn.jpeg"},
-    {"title": "Virus", "year": 2019, "rating": 8.4, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/jej.jpeg"},
-    {"title": "Maheshinte Prathikaaram", "year": 2016, "rating": 8.2, "genres": ["Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 49 AM.jpeg"},
-    {"title": "Take Off", "year": 2017, "rating": 8.0, "genres": ["Drama", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (9).jpeg"},
-    {"title": "Kaithi", "year": 2019, "rating": 8.5, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 copy 2.jpeg"},
-    {"title": "Master", "year": 2021, "rating": 7.6, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/56WhatsApp Image Nov 4 2025 (1).jpeg"},
-    {"title": "Pushpa: The Rise", "year": 2021, "rating": 7.3, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WiihatsApp Image Nov 4 2025 (2).jpeg"},
-    {"title": "Eega", "year": 2012, "rating": 7.9, "genres": ["Fantasy", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/675879.jpeg"},
-    {"title": "Mahanati", "year": 2018, "rating": 8.5, "genres": ["Biography", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/34567.jpeg"},
-
-    # Additional movies added for balance
-
-    # Comedy (total 15)
-    {"title": "Bheeshma", "year": 2020, "rating": 7.1, "genres": ["Comedy", "Romance"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 59 AM.jpeg"},
-    {"title": "Chhichhore", "year": 2019, "rating": 8.2, "genres": ["Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/34567.jpeg"},
-    {"title": "Delhi Belly", "year": 2011, "rating": 7.5, "genres": ["Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/34567.jpeg"},
-    {"title": "Piku", "year": 2015, "rating": 7.6, "genres": ["Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/e5768.jpeg"},
-    {"title": "Queen", "year": 2013, "rating": 8.2, "genres": ["Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/786fgu.jpeg"},
-    {"title": "Angry Indian Goddesses", "year": 2015, "rating": 7.0, "genres": ["Comedy", "Drama"], "image": "//Users/ralphblesson/Desktop/selsnium/354stdyui.jpeg"},
-    {"title": "Bareilly Ki Barfi", "year": 2017, "rating": 7.7, "genres": ["Comedy", "Romance"], "image": "/Users/ralphblesson/Desktop/selsnium/ytufi.jpeg"},
-    {"title": "Tamasha", "year": 2015, "rating": 7.6, "genres": ["Romance", "Drama", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (11).jpeg"},
-    {"title": "OMG! Oh My God", "year": 2012, "rating": 8.1, "genres": ["Comedy", "Drama"],'image':'/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025.jpeg'},
-    {"title": "Jaane Bhi Do Yaaro", "year": 1983, "rating": 8.4, "genres": ["Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (12).jpeg"},
-
-    # Romance (total 15)
-    {"title": "Kuch Kuch Hota Hai", "year": 1998, "rating": 7.6, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (13).jpeg"},
-    {"title": "Barfi!", "year": 2012, "rating": 8.1, "genres": ["Romance", "Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (14).jpeg"},
-    {"title": "Love Aaj Kal", "year": 2009, "rating": 6.6, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (15).jpeg"},
-    {"title": "Veer-Zaara", "year": 2004, "rating": 7.8, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (16).jpeg"},
-    {"title": "Saathiya", "year": 2002, "rating": 7.6, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (17).jpeg"},
-    {"title": "Lootera", "year": 2013, "rating": 7.4, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (18).jpeg"},
-    {"title": "Raja Hindustani", "year": 1996, "rating": 6.8, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (19).jpeg"},
-    {"title": "Jab We Met", "year": 2007, "rating": 7.9, "genres": ["Romance", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (20).jpeg"},
-    {"title": "Rehnaa Hai Terre Dil Mein", "year": 2001, "rating": 7.4, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (21).jpeg"},
-    {"title": "Ek Ladki Ko Dekha To Aisa Laga", "year": 2019, "rating": 7.4, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (22).jpeg"},
-
-    # Thriller (total 15)
-    {"title": "Talaash", "year": 2012, "rating": 7.2, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (23).jpeg"},
-    {"title": "Pink", "year": 2016, "rating": 8.1, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (24).jpeg"},
-    {"title": "Kahaani 2", "year": 2016, "rating": 6.6, "genres": ["Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (25).jpeg"},
-    {"title": "A Wednesday!", "year": 2008, "rating": 8.1, "genres": ["Thriller", "Crime"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (26).jpeg"},
-    {"title": "Badlapur", "year": 2015, "rating": 7.6, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (27).jpeg"},
-    {"title": "Drishyam (Hindi)", "year": 2015, "rating": 7.7, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (28).jpeg"},
-    {"title": "NH10", "year": 2015, "rating": 7.0, "genres": ["Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (29).jpeg"},
-    {"title": "Special 26", "year": 2013, "rating": 7.8, "genres": ["Thriller", "Crime"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (30).jpeg"},
-    {"title": "Talvar", "year": 2015, "rating": 8.1, "genres": ["Mystery", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (31).jpeg"},
-
-    # Action (total 15)
-    {"title": "KGF", "year": 2018, "rating": 8.2, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (32).jpeg"},
-    {"title": "War", "year": 2019, "rating": 6.5, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (33).jpeg"},
-    {"title": "Saaho", "year": 2019, "rating": 5.5, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (34).jpeg"},
-    {"title": "Raees", "year": 2017, "rating": 7.2, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (35).jpeg"},
-    {"title": "Ghajini", "year": 2008, "rating": 7.6, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (36).jpeg"},
-    {"title": "Dhoom 2", "year": 2006, "rating": 7.2, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (37).jpeg"},
-    {"title": "Holiday", "year": 2014, "rating": 7.9, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (38).jpeg"},
-    {"title": "Ra.One", "year": 2011, "rating": 4.9, "genres": ["Sci-Fi", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (39).jpeg"},
-    {"title": "Don", "year": 2006, "rating": 7.8, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (40).jpeg"},
-    {"title": "Gabbar Is Back", "year": 2015, "rating": 6.6, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (41).jpeg"},
-
-    # Horror (total 10)
-    {"title": "Pari", "year": 2018, "rating": 6.0, "genres": ["Horror"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (42).jpeg"},
-    {"title": "Raaz", "year": 2002, "rating": 6.2, "genres": ["Horror", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (43).jpeg"},
-    {"title": "Pizza", "year": 2012, "rating": 7.0, "genres": ["Horror", "Mystery"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (44).jpeg"},
-    {"title": "1920", "year": 2008, "rating": 5.6, "genres": ["Horror", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (45).jpeg"},
-    {"title": "Ragini MMS", "year": 2011, "rating": 5.4, "genres": ["Horror"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (46).jpeg"},
-
-    # Drama (total 20)
-    {"title": "Anand", "year": 1971, "rating": 9.0, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (47).jpeg"},
-    {"title": "Stanley Ka Dabba", "year": 2011, "rating": 8.0, "genres": ["Drama", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (48).jpeg"},
-    {"title": "Masaan", "year": 2015, "rating": 8.1, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (49).jpeg"},
-    {"title": "October", "year": 2018, "rating": 7.7, "genres": ["Drama", "Romance"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (50).jpeg"},
-    {"title": "Kapoor & Sons", "year": 2016, "rating": 7.7, "genres": ["Drama", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (51).jpeg"},
-    {"title": "Taare Zameen Par", "year": 2007, "rating": 8.4, "genres": ["Drama", "Family"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (52).jpeg"},
-    {"title": "Lunchbox", "year": 2013, "rating": 8.0, "genres": ["Drama", "Romance"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (53).jpeg"},
-    {"title": "Chhapaak", "year": 2020, "rating": 7.1, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (54).jpeg"},
-
-    # Sci-Fi (total 6)
-    {"title": "PK", "year": 2014, "rating": 8.1, "genres": ["Sci-Fi", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (55).jpeg"},
-    {"title": "Cargo", "year": 2019, "rating": 7.3, "genres": ["Sci-Fi", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (56).jpeg"},
-    {"title": "Ra.One", "year": 2011, "rating": 4.9, "genres": ["Sci-Fi", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (58).jpeg"},
-    {"title": "Tik Tik Tik", "year": 2018, "rating": 6.1, "genres": ["Sci-Fi", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (59).jpeg"},
-
-    # Mystery (total 6)
-    {"title": "Talvar", "year": 2015, "rating": 8.1, "genres": ["Mystery", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (57).jpeg"},
-    {"title": "Badla", "year": 2019, "rating": 7.8, "genres": ["Mystery", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (58).jpeg"},
-    {"title": "Ittefaq", "year": 2017, "rating": 7.0, "genres": ["Mystery", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (59).jpeg"},
-
-    # Fantasy (total 5)
-    {"title": "Miruthan", "year": 2016, "rating": 6.1, "genres": ["Fantasy", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (60).jpeg"},
-    {"title": "7aum Arivu", "year": 2011, "rating": 6.3, "genres": ["Fantasy", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (61).jpeg"},
-    {"title": "Raavan", "year": 2010, "rating": 6.2, "genres": ["Fantasy", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (62).jpeg"},
-
-    # Biography (total 3)
-    {"title": "Neerja", "year": 2016, "rating": 8.0, "genres": ["Biography", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (63).jpeg"},
-    {"title": "Dangal", "year": 2016, "rating": 8.4, "genres": ["Biography", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (64).jpeg"},
-    {"title": "MS Dhoni: The Untold Story", "year": 2016, "rating": 9.7, "genres": ["Biography", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (65).jpeg"},
-
-    # Music (total 3)
-    {"title": "Rockstar", "year": 2011, "rating": 7.9, "genres": ["Drama", "Music"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (66).jpeg"},
-    {"title": "Aashiqui 2", "year": 2013, "rating": 7.1, "genres": ["Drama", "Music"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (67).jpeg"},
-    {"title": "Secret Superstar", "year": 2017, "rating": 7.8, "genres": ["Drama", "Music"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (68).jpeg"},
-]
-
-def find_movies(query):
-    q = query.strip().lower()
-    if not q or q == "search...":
-        return []
-    results = []
-    for m in MOVIES:
-        title_match = q in m["title"].lower()
-        genre_match = any(q == g.lower() or q in g.lower() for g in m["genres"])
-        if title_match or genre_match:
-            results.append(m)
-    return results
-
-def show_search_results(results, query):
+# Catalog, search index, "More like this" table and the optional favourites model
+# (PRIMEFLIX_CF_MODEL) live in the headless core, primeflix.core; this window is
+# one client of it. With PRIMEFLIX_SERVER set (e.g. http://127.0.0.1:8765, see
+# `python -m primeflix.server`) queries go to that server instead; the answers are
+# movie ids, which are the same in both since both load the bundled list.
+# Set PRIMEFLIX_CATALOG to a snapshot (python -m primeflix.snapshot catalog.pfx)
+# to open the catalog with one mmap instead of building it from the Python list.
+CORE = Primeflix.bundled()
+MOVIES = CORE.catalog
+SERVICE = HttpClient(os.environ["PRIMEFLIX_SERVER"]) if os.environ.get("PRIMEFLIX_SERVER") else CORE
+log_phase("catalog")
+
+# Favourites are saved per profile (PRIMEFLIX_PROFILE) in a local SQLite file
+# (PRIMEFLIX_FAVOURITES_DB, default ~/.primeflix/favourites.db) by title and year.
+# `favourites` holds the matching movie ids; saving happens on a background thread.
+FAVOURITES_STORE = FavouritesStore(MOVIES, os.environ.get("PRIMEFLIX_FAVOURITES_DB"))
+favourites = FAVOURITES_STORE.profile(os.environ.get("PRIMEFLIX_PROFILE", "default"))
+# the Browse feed is ranked once per run of the app (and again when favourites change)
+FEED_SESSION = f"{favourites.profile}:{os.getpid()}"
+
+# results are ranked and fetched a page at a time as the list is scrolled
+SEARCH_PAGE_SIZE = 100
+
+def find_movies(query, limit=SEARCH_PAGE_SIZE, cursor=None):
+    """Ranked matches after `cursor` (.ids, .total, .cursor); limit=None for all of them."""
+    return SERVICE.search_page(query, limit, cursor)
+
+def show_search_results(page, query):
     import tkinter.font as tkFont
 
     win = tk.Toplevel(root)
-    win.title(f"Search: {query}")
+    win.title(f"Search: {query} ({page.total} matches)")
     win.attributes("-fullscreen", True)
     win.bind("<Escape>", lambda e: win.attributes("-fullscreen", False))
 
-    # keep refs for images
-    win._images = []
-
     # Fonts and style
     tree_font = tkFont.Font(family="Arial", size=14)
     row_height = tree_font.metrics("linespace") + 6
     style = ttk.Style()
     style.configure("Treeview", rowheight=row_height)
 
-    if not results:
+    if not page.ids:
         tk.Label(win, text=f"No matches for '{query}'", font=("Arial", 24)).pack(expand=True)
         return
 
@@ -599,13 +900,11 @@ def show_search_results(results, query):
         if not sel:
             messagebox.showinfo("Favourites", "No movie selected.")
             return
-        vals = tree.item(sel[0], "values")
-        movie = next((m for m in results if m["title"] == vals[0]), None)
-        if movie and movie not in favourites:
-            favourites.append(movie)
+        movie = MOVIES.row(int(sel[0]))
+        if favourites.add(movie.id):
             messagebox.showinfo("Favourites", f"{movie['title']} added to favourites!")
         else:
-            messagebox.showinfo("Favourites", f"{vals[0]} is already in favourites.")
+            messagebox.showinfo("Favourites", f"{movie['title']} is already in favourites.")
 
     fav_btn = tk.Button(left_panel, text="Add Selected to Favourites", font=("Arial", 12, "bold"),
                         bg="#16A085", fg="red", bd=0, relief="flat", command=add_current_to_favourites)
@@ -614,16 +913,15 @@ def show_search_results(results, query):
     # Right: Treeview of results
     cols = ("Title", "Year", "Rating", "Genres")
     tree = ttk.Treeview(right_panel, columns=cols, show="headings", selectmode="browse", style="Treeview")
-    for c in cols:
-        tree.heading(c, text=c)
     tree.column("Title", width=420)
     tree.column("Year", width=100, anchor="center")
     tree.column("Rating", width=100, anchor="center")
     tree.column("Genres", width=300)
 
-    # Insert rows
-    for m in results:
-        tree.insert("", "end", values=(m["title"], m.get("year",""), m.get("rating",""), ", ".join(m.get("genres",[]))))
+    # Only the rows in view exist (iid = movie id); see VirtualResultView
+    scrollbar = ttk.Scrollbar(right_panel, orient="vertical")
+    view = VirtualResultView(tree, scrollbar, page, lambda limit, cursor: find_movies(query, limit, cursor), row_height)
+    scrollbar.pack(side="right", fill="y", pady=20)
     tree.pack(fill="both", expand=True, padx=20, pady=20)
 
     # Selection handler: update left panel with poster + details
@@ -631,34 +929,16 @@ def show_search_results(results, query):
         sel = tree.selection()
         if not sel:
             return
-        vals = tree.item(sel[0], "values")
-        title = vals[0]
-        movie = next((m for m in results if m["title"] == title), None)
-        if not movie:
-            return
+        movie = MOVIES.row(int(sel[0]))
 
         # Title / meta / genres
         title_label.config(text=movie.get("title", ""))
         meta_label.config(text=f"{movie.get('year','')}  •  ⭐ {movie.get('rating','')}")
         genres_label.config(text="Genres: " + ", ".join(movie.get("genres", [])))
+        desc_label.config(text=describe(movie))
 
-        # poster: try to load
-        poster_canvas.delete("all")
-        poster_path = movie.get("image")
-        if poster_path and PIL_AVAILABLE and os.path.exists(poster_path):
-            try:
-                img = Image.open(poster_path)
-                img = img.resize((200, 300), Image.LANCZOS)
-                photo = ImageTk.PhotoImage(img)
-                poster_canvas.create_image(0, 0, image=photo, anchor="nw")
-                poster_canvas.image = photo
-                win._images.append(photo)
-            except Exception:
-                poster_canvas.create_rectangle(4, 4, 196, 296, outline="#333", width=2, fill="#222")
-                poster_canvas.create_text(100, 150, text="Poster\nUnavailable", fill="white", font=("Arial", 12), justify="center")
-        else:
-            poster_canvas.create_rectangle(4, 4, 196, 296, outline="#333", width=2, fill="#222")
-            poster_canvas.create_text(100, 150, text="Poster\nPlaceholder", fill="white", font=("Arial", 12), justify="center")
+        # poster: loads in the background, a newer selection cancels this one
+        draw_poster(poster_canvas, movie.get("image"), (200, 300), movie_id=movie.id)
 
     # Bind selection change (single click) and Return key
     tree.bind("<<TreeviewSelect>>", update_left_panel)
@@ -669,9 +949,7 @@ def show_search_results(results, query):
         sel = tree.selection()
         if not sel:
             return
-        vals = tree.item(sel[0], "values")
-        title = vals[0]
-        movie = next((m for m in results if m["title"] == title), None)
+        movie = MOVIES.row(int(sel[0]))
         if movie:
             # existing small popup behavior (keeps compatibility)
             detail = tk.Toplevel(win)
@@ -680,18 +958,7 @@ def show_search_results(results, query):
             # poster in popup
             poster_canvas_small = tk.Canvas(detail, width=200, height=300, bg="#111", highlightthickness=0)
             poster_canvas_small.pack(pady=(8,6))
-            ppath = movie.get("image")
-            if ppath and PIL_AVAILABLE and os.path.exists(ppath):
-                try:
-                    img = Image.open(ppath)
-                    img = img.resize((200,300), Image.LANCZOS)
-                    ph = ImageTk.PhotoImage(img)
-                    poster_canvas_small.create_image(0,0, image=ph, anchor="nw")
-                    poster_canvas_small.image = ph
-                except Exception:
-                    poster_canvas_small.create_text(100,150, text="Poster\nUnavailable")
-            else:
-                poster_canvas_small.create_text(100,150, text="Poster\nPlaceholder")
+            draw_poster(poster_canvas_small, movie.get("image"), (200, 300), movie_id=movie.id)
 
             tk.Label(detail, text=movie["title"], font=("Arial", 16, "bold")).pack(pady=(6,4))
             tk.Label(detail, text=f"Year: {movie.get('year','')}", font=("Arial", 12)).pack()
@@ -700,12 +967,9 @@ def show_search_results(results, query):
 
     tree.bind("<Double-1>", on_double_click)
 
-    # Pre-select first row if exists
-    first = tree.get_children()
-    if first:
-        tree.selection_set(first[0])
-        tree.focus(first[0])
-        update_left_panel()
+    # Pre-select first row
+    view.select_pos(0)
+    update_left_panel()
 
     # Final layout tweaks
     win.update_idletasks()
@@ -713,13 +977,83 @@ def show_search_results(results, query):
 
 
 
+# --- Live suggestions (search-as-you-type) ---
+# Keystrokes are debounced; each update narrows the previous result when the
+# query just got longer (see primeflix.search.IncrementalSearch).
+SUGGEST_DELAY_MS = 120
+SUGGEST_LIMIT = 8
+
+suggest_box = tk.Listbox(root, font=("Arial", 16), bg="white", fg="black", activestyle="none",
+                         bd=1, relief="solid", height=SUGGEST_LIMIT)
+_suggest_job = None
+_suggest_ids = []
+
+def hide_suggestions(event=None):
+    global _suggest_job
+    if _suggest_job is not None:
+        root.after_cancel(_suggest_job)
+        _suggest_job = None
+    suggest_box.place_forget()
+
+def update_suggestions():
+    global _suggest_job, _suggest_ids
+    _suggest_job = None
+    q = entry.get()
+    _suggest_ids = SERVICE.suggest_ids(q, SUGGEST_LIMIT) if q != "Search..." else []
+    if not _suggest_ids:
+        suggest_box.place_forget()
+        return
+    suggest_box.delete(0, tk.END)
+    for i in _suggest_ids:
+        m = MOVIES.row(i)
+        suggest_box.insert(tk.END, f"{m['title']} ({m['year']})")
+    suggest_box.configure(height=len(_suggest_ids))
+    suggest_box.place(relx=0.5, rely=0.45, y=22, anchor="n", width=600)
+    suggest_box.lift()
+
+def on_entry_key(event):
+    global _suggest_job
+    if event.keysym in ("Return", "Escape", "Up", "Down", "Tab"):
+        return
+    if _suggest_job is not None:
+        root.after_cancel(_suggest_job)
+    _suggest_job = root.after(SUGGEST_DELAY_MS, update_suggestions)
+
+def focus_suggestions(event=None):
+    if _suggest_ids and suggest_box.winfo_ismapped():
+        suggest_box.focus_set()
+        suggest_box.selection_clear(0, tk.END)
+        suggest_box.selection_set(0)
+        suggest_box.activate(0)
+
+def pick_suggestion(event=None):
+    sel = suggest_box.curselection()
+    if not sel:
+        return
+    m = MOVIES.row(_suggest_ids[sel[0]])
+    entry.delete(0, tk.END)
+    entry.insert(0, m["title"])
+    entry.config(fg="black")
+    search_action()
+
+entry.bind("<KeyRelease>", on_entry_key)
+entry.bind("<Down>", focus_suggestions)
+entry.bind("<Escape>", hide_suggestions)
+suggest_box.bind("<Return>", pick_suggestion)
+suggest_box.bind("<Double-Button-1>", pick_suggestion)
+suggest_box.bind("<Escape>", lambda e: (hide_suggestions(), entry.focus_set()))
+suggest_box.bind("<FocusOut>", lambda e: root.after(150, lambda: root.focus_get() is not entry and hide_suggestions()))
+
+
 def search_action():
+    hide_suggestions()
     q = entry.get().strip()
-    res = find_movies(q)
     if not q or q.lower() == "search...":
         messagebox.showinfo("Empty Search", "Please enter or select a genre or movie title.")
         return
-    show_search_results(res, q)
+    page = find_movies(q)
+    _page_timer("Search results")
+    show_search_results(page, q)
 
 entry.bind("<Return>", lambda e: search_action())
 
@@ -742,4 +1076,50 @@ search_btn.place(relx=0.5, rely=0.65, anchor="n")
 # --- Escape to exit fullscreen ---
 root.bind("<Escape>", lambda e: root.attributes("-fullscreen", False))
 
+# Once the window is on screen: search index / "More like this" are built in the
+# background and the backgrounds are decoded.
+def _on_first_idle():
+    log_phase("interactive")
+    if SERVICE is CORE:
+        CORE.warm_up()
+    root.after(1, load_backgrounds)
+
+# --- Metrics overlay (PRIMEFLIX_METRICS=1; F12 shows / hides it) ---
+# A small always-on-top window with p50 / p95 of the recent samples of every
+# timing histogram (see primeflix.metrics), refreshed once a second.
+METRICS_OVERLAY_MS = 1000
+
+def _start_metrics_overlay():
+    overlay = tk.Toplevel(root)
+    overlay.overrideredirect(True)
+    overlay.attributes("-topmost", True)
+    overlay.geometry("+10+10")
+    text = tk.Label(overlay, font=("Courier", 10), fg="#00ff66", bg="black", justify="left", anchor="nw")
+    text.pack()
+
+    def update():
+        lines = []
+        for name, labels, p50, p95, count in metrics.REGISTRY.recent():
+            tag = ",".join(str(v) for v in labels.values())
+            name = f"{name}[{tag}]" if tag else name
+            lines.append(f"{name:<34} p50 {p50 * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms  n={count}")
+        text.config(text="\n".join(lines) or "metrics: no samples yet")
+        overlay.lift()
+        root.after(METRICS_OVERLAY_MS, update)
+
+    def toggle(event=None):
+        if overlay.state() == "withdrawn":
+            overlay.deiconify()
+        else:
+            overlay.withdraw()
+
+    root.bind_all("<F12>", toggle)
+    update()
+
+if metrics.enabled():
+    _start_metrics_overlay()
+
+log_phase("window built")
+root.after_idle(_on_first_idle)
 root.mainloop()
+FAVOURITES_STORE.close()
@@ -0,0 +1,52 @@
+"""
+Training time, offline quality and batch scoring speed of the favourites recommender (primeflix.collab).
+
+    python benchmarks/bench_collab.py                          # 100k titles, 50k users
+    python benchmarks/bench_collab.py --titles 20000 --users 10000 --factors 64
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from primeflix.collab import ImplicitALS, hit_rate, holdout, synthetic_interactions  # noqa: E402
+from primeflix.synthetic import synthetic_catalog  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--titles", type=int, default=100_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--favourites", type=int, default=20, help="mean favourites per user")
+    parser.add_argument("--factors", type=int, default=32)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    catalog = synthetic_catalog(args.titles)
+    start = time.perf_counter()
+    interactions = synthetic_interactions(catalog, args.users, args.favourites)
+    print(f"generated {interactions.nnz} favourites in {time.perf_counter() - start:.2f}s")
+
+    train, users, held = holdout(interactions)
+    model = ImplicitALS(factors=args.factors, iterations=args.iterations)
+    start = time.perf_counter()
+    model.fit(train)
+    print(f"trained {args.iterations} iterations in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    recs, _ = model.recommend_users(users, train, k=args.k, allowed=catalog.alive)
+    elapsed = time.perf_counter() - start
+    print(f"scored {len(users)} users in {elapsed:.2f}s ({len(users) / elapsed:,.0f} users/s)")
+
+    popular = np.argsort(-np.bincount(train.indices, minlength=train.n_items))[:args.k]
+    print(f"hit rate@{args.k}: ALS {hit_rate(recs, held):.3f}, "
+          f"most popular {hit_rate(np.broadcast_to(popular, recs.shape), held):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Memory per movie record: the original list of dicts vs the columnar Catalog.
+
+    python benchmarks/bench_memory.py                    # 1M titles
+    python benchmarks/bench_memory.py --sizes 10000 100000
+
+Every record gets a poster path in one of a few folders, named like the
+bundled ones ("/Users/.../WhatsApp Image Nov 4 2025 (123).jpeg"). Python heap
+sizes are measured with tracemalloc, including the strings, so each form pays
+for its own copy of the titles and paths. The snapshot row is the file size:
+opening it maps the file instead of allocating.
+"""
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from primeflix import snapshot  # noqa: E402
+from primeflix.catalog import Catalog, StringTable  # noqa: E402
+from primeflix.synthetic import GENRES, synthetic_columns  # noqa: E402
+
+POSTER_DIRS = ["/Users/ralphblesson/Desktop/selsnium/", "/Users/ralphblesson/Desktop/posters/2024/",
+               "/Users/ralphblesson/Downloads/"]
+
+
+def poster_paths(n):
+    return [f"{POSTER_DIRS[i % len(POSTER_DIRS)]}WhatsApp Image Nov 4 2025 ({i}).jpeg" for i in range(n)]
+
+
+def traced(build):
+    """(object, bytes still allocated once build() returns)."""
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+def as_dicts(titles, years, ratings, masks):
+    """The MOVIES list as the app used to hold it (fresh strings, as parsed)."""
+    paths = poster_paths(len(titles))
+    return [{"title": t.encode().decode(), "year": int(y), "rating": float(r),
+             "genres": [g for bit, g in enumerate(GENRES) if int(m) >> bit & 1], "image": p}
+            for t, y, r, m, p in zip(titles, years.tolist(), ratings.tolist(), masks.tolist(), paths)]
+
+
+def as_catalog(titles, years, ratings, masks, flat_paths=False):
+    catalog = Catalog(capacity=len(titles))
+    if flat_paths:
+        catalog.images = StringTable()
+    catalog.extend_columns([t.encode().decode() for t in titles], years, ratings, masks, GENRES,
+                           images=poster_paths(len(titles)))
+    return catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'titles':>10}  {'form':<34} {'MB':>9} {'B/record':>9}")
+    for n in args.sizes:
+        columns = synthetic_columns(n)
+        rows = []
+        records, size = traced(lambda: as_dicts(*columns))
+        rows.append(("list of dicts", size))
+        del records
+        _, size = traced(lambda: as_catalog(*columns, flat_paths=True))
+        rows.append(("Catalog, full path strings", size))
+        catalog, size = traced(lambda: as_catalog(*columns))
+        rows.append(("Catalog, poster-folder prefix table", size))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalog.pfx")
+            snapshot.save(catalog, path)
+            rows.append(("snapshot file (mmap)", os.path.getsize(path)))
+        for form, size in rows:
+            print(f"{n:>10}  {form:<34} {size / 1e6:>9.1f} {size / n:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Build time and memory of the "More like this" table (primeflix.recommend).
+
+    python benchmarks/bench_recommend.py                 # 100k and 1M titles
+    python benchmarks/bench_recommend.py --sizes 10000 --k 20
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from primeflix.recommend import SimilarityIndex, _topk, feature_matrix  # noqa: E402
+from primeflix.synthetic import synthetic_catalog  # noqa: E402
+
+
+def recall(catalog, index, k, samples=200, seed=1):
+    """Share of the exact top-k (by distance, ties included) that the table found."""
+    ids = catalog.ids()
+    x = feature_matrix(catalog, ids)
+    q = np.random.default_rng(seed).choice(len(ids), min(samples, len(ids)), replace=False)
+    _, exact = _topk(x[q], q, x, np.arange(len(ids)), k)
+    hits = []
+    for row, qi in enumerate(q):
+        got = index.neighbours_table[ids[qi]]
+        got = got[got >= 0]
+        d = ((x[got] - x[qi]) ** 2).sum(axis=1)
+        hits.append(np.sum(d <= exact[row, -1] + 1e-5) / k)
+    return float(np.mean(hits))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, default=6)
+    args = parser.parse_args()
+
+    print(f"{'titles':>10} {'build s':>9} {'peak MB':>9} {'table MB':>9} {'B/title':>8} {'lookup us':>10} {'recall':>7}")
+    for n in args.sizes:
+        catalog = synthetic_catalog(n)
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = SimilarityIndex.build(catalog, k=args.k, nprobe=args.nprobe)
+        build_s = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        probe = np.random.default_rng(0).integers(0, n, 10000)
+        start = time.perf_counter()
+        for i in probe:
+            index.neighbours(int(i))
+        lookup_us = (time.perf_counter() - start) / len(probe) * 1e6
+
+        print(f"{n:>10} {build_s:>9.2f} {peak / 1e6:>9.1f} {index.nbytes / 1e6:>9.1f} "
+              f"{index.nbytes / n:>8.1f} {lookup_us:>10.2f} {recall(catalog, index, args.k):>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
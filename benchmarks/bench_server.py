@@ -0,0 +1,113 @@
+"""
+Load test for the JSON API (primeflix.server): many concurrent keep-alive clients.
+
+    python benchmarks/bench_server.py                            # starts a server on 100k synthetic titles
+    python benchmarks/bench_server.py --url http://127.0.0.1:8765 --clients 200 --seconds 20
+    python benchmarks/bench_server.py --batch 50                 # POST /search with 50 queries each
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from urllib.parse import quote, urlsplit
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+
+from primeflix.synthetic import title_queries  # noqa: E402
+
+QUERIES = title_queries()
+
+
+def start_server(titles):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    proc = subprocess.Popen([sys.executable, "-m", "primeflix.server", "--port", str(port), "--synthetic", str(titles)],
+                            cwd=ROOT, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        try:
+            with urllib.request.urlopen(url + "/health", timeout=1) as r:
+                print(f"server up: {json.load(r)}")
+            return proc, url
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise SystemExit("server did not start")
+
+
+def build_request(host, rng, batch, limit):
+    if batch:
+        body = json.dumps({"queries": list(rng.choice(QUERIES, batch)), "limit": limit}).encode()
+        return (f"POST /search HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+    q = quote(str(rng.choice(QUERIES)))
+    return f"GET /search?q={q}&limit={limit} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+
+
+async def client(host, port, deadline, latencies, errors, seed, batch, limit):
+    rng = np.random.default_rng(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            writer.write(build_request(host, rng, batch, limit))
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = next(int(line.split(b":")[1]) for line in head.split(b"\r\n")
+                          if line.lower().startswith(b"content-length"))
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            if not head.startswith(b"HTTP/1.1 200"):
+                errors.append(head.split(b"\r\n")[0])
+    finally:
+        writer.close()
+
+
+async def run(url, clients, seconds, batch, limit):
+    parts = urlsplit(url)
+    latencies, errors = [], []
+    deadline = time.perf_counter() + seconds
+    start = time.perf_counter()
+    await asyncio.gather(*(client(parts.hostname, parts.port, deadline, latencies, errors, i, batch, limit)
+                           for i in range(clients)))
+    return latencies, errors, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="existing server (default: start one)")
+    parser.add_argument("--titles", type=int, default=100_000, help="synthetic titles for the started server")
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--batch", type=int, default=0, help="queries per POST /search (0 = GET /search)")
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = start_server(args.titles)
+    try:
+        latencies, errors, elapsed = asyncio.run(run(url, args.clients, args.seconds, args.batch, args.limit))
+    finally:
+        if proc is not None:
+            proc.terminate()
+    ms = np.array(latencies) * 1000
+    per = max(args.batch, 1)
+    print(f"{len(ms)} requests ({len(ms) * per} queries) from {args.clients} clients in {elapsed:.1f}s: "
+          f"{len(ms) / elapsed:,.0f} req/s, {len(ms) * per / elapsed:,.0f} queries/s, {len(errors)} errors")
+    print(f"latency ms: p50 {np.percentile(ms, 50):.1f}  p95 {np.percentile(ms, 95):.1f}  "
+          f"p99 {np.percentile(ms, 99):.1f}  max {ms.max():.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Query throughput of sharded search (primeflix.shards) by worker count.
+
+    python benchmarks/bench_shards.py                          # 1M titles, 1, 2, 4, ... up to the CPU count
+    python benchmarks/bench_shards.py --titles 100000 --workers 1 8 32 --shards-per-worker 2
+
+For each worker count the catalog is split into workers * --shards-per-worker
+shared memory shards and batches of --batch queries are scattered over the
+pool (every (query, shard) task in flight at once), top 20 merged per query.
+Speedup is against one worker; "in-process" is one shard searched without a
+pool, i.e. what a single core does without any IPC.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from primeflix.shards import ShardedSearch  # noqa: E402
+from primeflix.synthetic import synthetic_catalog, title_queries  # noqa: E402
+
+QUERIES = title_queries()
+
+
+def throughput(search, queries, batch, seconds):
+    """Queries per second over whole batches for about `seconds`."""
+    search.search_many(queries[:batch], 20)  # workers attached, caches warm
+    done, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        for lo in range(0, len(queries), batch):
+            done += len(search.search_many(queries[lo:lo + batch], 20))
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--titles", type=int, default=1_000_000)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1 << i for i in range(cpus.bit_length())} | {cpus}))
+    parser.add_argument("--shards-per-worker", type=int, default=1)
+    parser.add_argument("--batch", type=int, default=64)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    catalog = synthetic_catalog(args.titles)
+    queries = list(np.random.default_rng(0).permutation(QUERIES))
+    print(f"{args.titles} titles, {len(queries)} queries, {cpus} CPUs")
+    print(f"{'workers':>8} {'shards':>7} {'build s':>8} {'MB':>7} {'queries/s':>10} {'speedup':>8} {'efficiency':>10}")
+
+    search = ShardedSearch(catalog, shards=1, workers=0)
+    start = time.perf_counter()
+    search.build()
+    build = time.perf_counter() - start
+    qps = throughput(search, queries, args.batch, args.seconds)
+    print(f"{'in-process':>8} {1:>7} {build:>8.1f} {search.nbytes / 1e6:>7.1f} {qps:>10.0f}")
+    search.close()
+
+    base = None
+    for workers in args.workers:
+        search = ShardedSearch(catalog, shards=workers * args.shards_per_worker, workers=workers)
+        start = time.perf_counter()
+        search.build()
+        build = time.perf_counter() - start
+        qps = throughput(search, queries, args.batch, args.seconds)
+        base = base or qps
+        print(f"{workers:>8} {search.shards:>7} {build:>8.1f} {search.nbytes / 1e6:>7.1f} {qps:>10.0f} "
+              f"{qps / base:>7.2f}x {qps / base / workers:>9.0%}")
+        search.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Benchmark suite: search, full-text, filtering, Browse feed, posters, Treeview and recommendations, with history and regression checks.
+
+    python benchmarks/suite.py                                  # 1k, 10k and 100k synthetic titles
+    python benchmarks/suite.py --sizes 1000 1000000 --only search filter
+    python benchmarks/suite.py --check                          # exit 1 if a metric regressed
+    python benchmarks/suite.py --no-save                        # don't append to the history
+
+Every metric is a time in ms (lower is better), named "<benchmark>/<titles>/<metric>".
+Each run is appended as one JSON line to benchmarks/history.jsonl together with
+the commit and machine. --check compares the run with the median of the last
+--window runs on the same machine, using the limits in benchmarks/thresholds.json.
+"""
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, "..")
+sys.path.insert(0, ROOT)
+
+from primeflix.atlas import PosterAtlas, write_atlas  # noqa: E402
+from primeflix.catalog import Catalog  # noqa: E402
+from primeflix.collab import ImplicitALS, synthetic_interactions  # noqa: E402
+from primeflix.core import Primeflix  # noqa: E402
+from primeflix.posters import PosterPipeline, load_poster_image  # noqa: E402
+from primeflix.recommend import SimilarityIndex  # noqa: E402
+from primeflix.search import tokenize  # noqa: E402
+from primeflix.synthetic import description_words, synthetic_catalog, title_queries  # noqa: E402
+
+HISTORY = os.path.join(HERE, "history.jsonl")
+THRESHOLDS = os.path.join(HERE, "thresholds.json")
+
+
+class Skip(Exception):
+    """Raised by a benchmark that can't run here (missing display, Pillow, ...)."""
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def latencies(fn, inputs, prefix):
+    """{prefix_p50_ms, prefix_p95_ms} over one call per input."""
+    ms = [timed(fn, x)[0] for x in inputs]
+    return {f"{prefix}_p50_ms": float(np.percentile(ms, 50)), f"{prefix}_p95_ms": float(np.percentile(ms, 95))}
+
+
+def typo_queries(catalog, count, rng):
+    """Real title words with one letter dropped or doubled (what users type)."""
+    out = []
+    for i in rng.choice(catalog.ids(), min(count * 4, len(catalog)), replace=False):
+        words = [w for w in tokenize(catalog.value(int(i), "title")) if len(w) >= 5]
+        if words:
+            w = words[0]
+            p = int(rng.integers(1, len(w) - 1))
+            out.append(w[:p] + w[p + 1:] if rng.random() < 0.5 else w[:p] + w[p] + w[p:])
+        if len(out) == count:
+            break
+    return out
+
+
+# --- benchmarks: fn(core, rng) -> {metric: ms} ---
+
+def bench_search(core, rng):
+    queries = title_queries(pairs=0)
+    build_ms, _ = timed(lambda: core.index)
+    out = {"index_build_ms": build_ms}
+    out.update(latencies(lambda q: core.search_page(q, 20), queries, "first_page"))
+    core.query_cache.clear()
+    out.update(latencies(lambda q: core.search_page(q, 20, core.search_page(q, 20).cursor), queries, "two_pages"))
+    out.update(latencies(lambda q: core.search_page(q, 20), typo_queries(core.catalog, 50, rng), "fuzzy"))
+    # search-as-you-type: every prefix of a few titles
+    titles = [core.catalog.value(int(i), "title").lower() for i in rng.choice(core.catalog.ids(), 10)]
+    out.update(latencies(lambda q: core.suggest_ids(q), [t[:n] for t in titles for n in range(1, len(t) + 1)],
+                         "suggest"))
+    return out
+
+
+def bench_text(core, rng):
+    words = description_words()
+    queries = [" ".join(rng.choice(words, int(rng.integers(1, 4)), replace=False)) for _ in range(100)]
+    out = {"index_build_ms": timed(lambda: core.text_index)[0]}
+    out.update(latencies(lambda q: core.text_search_ids(q, 20), queries, "query"))
+    core.query_cache.clear()
+    out.update(latencies(lambda q: core.search_page(q, 20), queries, "search_page"))
+    return out
+
+
+def bench_feed(core, rng):
+    ids = core.catalog.ids()
+    users = [[int(i) for i in rng.choice(ids, int(rng.integers(1, 30)), replace=False)] for _ in range(10)]
+    out = latencies(lambda f: core.feed_page(f, 100, 0, session=str(f)), users, "first_page")
+    out.update(latencies(lambda f: [core.feed_page(f, 100, o, session=str(f)) for o in range(100, 1000, 100)],
+                         users, "next_9_pages"))
+    out.update(latencies(lambda f: core.feed_page(f, 100, 0, session=str(f)), users, "reopen"))
+    out["no_favourites_first_page_ms"] = timed(lambda: core.feed_page([], 100, 0, session="new"))[0]
+    return out
+
+
+def bench_filter(core, rng):
+    genres = core.catalog.genre_names
+    build_ms, _ = timed(lambda: core.facets.query())
+    combos = [dict(genres=[g]) for g in genres]
+    combos += [dict(genres=list(rng.choice(genres, 2, replace=False))) for _ in range(10)]
+    combos += [dict(any_genres=list(rng.choice(genres, 3, replace=False)), years=(2000, 2015), min_rating=7.0)
+               for _ in range(10)]
+    out = {"facets_build_ms": build_ms}
+    out.update(latencies(lambda f: core.browse(**f, limit=50), combos, "browse"))
+    out.update(latencies(lambda g: core.genre_ids(g), genres, "genre_ids"))
+    out.update(latencies(lambda f: core.catalog.where(**f), combos, "mask_scan"))
+    return out
+
+
+POSTERS = 100  # the poster benchmark doesn't depend on catalog size: it runs once
+
+
+def bench_posters(core, rng):
+    try:
+        from PIL import Image
+    except ImportError:
+        raise Skip("Pillow not installed")
+    with tempfile.TemporaryDirectory() as tmp:
+        movies = []
+        for i in range(POSTERS):
+            path = os.path.join(tmp, f"src{i}.jpg")
+            noise = rng.integers(0, 256, (900, 600, 3), dtype=np.uint8)
+            Image.fromarray(noise).save(path, quality=90)
+            movies.append({"title": f"Poster {i}", "year": 2000, "image": path})
+        pipeline = PosterPipeline(os.path.join(tmp, "out"), workers=1)
+        cold_ms, report = timed(pipeline.run, [dict(m) for m in movies])
+        warm_ms, _ = timed(pipeline.run, [dict(m) for m in movies])
+        if report.processed != POSTERS:
+            raise RuntimeError(f"poster pipeline processed {report.processed}/{POSTERS}: {report.summary()}")
+        out = {"resize_per_poster_ms": cold_ms / POSTERS, "rerun_unchanged_ms": warm_ms}
+
+        catalog = Catalog()
+        for m in movies:
+            catalog.append({**m, "rating": 7.0, "genres": []})
+        path = os.path.join(tmp, "posters.atlas")
+        out["atlas_per_poster_ms"] = timed(lambda: write_atlas(catalog, path, workers=1))[0] / POSTERS
+        out["atlas_rerun_unchanged_ms"] = timed(lambda: write_atlas(catalog, path, workers=1))[0]
+        atlas = PosterAtlas(path)
+        # the detail panel size: what a click used to decode from the full source
+        out["atlas_read_ms"] = timed(lambda: [atlas.get(i, (260, 390)) for i in range(POSTERS)])[0] / POSTERS
+        out["source_decode_ms"] = timed(lambda: [load_poster_image(m["image"], (260, 390))
+                                                 for m in movies])[0] / POSTERS
+        atlas.close()
+    return out
+
+
+def bench_treeview(core, rng):
+    import tkinter as tk
+    from tkinter import ttk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        raise Skip(f"no display ({e})")
+    root.withdraw()
+    try:
+        tree = ttk.Treeview(root, columns=("Title", "Year", "Rating", "Genres"), show="headings")
+
+        def fill(ids):
+            for m in core.catalog.rows(ids):
+                tree.insert("", "end", iid=str(m.id),
+                            values=(m["title"], m["year"], m["rating"], ", ".join(m["genres"])))
+            root.update_idletasks()
+
+        page = core.search_page("a", 100).ids
+        out = {"search_page_100_ms": timed(fill, page)[0]}
+        tree.delete(*tree.get_children())
+        ids = core.catalog.ids()[:10000]
+        out["insert_10k_ms"] = timed(fill, ids)[0]
+        out["clear_10k_ms"] = timed(lambda: (tree.delete(*tree.get_children()), root.update_idletasks()))[0]
+        return out
+    finally:
+        root.destroy()
+
+
+def bench_recommend(core, rng):
+    cat = core.catalog
+    build_ms, similar = timed(SimilarityIndex.build, cat, 10)
+    probe = [int(i) for i in rng.integers(0, cat.size, 1000)]
+    out = {"similar_build_ms": build_ms,
+           "similar_lookup_ms": timed(lambda: [similar.neighbours(i) for i in probe])[0] / len(probe)}
+    interactions = synthetic_interactions(cat, min(cat.size, 5000), seed=1)
+    model = ImplicitALS(factors=32, iterations=3)
+    out["als_fit_3it_ms"] = timed(model.fit, interactions)[0]
+    favourites = [interactions.row(u) for u in range(min(200, interactions.n_users))]
+    ms, _ = timed(lambda: [model.recommend_for(f, 10, allowed=cat.alive) for f in favourites])
+    out["recommend_for_ms"] = ms / len(favourites)
+    return out
+
+
+BENCHMARKS = {
+    "search": (bench_search, True),        # name -> (fn, depends on catalog size)
+    "text": (bench_text, True),
+    "filter": (bench_filter, True),
+    "feed": (bench_feed, True),
+    "posters": (bench_posters, False),
+    "treeview": (bench_treeview, True),
+    "recommend": (bench_recommend, True),
+}
+
+
+# --- history and thresholds ---
+
+def machine():
+    return {"platform": platform.platform(), "machine": platform.machine(), "cpus": os.cpu_count(),
+            "python": platform.python_version(), "numpy": np.__version__}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path, same_machine):
+    try:
+        with open(path) as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    except OSError:
+        return []
+    return [r for r in runs if r.get("machine") == same_machine]
+
+
+def limits_for(name, thresholds):
+    """Merged {max_ratio, min_delta_ms, max_ms} for a metric: defaults, then every matching pattern."""
+    limits = dict(thresholds.get("default", {}))
+    for pattern, override in thresholds.get("metrics", {}).items():
+        if fnmatch.fnmatch(name, pattern):
+            limits.update(override)
+    return limits
+
+
+def regressions(results, history, thresholds, window):
+    """(metric, message) for every metric over its ceiling or slower than its recent median."""
+    out = []
+    for name, value in sorted(results.items()):
+        limits = limits_for(name, thresholds)
+        if limits.get("max_ms") is not None and value > limits["max_ms"]:
+            out.append((name, f"{value:.2f} ms > ceiling {limits['max_ms']} ms"))
+            continue
+        past = [r["results"][name] for r in history[-window:] if name in r["results"]]
+        if not past:
+            continue
+        baseline = statistics.median(past)
+        if value > baseline * limits.get("max_ratio", 1.25) and value - baseline > limits.get("min_delta_ms", 0.5):
+            out.append((name, f"{value:.2f} ms vs median {baseline:.2f} ms of last {len(past)} run(s)"))
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run just these benchmarks")
+    parser.add_argument("--history", default=HISTORY)
+    parser.add_argument("--thresholds", default=THRESHOLDS)
+    parser.add_argument("--window", type=int, default=5, help="past runs the baseline median is taken over")
+    parser.add_argument("--check", action="store_true", help="exit 1 if any metric regressed")
+    parser.add_argument("--no-save", action="store_true", help="don't append this run to the history")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    results, skipped = {}, {}
+    names = args.only or list(BENCHMARKS)
+    for n in args.sizes:
+        core = None
+        for name in names:
+            fn, scales = BENCHMARKS[name]
+            label = n if scales else "any"
+            if not scales and n != args.sizes[0]:
+                continue
+            if core is None:
+                start = time.perf_counter()
+                core = Primeflix(synthetic_catalog(n, seed=args.seed, descriptions=True))
+                print(f"--- {n:,} titles (generated in {time.perf_counter() - start:.1f}s)")
+            try:
+                metrics = fn(core, np.random.default_rng(args.seed))
+            except Skip as e:
+                skipped[name] = str(e)
+                print(f"{name:<10} skipped: {e}")
+                continue
+            for metric, ms in metrics.items():
+                results[f"{name}/{label}/{metric}"] = round(ms, 4)
+                print(f"{name:<10} {metric:<24} {ms:>12.3f} ms")
+
+    same_machine = machine()
+    history = load_history(args.history, same_machine)
+    with open(args.thresholds) as f:
+        thresholds = json.load(f)
+    slow = regressions(results, history, thresholds, args.window)
+    for name, message in slow:
+        print(f"REGRESSION {name}: {message}")
+    if not slow:
+        print(f"no regressions ({len(results)} metrics, {min(len(history), args.window)} past run(s) on this machine)")
+
+    if not args.no_save:
+        run = {"time": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+               "commit": git_commit(), "machine": same_machine, "sizes": args.sizes,
+               "results": results, "skipped": skipped, "regressions": [name for name, _ in slow]}
+        with open(args.history, "a") as f:
+            f.write(json.dumps(run) + "\n")
+    return 1 if args.check and slow else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
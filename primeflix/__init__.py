@@ -0,0 +1,4 @@
+"""
+Non-UI building blocks for PRIMEFLIX (search, catalog, posters, ...).
+Nothing in here imports tkinter, so it can be used and timed without a display.
+"""
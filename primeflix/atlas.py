@@ -0,0 +1,339 @@
+import argparse
+import io
+import json
+import logging
+import mmap
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from primeflix import metrics
+from primeflix.catalog import PathTable
+from primeflix.posters import PipelineReport
+
+log = logging.getLogger(__name__)
+
+# --- Poster atlas ---
+#
+# Every poster at every size the UI draws, packed into one file that is opened
+# with a single mmap, so showing a poster is a slice of the mapping instead of
+# an open() on the (often network-mounted) poster folder plus a full decode:
+#
+#   b"PFXATLAS" | u64 header length | JSON header | index arrays | poster data
+#
+# The index is keyed by movie id (catalog row): index[id, size] = (offset,
+# length) of that poster in the data region, length -1 if there is none. The
+# source path (source_id[id] into an interned path table, as movies may share
+# a poster), size and mtime of each poster are kept too, so a rebuild copies
+# unchanged posters over from the previous atlas and only decodes new or
+# changed sources, and a reader can tell when a movie's image was replaced.
+# Movies sharing a source share its job and its stored bytes. Posters are
+# written to the file as they are encoded; the writer keeps only the index.
+#
+# Posters are stored as JPEG (compact) or raw RGB pixels (no decode at all, but
+# width * height * 3 bytes each).
+
+MAGIC = b"PFXATLAS"
+VERSION = 2  # 2: source_id section (movies sharing a poster)
+ALIGN = 64
+ATLAS_SIZES = ((200, 300), (260, 390))  # grid / search panel / popup, detail panel
+FORMATS = ("jpeg", "raw")
+
+
+def _render(job):
+    """
+    Worker: decode one source poster and encode it at every size.
+    Returns (list of bytes per size, error). Runs in a pool process.
+    """
+    src, sizes, fmt, quality = job
+    try:
+        from PIL import Image
+        with Image.open(src) as img:
+            img.draft("RGB", max(sizes))
+            img = img.convert("RGB")
+        out = []
+        for size in sizes:
+            resized = img.resize(tuple(size), Image.LANCZOS)
+            if fmt == "raw":
+                out.append(resized.tobytes())
+            else:
+                buf = io.BytesIO()
+                resized.save(buf, format="JPEG", quality=quality)
+                out.append(buf.getvalue())
+        return out, None
+    except Exception as e:
+        return None, f"failed to process: {e}"
+
+
+class PosterAtlas:
+    """An opened atlas file. get() returns a PIL image, or None if the poster is not in it."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a PRIMEFLIX poster atlas")
+        size = int.from_bytes(self._map[len(MAGIC):len(MAGIC) + 8], "little")
+        start = len(MAGIC) + 8
+        header = json.loads(self._map[start:start + size])
+        if header["version"] != VERSION:
+            raise ValueError(f"{path}: atlas version {header['version']}, expected {VERSION}")
+        self.sizes = [tuple(s) for s in header["sizes"]]
+        self.format = header["format"]
+        self._sizes = {s: i for i, s in enumerate(self.sizes)}
+        self._base = -(-(start + size) // ALIGN) * ALIGN
+        self._sections = header["sections"]
+        self._data = self._base + header["data"]
+        self.index = self._array("index")
+        self.source_size = self._array("source_size")
+        self.source_mtime = self._array("source_mtime")
+        self.source_id = self._array("source_id")
+        self.sources = PathTable.from_sections(lambda name: self._array("sources_" + name))
+
+    def _array(self, name):
+        dtype, offset, shape = self._sections[name]
+        count = int(np.prod(shape))
+        if count == 0:  # may sit past the end of the file: nothing was written for it
+            return np.zeros(shape, np.dtype(dtype))
+        return np.frombuffer(self._map, np.dtype(dtype), count, self._base + offset).reshape(shape)
+
+    def __len__(self):
+        return len(self.index)
+
+    def source(self, movie_id):
+        """Source path the stored posters of `movie_id` were made from (None if none)."""
+        if not 0 <= movie_id < len(self.index) or self.index[movie_id, 0, 1] < 0 or self.source_id[movie_id] < 0:
+            return None
+        return self.sources[int(self.source_id[movie_id])]
+
+    def fresh(self, movie_id, source):
+        """True if the posters of `movie_id` were made from `source` as it is on disk now (path, size, mtime)."""
+        src = os.path.abspath(os.path.expanduser(source))
+        if self.source(movie_id) != src:
+            return False
+        try:
+            st = os.stat(src)
+        except OSError:
+            return False
+        return self.source_size[movie_id] == st.st_size and self.source_mtime[movie_id] == st.st_mtime
+
+    def read(self, movie_id, size):
+        """Stored bytes (JPEG or RGB pixels, see .format) as a memoryview, or None."""
+        s = self._sizes.get(tuple(size))
+        if s is None or not 0 <= movie_id < len(self.index):
+            return None
+        offset, length = self.index[movie_id, s].tolist()
+        if length < 0:
+            return None
+        return memoryview(self._map)[self._data + offset:self._data + offset + length]
+
+    def get(self, movie_id, size, source=None):
+        """
+        Poster of `movie_id` at `size` as an RGB PIL image, or None if the atlas
+        has none, or (when `source` is given) was made from another file or
+        from an older version of it (see fresh()). Decodes and stats: call it
+        off the UI thread.
+        """
+        data = self.read(movie_id, size)
+        if data is None:
+            return None
+        if source is not None and not self.fresh(movie_id, source):
+            return None
+        from PIL import Image
+        with metrics.timer("poster_atlas_read_seconds"):
+            if self.format == "raw":
+                img = Image.frombytes("RGB", tuple(size), bytes(data))
+            else:
+                with Image.open(io.BytesIO(data)) as jpeg:
+                    img = jpeg.convert("RGB")
+        metrics.inc("poster_atlas_hits_total")
+        return img
+
+    def close(self):
+        # the arrays are views into the mapping: drop them first, or close() refuses
+        self.index = self.source_size = self.source_mtime = self.source_id = self.sources = None
+        self._map.close()
+
+
+def open_atlas(path):
+    """PosterAtlas at `path`, or None (with a log line) if it is unset, missing or invalid."""
+    if not path:
+        return None
+    try:
+        return PosterAtlas(path)
+    except (OSError, ValueError) as e:
+        log.warning("Poster atlas not used: %s", e)
+        return None
+
+
+def write_atlas(catalog, path, sizes=ATLAS_SIZES, fmt="jpeg", quality=90, workers=None):
+    """
+    Write the posters of every movie in `catalog` to the atlas at `path`,
+    reusing posters of an existing atlas there whose source file is unchanged.
+    Returns a PipelineReport counted per source file (unchanged = copied over
+    from the previous atlas).
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown atlas format {fmt!r} (expected one of {FORMATS})")
+    report = PipelineReport()
+    try:
+        import PIL  # noqa: F401  (only checking it is installed)
+    except ImportError:
+        log.warning("Pillow not available — skipping the poster atlas.")
+        return report
+
+    start = time.perf_counter()
+    sizes = [tuple(s) for s in sizes]
+    n = catalog.size
+    old = open_atlas(path) if os.path.exists(path) else None
+    if old is not None and (old.sizes != sizes or old.format != fmt):
+        old = None  # different sizes / format: every poster is made again
+
+    sources = PathTable()
+    source_id = np.full(n, -1, np.int32)
+    source_size = np.full(n, -1, np.int64)
+    source_mtime = np.zeros(n, np.float64)
+    stats, movies_of = {}, {}  # source id -> os.stat (None: missing), movie ids using it
+    for i in range(n):
+        if not catalog.alive[i]:
+            continue
+        p = catalog.value(i, "image")
+        if not p:
+            report.fail(catalog.value(i, "title"), None, "no path set")
+            continue
+        src = os.path.abspath(os.path.expanduser(p))
+        sid = source_id[i] = sources.intern(src)
+        if sid not in stats:
+            try:
+                stats[sid] = os.stat(src)
+            except OSError:
+                stats[sid] = None
+        st = stats[sid]
+        if st is None:
+            report.fail(catalog.value(i, "title"), src, "missing")
+            continue
+        source_size[i], source_mtime[i] = st.st_size, st.st_mtime
+        movies_of.setdefault(sid, []).append(i)
+
+    # one job per source file, however many movies use it; unchanged ones come from the old atlas
+    previous = {}  # source path -> a movie of the old atlas made from it
+    if old is not None:
+        for j in np.flatnonzero((old.index[:, 0, 1] >= 0) & (old.source_id >= 0)).tolist():
+            previous.setdefault(old.sources[int(old.source_id[j])], j)
+    reuse, jobs, pending = [], [], []
+    for sid, ids in movies_of.items():
+        src, st = sources[sid], stats[sid]
+        j = previous.get(src)
+        if j is not None and old.source_size[j] == st.st_size and old.source_mtime[j] == st.st_mtime:
+            reuse.append((ids, j))
+        else:
+            jobs.append((src, sizes, fmt, quality))
+            pending.append((ids, src, st))
+
+    # posters go to the file as they come back: only their offsets stay in memory
+    index = np.full((n, len(sizes), 2), -1, np.int64)
+    sections = {"index": index, "source_size": source_size, "source_mtime": source_mtime, "source_id": source_id}
+    for name, array in sources.sections().items():
+        sections["sources_" + name] = array
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        layout = _begin(f, sizes, fmt, sections)
+        offset = 0
+        for ids, j in reuse:
+            offset = _put(f, index, ids, [old.read(j, s) for s in sizes], offset)
+        report.unchanged = len(reuse)
+        for (ids, src, st), (encoded, error) in zip(pending, _map(jobs, workers)):
+            if error is not None:
+                for i in ids:
+                    report.fail(catalog.value(i, "title"), src, error)
+                source_size[ids] = -1
+                continue
+            offset = _put(f, index, ids, encoded, offset)
+            report.bytes_read += st.st_size
+            report.processed += 1
+        _finish(f, layout, sections)
+    os.replace(tmp, path)
+    if old is not None:
+        old.close()
+    report.elapsed = time.perf_counter() - start
+    metrics.observe("poster_atlas_build_seconds", report.elapsed)
+    log.info("Poster atlas %s: %s", path, report.summary())
+    for failure in report.failures:
+        log.warning("Poster failed: %(title)s (%(source)s) -> %(reason)s", failure)
+    return report
+
+
+def _map(jobs, workers):
+    """(encoded, error) per job, in order, each as soon as it is done."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) < 2:
+        for job in jobs:
+            yield _render(job)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_render, jobs, chunksize=max(1, len(jobs) // (workers * 8)))
+
+
+def _begin(f, sizes, fmt, sections):
+    """Write the header for `sections` (shapes are final, contents are not) and seek to the data region."""
+    header = {"version": VERSION, "sizes": [list(s) for s in sizes], "format": fmt, "sections": {}}
+    offset = 0
+    for name, array in sections.items():
+        offset = -(-offset // ALIGN) * ALIGN
+        header["sections"][name] = [array.dtype.str, offset, list(array.shape)]
+        offset += array.nbytes
+    header["data"] = -(-offset // ALIGN) * ALIGN
+    raw = json.dumps(header).encode()
+    base = -(-(len(MAGIC) + 8 + len(raw)) // ALIGN) * ALIGN
+    f.write(MAGIC + len(raw).to_bytes(8, "little") + raw)
+    f.seek(base + header["data"])
+    return base, header
+
+
+def _put(f, index, ids, encoded, offset):
+    """Append one source's posters (one per size) for movies `ids`; returns the new data offset."""
+    for s, data in enumerate(encoded):
+        index[ids, s] = (offset, len(data))
+        f.write(data)
+        offset += len(data)
+    return offset
+
+
+def _finish(f, layout, sections):
+    base, header = layout
+    for name, array in sections.items():
+        f.seek(base + header["sections"][name][1])
+        f.write(np.ascontiguousarray(array).tobytes())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack every movie poster, at every UI size, into one atlas file.")
+    parser.add_argument("out", help="atlas file to write (e.g. posters.atlas)")
+    parser.add_argument("--catalog", help="catalog snapshot the movie ids refer to (default: the bundled list)")
+    parser.add_argument("--format", choices=FORMATS, default="jpeg",
+                        help="jpeg (small) or raw RGB (no decode when shown, ~180 KB per 200x300 poster)")
+    parser.add_argument("--quality", type=int, default=90)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--report", help="write the JSON report (incl. failures) here")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.catalog:
+        from primeflix import snapshot
+        catalog = snapshot.load(args.catalog).catalog
+    else:
+        from primeflix.movies import bundled_catalog
+        catalog = bundled_catalog()
+    report = write_atlas(catalog, args.out, fmt=args.format, quality=args.quality, workers=args.workers)
+    if os.path.exists(args.out):
+        print(f"{len(catalog)} movies -> {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB)")
+    if args.report:
+        report.write_json(args.report)
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,560 @@
+import re
+from array import array
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+# --- Columnar movie catalog ---
+#
+# One NumPy array per field instead of one dict per movie:
+#   title_id / image_id  int32   -> index into a StringTable / PathTable (-1 = no image)
+#   desc_id              int32   -> index into a StringTable (-1 = no description)
+#   year                 int16
+#   rating10             int16   rating * 10, so 7.1 stays 7.1 on the way out
+#   genre_mask           uint64  bit i set = movie has genre_names[i]
+#   alive                bool    False once a movie is removed (ids never move)
+#
+# A movie's id is its row number. Rows are handed out as MovieRow views, which
+# behave like the old dicts (m["title"], m.get("image"), ...).
+
+MAX_GENRES = 64
+FIELDS = ("title", "year", "rating", "genres", "image", "description")
+SORT_KEYS = ("title", "year", "rating")
+
+
+def fold_title(title):
+    """`title` with case, spacing and punctuation folded away: what makes two titles the same movie's."""
+    return re.sub(r"[\W_]+", " ", title.casefold()).strip()
+
+
+class StringTable:
+    """
+    Interned strings: every distinct string is stored once and referenced by id.
+    A table opened from a snapshot keeps its strings packed (one UTF-8 blob +
+    offsets) and decodes them on access; the lookup dict for intern() is only
+    built the first time a string is added.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self._ids = {}
+        self._blob = b""
+        self._offsets = None
+        self._packed = 0
+
+    @classmethod
+    def from_packed(cls, blob, offsets):
+        table = cls()
+        table._blob = blob
+        table._offsets = offsets
+        table._packed = len(offsets) - 1
+        table._ids = None
+        return table
+
+    def pack(self):
+        """(utf-8 blob, int64 offsets) for every string, as stored in snapshots."""
+        encoded = [self[i].encode() for i in range(len(self))]
+        offsets = np.zeros(len(encoded) + 1, np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        return b"".join(encoded), offsets
+
+    def get(self, s):
+        """Id of `s`, None if it was never interned."""
+        if self._ids is None:
+            self._ids = {self[i]: i for i in range(self._packed)}
+        return self._ids.get(s)
+
+    def intern(self, s):
+        i = self.get(s)
+        if i is None:
+            i = self._ids[s] = len(self)
+            self.strings.append(s)
+        return i
+
+    def __getitem__(self, i):
+        if i < self._packed:
+            return bytes(self._blob[self._offsets[i]:self._offsets[i + 1]]).decode()
+        return self.strings[i - self._packed]
+
+    def __len__(self):
+        return self._packed + len(self.strings)
+
+    def nbytes(self):
+        return len(self._blob) + sum(len(s) for s in self.strings)
+
+
+class PathTable:
+    """
+    Interned file paths, each kept as (directory id, file name id) over two
+    StringTables, so the folder shared by thousands of posters is stored once.
+    Same interface as StringTable; sections() / from_sections() are the
+    snapshot form.
+    """
+
+    def __init__(self):
+        self.dirs = StringTable()
+        self.names = StringTable()
+        self.dir_ids = array("i")
+        self.name_ids = array("i")
+        # path lookup without keeping full path strings: file name id -> first
+        # path with that name, plus {(dir id, name id): path} for the rest
+        self._by_name = array("i")
+        self._more = {}
+
+    @classmethod
+    def from_sections(cls, get):
+        """Table over arrays from a snapshot: get(name) for every name in sections()."""
+        table = cls()
+        table.dirs = StringTable.from_packed(get("dirs_blob"), get("dirs_offsets"))
+        table.names = StringTable.from_packed(get("names_blob"), get("names_offsets"))
+        table.dir_ids = get("dir_ids")
+        table.name_ids = get("name_ids")
+        table._by_name = None
+        return table
+
+    def sections(self):
+        """{name: array} as stored in snapshots."""
+        out = {}
+        for name, strings in (("dirs", self.dirs), ("names", self.names)):
+            blob, offsets = strings.pack()
+            out[name + "_blob"] = np.frombuffer(blob, np.uint8)
+            out[name + "_offsets"] = offsets
+        out["dir_ids"] = np.asarray(self.dir_ids, np.int32)
+        out["name_ids"] = np.asarray(self.name_ids, np.int32)
+        return out
+
+    def intern(self, path):
+        if self._by_name is None:  # opened from a snapshot: make it appendable
+            self._index()
+        cut = max(path.rfind("/"), path.rfind("\\")) + 1
+        d = self.dirs.intern(path[:cut])
+        name = self.names.intern(path[cut:])
+        if name == len(self._by_name):
+            self._by_name.append(len(self))  # new file name, so a new path
+        else:
+            first = self._by_name[name]
+            if self.dir_ids[first] == d:
+                return first
+            i = self._more.get((d, name))
+            if i is not None:
+                return i
+            self._more[(d, name)] = len(self)
+        self.dir_ids.append(d)
+        self.name_ids.append(name)
+        return len(self) - 1
+
+    def _index(self):
+        self.dir_ids = array("i", np.asarray(self.dir_ids, np.int32).tobytes())
+        self.name_ids = array("i", np.asarray(self.name_ids, np.int32).tobytes())
+        self._by_name = array("i", [-1]) * len(self.names)
+        for i, (d, name) in enumerate(zip(self.dir_ids, self.name_ids)):
+            if self._by_name[name] < 0:
+                self._by_name[name] = i
+            else:
+                self._more[(d, name)] = i
+
+    def __getitem__(self, i):
+        return self.dirs[self.dir_ids[i]] + self.names[self.name_ids[i]]
+
+    def __len__(self):
+        return len(self.dir_ids)
+
+    def nbytes(self):
+        return self.dirs.nbytes() + self.names.nbytes() + 8 * len(self)
+
+
+class MovieRow(Mapping):
+    """Read/write view of one catalog row with the same keys as the old movie dicts."""
+
+    __slots__ = ("catalog", "id")
+
+    def __init__(self, catalog, movie_id):
+        self.catalog = catalog
+        self.id = movie_id
+
+    def __getitem__(self, key):
+        return self.catalog.value(self.id, key)
+
+    def __setitem__(self, key, value):
+        self.catalog.set(self.id, key, value)
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __eq__(self, other):
+        if isinstance(other, MovieRow):
+            return self.catalog is other.catalog and self.id == other.id
+        return Mapping.__eq__(self, other)
+
+    def __hash__(self):
+        return hash((id(self.catalog), self.id))
+
+    def __repr__(self):
+        return f"MovieRow({self.id}, {dict(self)!r})"
+
+
+class RowList(Sequence):
+    """MovieRow views over an array of ids, created on access (no per-row objects up front)."""
+
+    __slots__ = ("catalog", "ids")
+
+    def __init__(self, catalog, ids):
+        self.catalog = catalog
+        self.ids = np.asarray(ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return RowList(self.catalog, self.ids[i])
+        return MovieRow(self.catalog, int(self.ids[i]))
+
+
+class Catalog(Sequence):
+    """
+    Columnar store for movies. Iterating / indexing yields MovieRow views of the
+    live (not removed) rows in id order, so it can stand in for the old MOVIES list.
+    Filters are vectorized: see mask() / where().
+    Listeners registered with subscribe() are called as fn(event, movie_id, row)
+    with event in ("add", "update", "remove").
+    """
+
+    def __init__(self, capacity=64):
+        self.titles = StringTable()
+        self.images = PathTable()
+        self.descriptions = StringTable()
+        self.genre_names = []
+        self._genre_bit = {}
+        self.size = 0
+        self._removed = 0
+        self._live = None
+        self._listeners = []
+        self.version = 0  # bumped on every add, remove or edit (see QueryCache)
+        self.text_version = 0  # bumped when a title or description is added or edited (see TextIndex)
+        self._orders = {}  # (by, descending) -> (order, rank), see order()
+        self._alloc(max(capacity, 1))
+
+    @classmethod
+    def from_dicts(cls, movies):
+        movies = list(movies)
+        catalog = cls(capacity=len(movies))
+        for m in movies:
+            catalog.append(m)
+        return catalog
+
+    @classmethod
+    def from_columns(cls, columns, titles, images, genre_names, descriptions=None):
+        """
+        Catalog over existing column arrays (as returned by columns()) and string
+        tables, without copying: used to open snapshots. Arrays may be read-only
+        memory maps; the first append moves them into regular arrays. Without
+        "desc_id" (older snapshots) no movie has a description.
+        """
+        catalog = cls(capacity=1)
+        for name, array in columns.items():
+            setattr(catalog, name, array)
+        if "desc_id" not in columns:
+            catalog.desc_id = np.full(len(columns["alive"]), -1, np.int32)
+        catalog.titles = titles
+        catalog.images = images
+        if descriptions is not None:
+            catalog.descriptions = descriptions
+        for name in genre_names:
+            catalog.genre_bit(name)
+        catalog.size = len(columns["alive"])
+        catalog._removed = catalog.size - int(np.count_nonzero(columns["alive"]))
+        return catalog
+
+    # --- storage ---
+    def _alloc(self, capacity):
+        self.title_id = np.zeros(capacity, np.int32)
+        self.image_id = np.full(capacity, -1, np.int32)
+        self.desc_id = np.full(capacity, -1, np.int32)
+        self.year = np.zeros(capacity, np.int16)
+        self.rating10 = np.zeros(capacity, np.int16)
+        self.genre_mask = np.zeros(capacity, np.uint64)
+        self.alive = np.zeros(capacity, bool)
+
+    def _grow(self, needed):
+        capacity = max(len(self.alive), 1)
+        if needed <= len(self.alive):
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("title_id", "image_id", "desc_id", "year", "rating10", "genre_mask", "alive"):
+            old = getattr(self, name)
+            new = np.full(capacity, -1 if name in ("image_id", "desc_id") else 0, old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def columns(self):
+        """Trimmed views of the column arrays (length = number of ids ever used)."""
+        n = self.size
+        return {"title_id": self.title_id[:n], "image_id": self.image_id[:n], "desc_id": self.desc_id[:n],
+                "year": self.year[:n], "rating10": self.rating10[:n], "genre_mask": self.genre_mask[:n],
+                "alive": self.alive[:n]}
+
+    def nbytes(self):
+        """Approximate memory used by columns and string tables."""
+        total = sum(a.nbytes for a in self.columns().values())
+        return total + self.titles.nbytes() + self.images.nbytes() + self.descriptions.nbytes()
+
+    # --- genres ---
+    def genre_bit(self, name):
+        bit = self._genre_bit.get(name)
+        if bit is None:
+            if len(self.genre_names) >= MAX_GENRES:
+                raise ValueError(f"Catalog supports at most {MAX_GENRES} genres")
+            bit = self._genre_bit[name] = len(self.genre_names)
+            self.genre_names.append(name)
+        return bit
+
+    def genres_to_mask(self, genres, add=False):
+        """Bitmask for a list of genre names. Unknown names give 0 unless add=True."""
+        mask = 0
+        for g in genres:
+            bit = self.genre_bit(g) if add else self._genre_bit.get(g)
+            if bit is not None:
+                mask |= 1 << bit
+        return mask
+
+    def mask_to_genres(self, mask):
+        mask = int(mask)
+        return [name for bit, name in enumerate(self.genre_names) if mask >> bit & 1]
+
+    # --- mutation ---
+    def subscribe(self, fn):
+        self._listeners.append(fn)
+
+    def _notify(self, event, movie_id):
+        self.version += 1
+        self._orders.clear()
+        for fn in self._listeners:
+            fn(event, movie_id, MovieRow(self, movie_id))
+
+    def append(self, m):
+        movie_id = self.size
+        self._grow(movie_id + 1)
+        self.size += 1
+        self._write(movie_id, m)
+        self.alive[movie_id] = True
+        if self._live is not None:
+            self._live = np.append(self._live, movie_id)
+        self._notify("add", movie_id)
+        return movie_id
+
+    def extend(self, movies):
+        return [self.append(m) for m in movies]
+
+    def extend_columns(self, titles, years, ratings, genre_masks, genre_names, images=None, descriptions=None):
+        """
+        Bulk append: parallel sequences/arrays instead of one dict per movie.
+        `genre_masks` bits refer to positions in `genre_names`; they are remapped
+        onto this catalog's bits. Returns the new ids as an array.
+        """
+        n = len(titles)
+        start = self.size
+        self._grow(start + n)
+        stop = start + n
+        self.title_id[start:stop] = [self.titles.intern(t) for t in titles]
+        self.year[start:stop] = years
+        self.rating10[start:stop] = np.round(np.asarray(ratings, np.float64) * 10)
+        masks = np.asarray(genre_masks, np.uint64)
+        remapped = np.zeros(n, np.uint64)
+        for bit, name in enumerate(genre_names):
+            has = (masks >> np.uint64(bit)) & np.uint64(1)
+            remapped |= has << np.uint64(self.genre_bit(name))
+        self.genre_mask[start:stop] = remapped
+        if images is not None:
+            self.image_id[start:stop] = [self.images.intern(p) if p else -1 for p in images]
+        if descriptions is not None:
+            self.desc_id[start:stop] = [self.descriptions.intern(d) if d else -1 for d in descriptions]
+        self.alive[start:stop] = True
+        self.size = stop
+        self._live = None
+        self.version += 1
+        self.text_version += 1
+        self._orders.clear()
+        if self._listeners:
+            for movie_id in range(start, stop):
+                self._notify("add", movie_id)
+        return np.arange(start, stop)
+
+    def update(self, movie_id, m):
+        self._check(movie_id)
+        self._write(movie_id, m)
+        self._notify("update", movie_id)
+
+    def set(self, movie_id, key, value):
+        self.update(movie_id, {key: value})
+
+    def set_column(self, key, ids, values):
+        """set() for many movies at once: the version (and every cache keyed on it) moves once."""
+        ids = [int(i) for i in ids]
+        if not ids:
+            return
+        for movie_id in ids:
+            self._check(movie_id)
+        for movie_id, value in zip(ids, values):
+            self._write(movie_id, {key: value})
+        self.version += 1
+        self._orders.clear()
+        for movie_id in ids:
+            for fn in self._listeners:
+                fn("update", movie_id, MovieRow(self, movie_id))
+
+    def remove(self, movie_id):
+        self._check(movie_id)
+        self.alive[movie_id] = False
+        self._removed += 1
+        self._live = None
+        self._notify("remove", movie_id)
+
+    def _write(self, movie_id, m):
+        if "title" in m or "description" in m:
+            self.text_version += 1
+        if "title" in m:
+            self.title_id[movie_id] = self.titles.intern(m["title"])
+        if "year" in m:
+            self.year[movie_id] = int(m["year"] or 0)
+        if "rating" in m:
+            self.rating10[movie_id] = round(float(m["rating"] or 0) * 10)
+        if "genres" in m:
+            self.genre_mask[movie_id] = self.genres_to_mask(m["genres"], add=True)
+        if "image" in m:
+            self.image_id[movie_id] = self.images.intern(m["image"]) if m["image"] else -1
+        if "description" in m:
+            self.desc_id[movie_id] = self.descriptions.intern(m["description"]) if m["description"] else -1
+
+    def _check(self, movie_id):
+        if not (0 <= movie_id < self.size and self.alive[movie_id]):
+            raise KeyError(movie_id)
+
+    # --- row access ---
+    def value(self, movie_id, key):
+        if key == "title":
+            return self.titles[self.title_id[movie_id]]
+        if key == "year":
+            return int(self.year[movie_id])
+        if key == "rating":
+            return int(self.rating10[movie_id]) / 10
+        if key == "genres":
+            return self.mask_to_genres(self.genre_mask[movie_id])
+        if key == "image":
+            i = self.image_id[movie_id]
+            return self.images[i] if i >= 0 else None
+        if key == "description":
+            i = self.desc_id[movie_id]
+            return self.descriptions[i] if i >= 0 else None
+        raise KeyError(key)
+
+    def row(self, movie_id):
+        self._check(movie_id)
+        return MovieRow(self, movie_id)
+
+    def rows(self, ids):
+        return [MovieRow(self, int(i)) for i in ids]
+
+    def view(self, ids):
+        """Lazy sequence of rows for `ids` (see RowList)."""
+        return RowList(self, ids)
+
+    def ids(self):
+        """Ids of live rows, ascending."""
+        if not self._removed:
+            return np.arange(self.size)
+        if self._live is None:
+            self._live = np.flatnonzero(self.alive[:self.size])
+        return self._live
+
+    def items(self):
+        for i in self.ids():
+            yield int(i), MovieRow(self, int(i))
+
+    def __len__(self):
+        return self.size - self._removed
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.rows(self.ids()[i])
+        return MovieRow(self, int(self.ids()[i]))
+
+    def __iter__(self):
+        for i in self.ids():
+            yield MovieRow(self, int(i))
+
+    # --- vectorized queries ---
+    def mask(self, genres=(), any_genres=(), years=None, min_rating=None, max_rating=None):
+        """
+        Boolean array over ids for: has every genre in `genres`, at least one of
+        `any_genres`, year within `years` = (lo, hi) inclusive, rating within bounds.
+        """
+        n = self.size
+        out = self.alive[:n].copy()
+        masks = self.genre_mask[:n]
+        if genres:
+            if any(g not in self._genre_bit for g in genres):
+                return np.zeros(n, bool)
+            want = self.genres_to_mask(genres)
+            out &= (masks & np.uint64(want)) == np.uint64(want)
+        if any_genres:
+            out &= (masks & np.uint64(self.genres_to_mask(any_genres))) != 0
+        if years is not None:
+            lo, hi = years
+            year = self.year[:n]
+            if lo is not None:
+                out &= year >= lo
+            if hi is not None:
+                out &= year <= hi
+        if min_rating is not None:
+            out &= self.rating10[:n] >= round(min_rating * 10)
+        if max_rating is not None:
+            out &= self.rating10[:n] <= round(max_rating * 10)
+        return out
+
+    def where(self, **filters):
+        """Ids matching mask(**filters), ascending."""
+        return np.flatnonzero(self.mask(**filters))
+
+    def order(self, by, descending=False):
+        """
+        (order, rank) for sorting every id by "title" (case-insensitive), "year" or
+        "rating", ties in id order: order = ids in sorted order, rank[id] = position.
+        Computed once and kept until the catalog changes.
+        """
+        key = (by, descending)
+        cached = self._orders.get(key)
+        if cached is None:
+            n = self.size
+            if by == "title":
+                folded = [self.titles[i].casefold() for i in range(len(self.titles))]
+                title_rank = np.empty(len(folded), np.int64)
+                title_rank[sorted(range(len(folded)), key=folded.__getitem__)] = np.arange(len(folded))
+                values = title_rank[self.title_id[:n]]
+            elif by in SORT_KEYS:
+                values = {"year": self.year, "rating": self.rating10}[by][:n].astype(np.int64)
+            else:
+                raise KeyError(by)
+            order = np.argsort(-values if descending else values, kind="stable")
+            rank = np.empty(n, np.int64)
+            rank[order] = np.arange(n)
+            cached = self._orders[key] = (order, rank)
+        return cached
+
+    def sort_ids(self, ids, by="rating", descending=True):
+        """
+        `ids` ordered by "title", "year" or "rating" (ties keep id order), using the
+        precomputed order(): a big subset is picked out of the full order in one
+        pass, a small one is sorted by rank.
+        """
+        ids = np.asarray(ids, np.int64)
+        order, rank = self.order(by, descending)
+        if len(ids) * 16 > len(order):
+            member = np.zeros(len(order), bool)
+            member[ids] = True
+            return order[member[order]]
+        return ids[np.argsort(rank[ids])]
@@ -0,0 +1,107 @@
+import http.client
+import json
+from urllib.parse import quote, urlencode, urlsplit
+
+from primeflix.core import BrowsePage, FeedPage, SearchPage
+
+# --- Client for primeflix.server ---
+# Same query methods as primeflix.core.Primeflix (they return movie ids / pages), so
+# the app can talk to a local core or a remote server interchangeably.
+
+
+class APIError(Exception):
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+
+class HttpClient:
+    """Blocking client over one keep-alive connection (reconnects once if it dropped)."""
+
+    def __init__(self, base_url, timeout=5.0):
+        url = urlsplit(base_url)
+        self.host = url.hostname or "127.0.0.1"
+        self.port = url.port or 80
+        self.timeout = timeout
+        self._conn = None
+
+    def request(self, method, path, body=None):
+        data = json.dumps(body).encode() if body is not None else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        for attempt in (0, 1):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request(method, path, body=data, headers=headers)
+                response = self._conn.getresponse()
+                payload = json.loads(response.read() or b"{}")
+                break
+            except (ConnectionError, http.client.HTTPException):
+                self.close()
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise APIError(response.status, payload.get("error", ""))
+        return payload
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @staticmethod
+    def _ids(payload):
+        return [m["id"] for m in payload["results"]]
+
+    def search_page(self, query, limit=20, cursor=None):
+        params = {"q": query, "limit": "all" if limit is None else limit, "fields": "id"}
+        if cursor:
+            params["cursor"] = cursor
+        payload = self.request("GET", "/search?" + urlencode(params))
+        return SearchPage(self._ids(payload), payload["total"], payload["cursor"])
+
+    def search_many(self, queries, limit=20):
+        """Batch search: one list of ids per query."""
+        payload = self.request("POST", "/search", {"queries": list(queries), "limit": limit})
+        return [self._ids(r) for r in payload["results"]]
+
+    def suggest_ids(self, query, limit=8):
+        return self._ids(self.request("GET", "/suggest?" + urlencode({"q": query, "limit": limit})))
+
+    def text_search_ids(self, query, limit=20):
+        return self._ids(self.request("GET", "/text?" + urlencode({"q": query, "limit": limit})))
+
+    def genre_ids(self, genre, limit=None):
+        path = "/genres/" + quote(genre, safe="")
+        return self._ids(self.request("GET", f"{path}?limit={'all' if limit is None else limit}"))
+
+    def browse(self, genres=(), any_genres=(), years=None, min_rating=None, max_rating=None,
+               limit=50, offset=0):
+        params = [("genre", g) for g in genres] + [("any", g) for g in any_genres]
+        lo, hi = years or (None, None)
+        for name, value in (("from", lo), ("to", hi), ("min_rating", min_rating), ("max_rating", max_rating)):
+            if value is not None:
+                params.append((name, value))
+        params += [("limit", "all" if limit is None else limit), ("offset", offset)]
+        payload = self.request("GET", "/browse?" + urlencode(params))
+        facets = payload["facets"]
+        # JSON object keys are strings; decades and star ratings are ints in the core
+        for name in ("decades", "ratings"):
+            facets[name] = {int(k): v for k, v in facets[name].items()}
+        return BrowsePage(self._ids(payload), payload["total"], facets)
+
+    def feed_page(self, favourite_ids=(), limit=100, offset=0, session="default"):
+        payload = self.request("POST", "/feed", {"favourites": list(favourite_ids), "limit": limit,
+                                                 "offset": offset, "session": session})
+        return FeedPage(self._ids(payload), payload["total"])
+
+    def similar_ids(self, movie_id, n=5):
+        try:
+            return self._ids(self.request("GET", f"/similar/{movie_id}?n={n}"))
+        except APIError as e:
+            if e.status == 404:
+                return []
+            raise
+
+    def recommend_ids(self, favourite_ids, k=5):
+        return self._ids(self.request("POST", "/recommend", {"favourites": list(favourite_ids), "k": k}))
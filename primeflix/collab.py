@@ -0,0 +1,305 @@
+import numpy as np
+
+# --- Collaborative filtering from favourites ---
+#
+# Implicit-feedback matrix factorization (Hu, Koren & Volinsky 2008) trained
+# with alternating least squares. A favourite is a positive with confidence
+# 1 + alpha; everything else is a weak negative. Interactions are kept as CSR
+# arrays (indptr/indices) so nothing here loops over users or items in Python:
+# each ALS half-step updates all rows at once with a few conjugate-gradient
+# steps (exact batched solves are kept for folding in a single user).
+
+
+class Interactions:
+    """Binary user x item matrix in CSR form (duplicates removed)."""
+
+    def __init__(self, indptr, indices, n_items):
+        self.indptr = indptr
+        self.indices = indices
+        self.n_items = n_items
+
+    @classmethod
+    def from_pairs(cls, users, items, n_users=None, n_items=None):
+        users = np.asarray(users, np.int64)
+        items = np.asarray(items, np.int64)
+        n_users = int(users.max()) + 1 if n_users is None else n_users
+        n_items = int(items.max()) + 1 if n_items is None else n_items
+        keys = np.unique(users * n_items + items)
+        users, items = np.divmod(keys, n_items)
+        indptr = np.zeros(n_users + 1, np.int64)
+        np.cumsum(np.bincount(users, minlength=n_users), out=indptr[1:])
+        return cls(indptr, items.astype(np.int32), n_items)
+
+    @property
+    def n_users(self):
+        return len(self.indptr) - 1
+
+    @property
+    def nnz(self):
+        return len(self.indices)
+
+    def row(self, user):
+        return self.indices[self.indptr[user]:self.indptr[user + 1]]
+
+    def counts(self):
+        return np.diff(self.indptr)
+
+    def rows(self):
+        """Row index of every stored entry."""
+        return np.repeat(np.arange(self.n_users), self.counts())
+
+    def transpose(self):
+        return Interactions.from_pairs(self.indices, self.rows(), self.n_items, self.n_users)
+
+
+def synthetic_interactions(catalog, n_users, favourites_per_user=20, seed=0):
+    """
+    Favourite events for `n_users` made-up users. Each user likes 1-3 genres;
+    80% of their picks come from those genres and 20% from anywhere, always
+    skewed towards highly rated titles.
+    """
+    rng = np.random.default_rng(seed)
+    ids = catalog.ids()
+    n_genres = len(catalog.genre_names)
+    # popularity grows steeply with rating, so a few titles collect most favourites
+    popularity = np.exp(catalog.rating10[ids].astype(np.float64) / 10 * 1.2)
+    pools = []
+    for bit in range(n_genres):
+        in_genre = (catalog.genre_mask[ids] >> np.uint64(bit)) & np.uint64(1) == 1
+        pool = ids[in_genre]
+        weights = np.cumsum(popularity[in_genre])
+        pools.append((pool, weights / weights[-1] if len(weights) else weights))
+    everything = (ids, np.cumsum(popularity) / popularity.sum())
+
+    counts = np.maximum(rng.poisson(favourites_per_user, n_users), 1)
+    users = np.repeat(np.arange(n_users), counts)
+    liked = rng.integers(0, n_genres, size=(n_users, 3))
+    n_liked = rng.integers(1, 4, size=n_users)
+    pick = rng.integers(0, n_liked[users])
+    genre = liked[users, pick]
+    explore = rng.random(len(users)) < 0.2
+
+    items = np.empty(len(users), np.int64)
+    u = rng.random(len(users))
+    for bit, (pool, cdf) in enumerate(pools):
+        sel = (genre == bit) & ~explore
+        if len(pool) == 0:
+            explore |= sel
+            continue
+        items[sel] = pool[np.minimum(np.searchsorted(cdf, u[sel]), len(pool) - 1)]
+    pool, cdf = everything
+    items[explore] = pool[np.minimum(np.searchsorted(cdf, u[explore]), len(pool) - 1)]
+    return Interactions.from_pairs(users, items, n_users, catalog.size)
+
+
+def holdout(interactions, seed=0):
+    """
+    Leave-one-out split for offline evaluation: one random favourite of every
+    user with at least two is held out. Returns (train, users, held_items).
+    """
+    rng = np.random.default_rng(seed)
+    counts = interactions.counts()
+    users = np.flatnonzero(counts > 1)
+    pick = interactions.indptr[users] + (rng.random(len(users)) * counts[users]).astype(np.int64)
+    keep = np.ones(interactions.nnz, bool)
+    keep[pick] = False
+    train = Interactions.from_pairs(interactions.rows()[keep], interactions.indices[keep],
+                                    interactions.n_users, interactions.n_items)
+    return train, users, interactions.indices[pick].astype(np.int64)
+
+
+def hit_rate(recommended, held_items):
+    """Share of users whose held-out item is in their recommendations (users x k)."""
+    return float((recommended == held_items[:, None]).any(axis=1).mean())
+
+
+def _blocks(matrix, max_events):
+    """Split the non-empty rows of `matrix` into runs touching ~max_events entries each."""
+    active = np.flatnonzero(matrix.counts())
+    cum = np.cumsum(matrix.counts()[active])
+    start = 0
+    while start < len(active):
+        stop = int(np.searchsorted(cum, (cum[start - 1] if start else 0) + max_events, side="right"))
+        stop = max(stop, start + 1)
+        rows = active[start:stop]
+        lo, hi = matrix.indptr[rows[0]], matrix.indptr[rows[-1] + 1]
+        yield rows, lo, hi, matrix.indptr[rows] - lo
+        start = stop
+
+
+def _solve_rows(matrix, other, alpha, reg, max_events=16384):
+    """
+    Exact ALS half-step: factors for every row of `matrix` (CSR) given the
+    factors of the other side, one batched np.linalg.solve per block.
+    Builds an f x f matrix per row, so it is used for small inputs (fold-in).
+    """
+    f = other.shape[1]
+    out = np.zeros((matrix.n_users, f), np.float32)
+    gram = other.T @ other + reg * np.eye(f, dtype=np.float32)
+    for rows, lo, hi, seg in _blocks(matrix, max_events):
+        y = other[matrix.indices[lo:hi]]
+        outer = np.add.reduceat(y[:, :, None] * y[:, None, :], seg, axis=0)
+        b = (1 + alpha) * np.add.reduceat(y, seg, axis=0)
+        out[rows] = np.linalg.solve(gram[None] + alpha * outer, b[..., None])[..., 0]
+    return out
+
+
+def _cg_rows(matrix, other, x, alpha, reg, steps=3, max_events=262144):
+    """
+    Approximate ALS half-step: a few conjugate-gradient steps on every row's
+    normal equations at once, warm-started from `x` (updated in place).
+    Each step costs O(nnz * f) instead of O(nnz * f^2) for the exact solve.
+    """
+    f = other.shape[1]
+    gram = other.T @ other + reg * np.eye(f, dtype=np.float32)
+    x[matrix.counts() == 0] = 0
+    for rows, lo, hi, seg in _blocks(matrix, max_events):
+        y = other[matrix.indices[lo:hi]]
+        owner = np.repeat(np.arange(len(rows)), np.diff(np.append(seg, hi - lo)))
+
+        def apply(v):
+            dots = np.einsum("ij,ij->i", y, v[owner])
+            return v @ gram + alpha * np.add.reduceat(y * dots[:, None], seg, axis=0)
+
+        xb = x[rows]
+        r = (1 + alpha) * np.add.reduceat(y, seg, axis=0) - apply(xb)
+        p = r.copy()
+        rs = np.einsum("ij,ij->i", r, r)
+        for _ in range(steps):
+            ap = apply(p)
+            step = rs / np.maximum(np.einsum("ij,ij->i", p, ap), 1e-20)
+            xb += step[:, None] * p
+            r -= step[:, None] * ap
+            rs_new = np.einsum("ij,ij->i", r, r)
+            p = r + (rs_new / np.maximum(rs, 1e-20))[:, None] * p
+            rs = rs_new
+        x[rows] = xb
+    return x
+
+
+_BLOCK = 256
+
+
+def _top_k(s, k):
+    """
+    Best k columns per row of `s` (width a multiple of _BLOCK), best first.
+    The row is cut into blocks and only the k blocks with the highest maximum
+    are searched: the top k can't live anywhere else, and a max-reduce is much
+    cheaper than partitioning the whole row.
+    """
+    b, n = s.shape
+    if n < 4 * k * _BLOCK:
+        cand_ids = np.broadcast_to(np.arange(n), s.shape)
+        cand = s
+    else:
+        blocks = s.reshape(b, n // _BLOCK, _BLOCK)
+        best = np.argpartition(-blocks.max(axis=2), k - 1, axis=1)[:, :k]
+        cand = np.take_along_axis(blocks, best[:, :, None], axis=1).reshape(b, -1)
+        cand_ids = (best[:, :, None] * _BLOCK + np.arange(_BLOCK)).reshape(b, -1)
+    part = np.argpartition(-cand, k - 1, axis=1)[:, :k]
+    part_s = np.take_along_axis(cand, part, axis=1)
+    order = np.argsort(-part_s, axis=1)
+    return (np.take_along_axis(np.take_along_axis(cand_ids, part, axis=1), order, axis=1),
+            np.take_along_axis(part_s, order, axis=1))
+
+
+class ImplicitALS:
+    """
+    Implicit ALS recommender.
+    fit(Interactions) learns user_factors (users x f) and item_factors (items x f);
+    a user's score for every item is one dot product with item_factors.
+    """
+
+    def __init__(self, factors=32, reg=0.1, alpha=20.0, iterations=10, cg_steps=3, seed=0):
+        self.factors = factors
+        self.reg = reg
+        self.alpha = alpha
+        self.iterations = iterations
+        self.cg_steps = cg_steps
+        self.seed = seed
+        self.user_factors = None
+        self.item_factors = None
+
+    def fit(self, interactions):
+        rng = np.random.default_rng(self.seed)
+        by_item = interactions.transpose()
+        init = lambda n: (rng.standard_normal((n, self.factors)) * 0.01).astype(np.float32)
+        self.user_factors = init(interactions.n_users)
+        self.item_factors = init(interactions.n_items)
+        for _ in range(self.iterations):
+            _cg_rows(interactions, self.item_factors, self.user_factors, self.alpha, self.reg, self.cg_steps)
+            _cg_rows(by_item, self.user_factors, self.item_factors, self.alpha, self.reg, self.cg_steps)
+        return self
+
+    def fold_in(self, items):
+        """Factors for a user who is not in the training data (e.g. the local app user)."""
+        m = Interactions.from_pairs(np.zeros(len(items), np.int64), items, 1, len(self.item_factors))
+        return _solve_rows(m, self.item_factors, self.alpha, self.reg)[0]
+
+    def recommend(self, user_vectors, k=10, exclude=None, allowed=None, batch=1024):
+        """
+        Top-k item ids for each row of `user_vectors` (users x f).
+        - exclude: Interactions with one row per user vector; those items are skipped
+        - allowed: optional bool mask over items (e.g. catalog.alive)
+        Returns (ids, scores), both (users x k), best first.
+        """
+        user_vectors = np.atleast_2d(np.asarray(user_vectors, np.float32))
+        n_items = len(self.item_factors)
+        k = min(k, n_items)
+        factors = self._scoring_factors()
+        ids = np.empty((len(user_vectors), k), np.int64)
+        scores = np.empty((len(user_vectors), k), np.float32)
+        for lo in range(0, len(user_vectors), batch):
+            hi = min(lo + batch, len(user_vectors))
+            s = user_vectors[lo:hi] @ factors.T
+            s[:, n_items:] = -np.inf
+            if allowed is not None:
+                s[:, :n_items][:, ~allowed[:n_items]] = -np.inf
+            if exclude is not None:
+                a, b = exclude.indptr[lo], exclude.indptr[hi]
+                rows = np.repeat(np.arange(hi - lo), np.diff(exclude.indptr[lo:hi + 1]))
+                s[rows, exclude.indices[a:b]] = -np.inf
+            ids[lo:hi], scores[lo:hi] = _top_k(s, k)
+        return ids, scores
+
+    def _scoring_factors(self):
+        """item_factors padded with zero rows to a multiple of _BLOCK (see _top_k)."""
+        cached = getattr(self, "_padded", None)
+        if cached is None or cached[0] is not self.item_factors:
+            n, f = self.item_factors.shape
+            padded = np.zeros((-(-n // _BLOCK) * _BLOCK, f), np.float32)
+            padded[:n] = self.item_factors
+            self._padded = cached = (self.item_factors, padded)
+        return cached[1]
+
+    def recommend_for(self, items, k=10, allowed=None):
+        """Top-k for a user known only by their favourites (folded in, favourites skipped)."""
+        items = np.asarray(items, np.int64)
+        seen = Interactions(np.array([0, len(items)]), items, len(self.item_factors))
+        ids, scores = self.recommend(self.fold_in(items), k, exclude=seen, allowed=allowed)
+        keep = np.isfinite(scores[0])
+        return ids[0][keep], scores[0][keep]
+
+    def recommend_users(self, users, interactions, k=10, allowed=None):
+        """Batch scoring for trained users, skipping what they already favourited."""
+        users = np.asarray(users, np.int64)
+        counts = interactions.counts()[users]
+        indptr = np.zeros(len(users) + 1, np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        # positions of each user's entries inside interactions.indices
+        pos = np.arange(indptr[-1]) + np.repeat(interactions.indptr[users] - indptr[:-1], counts)
+        seen = Interactions(indptr, interactions.indices[pos], interactions.n_items)
+        return self.recommend(self.user_factors[users], k, exclude=seen, allowed=allowed)
+
+    def save(self, path):
+        np.savez(path, user_factors=self.user_factors, item_factors=self.item_factors,
+                 params=np.array([self.factors, self.reg, self.alpha, self.iterations, self.cg_steps], np.float64))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            factors, reg, alpha, iterations, cg_steps = data["params"]
+            model = cls(int(factors), float(reg), float(alpha), int(iterations), int(cg_steps))
+            model.user_factors = data["user_factors"]
+            model.item_factors = data["item_factors"]
+        return model
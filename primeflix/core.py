@@ -0,0 +1,521 @@
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from primeflix import metrics, snapshot
+from primeflix.collab import ImplicitALS
+from primeflix.facets import FacetIndex
+from primeflix.feed import Feed
+from primeflix.recommend import SimilarityIndex
+from primeflix.catalog import SORT_KEYS
+from primeflix.search import FUZZY, TIERS, IncrementalSearch, SearchIndex
+from primeflix.shards import ShardedSearch
+from primeflix.textsearch import TextIndex
+
+log = logging.getLogger(__name__)
+
+# --- Headless search / recommendation core ---
+#
+# Everything the app asks of its data, without tkinter: the Tk window, the HTTP
+# server (primeflix.server) and the benchmarks all go through a Primeflix
+# object. Query methods return movie ids; movie() / movies() turn ids into
+# JSON-ready dicts.
+
+
+def load_collab(path, catalog):
+    """ImplicitALS model at `path`, or None if it can't be used with `catalog`."""
+    try:
+        model = ImplicitALS.load(path)
+    except (OSError, KeyError, ValueError) as e:
+        log.warning("Could not load favourites model %s: %s", path, e)
+        return None
+    if len(model.item_factors) != catalog.size:
+        log.warning("Favourites model %s was trained on a different catalog — ignoring it.", path)
+        return None
+    return model
+
+
+class SearchPage:
+    """One page of ranked results: ids (best first), total matches, cursor for the next page (None = last)."""
+
+    __slots__ = ("ids", "total", "cursor")
+
+    def __init__(self, ids, total, cursor):
+        self.ids = ids
+        self.total = total
+        self.cursor = cursor
+
+
+class BrowsePage:
+    """One page of browse(): ids (best rated first), total matches, facet counts (see FacetResult)."""
+
+    __slots__ = ("ids", "total", "facets")
+
+    def __init__(self, ids, total, facets):
+        self.ids = ids
+        self.total = total
+        self.facets = facets
+
+
+class FeedPage:
+    """One page of the personalized Browse feed: ids in feed order, total movies in the feed."""
+
+    __slots__ = ("ids", "total")
+
+    def __init__(self, ids, total):
+        self.ids = ids
+        self.total = total
+
+
+FEED_SESSIONS = 64  # feeds kept, least recently used dropped first
+
+
+# Within a tier, matches are ordered by one int64 key per movie:
+# (-rating10 << 32) | id, i.e. best rated first, then lowest id. A cursor is
+# "<tier>:<key>" of the last result shown, so pages need no server-side state.
+# The last tier, DESCRIPTION, holds the best TEXT_HITS full-text matches not in
+# an earlier tier, keyed (position << 32) | id so they stay in relevance order.
+
+DESCRIPTION = TIERS
+TEXT_HITS = 100
+
+def _rank_keys(catalog, ids):
+    ids = np.asarray(ids, np.int64)
+    return (-catalog.rating10[ids].astype(np.int64) << 32) | ids
+
+
+def normalize_query(query):
+    """Cache / search key for a typed query: lowercase, single spaces."""
+    return " ".join(query.lower().split())
+
+
+class _Ranked:
+    """Cached per-tier rank keys of one query; `sorted` once they have been fully sorted."""
+
+    __slots__ = ("tiers", "sorted", "nbytes")
+
+    def __init__(self, tiers):
+        self.tiers = tiers
+        self.sorted = False
+        self.nbytes = sum(t.nbytes for t in tiers)
+
+
+class QueryCache:
+    """
+    LRU of normalized query -> ranked matches, bounded by `max_entries` and by
+    `max_bytes` of key arrays. Everything is dropped when the catalog version
+    changes (any add, remove or edit), and put() ignores results computed
+    against an older version. Thread-safe.
+    """
+
+    def __init__(self, catalog, max_entries=1024, max_bytes=128 * 1024 * 1024):
+        self.catalog = catalog
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._items = OrderedDict()
+        self._version = catalog.version
+        self._lock = threading.Lock()
+
+    def _check_version(self):
+        if self._version != self.catalog.version:
+            if self._items:
+                self.invalidations += 1
+            self._items.clear()
+            self.bytes = 0
+            self._version = self.catalog.version
+
+    def get(self, query):
+        with self._lock:
+            self._check_version()
+            value = self._items.get(query)
+            if value is None:
+                self.misses += 1
+                metrics.inc("query_cache_misses_total")
+                return None
+            self._items.move_to_end(query)
+            self.hits += 1
+        metrics.inc("query_cache_hits_total")
+        return value
+
+    def put(self, query, value, version):
+        """Store `value`, computed when the catalog was at `version`."""
+        with self._lock:
+            self._check_version()
+            if version != self._version or not self.max_entries or value.nbytes > self.max_bytes:
+                return
+            old = self._items.pop(query, None)
+            if old is not None:
+                self.bytes -= old.nbytes
+            self._items[query] = value
+            self.bytes += value.nbytes
+            while len(self._items) > self.max_entries or self.bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.bytes -= evicted.nbytes
+                self.evictions += 1
+                metrics.inc("query_cache_evictions_total")
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._items), "bytes": self.bytes, "max_entries": self.max_entries,
+                    "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "invalidations": self.invalidations,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+def _parse_cursor(cursor):
+    try:
+        tier, key = (int(v) for v in cursor.split(":"))
+    except (AttributeError, ValueError):
+        raise ValueError(f"bad cursor {cursor!r}")
+    return tier, key
+
+
+class Primeflix:
+    """
+    Catalog + search index + genre facets + "More like this" table + full-text
+    index (+ optional favourites model). The search index and facets follow
+    catalog changes; the similarity table is a snapshot, and so is a full-text
+    index loaded from one (one built here is rebuilt after catalog changes).
+    All are built on first use (or by warm_up() in the background), so opening a
+    big catalog doesn't wait for them.
+    """
+
+    def __init__(self, catalog, similar=None, collab=None, text=None, shards=0):
+        self.catalog = catalog
+        self.collab = collab
+        # shards > 0: title / genre matching runs on that many shared memory shards (see primeflix.shards)
+        self.shards = ShardedSearch(catalog, shards) if shards else None
+        self._index = None
+        self._live = None
+        self._similar = similar
+        if text is not None and text.version is None:
+            text.version = catalog.text_version  # loaded together (snapshot)
+        self._text = text
+        self._text_lock = threading.Lock()  # one text index build at a time, without blocking self._lock
+        self._facets = None
+        self._feeds = OrderedDict()  # session -> Feed
+        self._lock = threading.Lock()
+        self._feed_lock = threading.Lock()
+        # PRIMEFLIX_QUERY_CACHE: entries (default 1024, 0 = off); PRIMEFLIX_QUERY_CACHE_MB: key bytes (128)
+        self.query_cache = QueryCache(catalog, int(os.environ.get("PRIMEFLIX_QUERY_CACHE", "1024")),
+                                      int(os.environ.get("PRIMEFLIX_QUERY_CACHE_MB", "128")) * 1024 * 1024)
+
+    @classmethod
+    def bundled(cls, shards=0):
+        """
+        The app's movies: the snapshot named by PRIMEFLIX_CATALOG if it exists
+        (see primeflix.snapshot), else the list in primeflix.movies.
+        PRIMEFLIX_CF_MODEL names an optional favourites model.
+        """
+        path = os.environ.get("PRIMEFLIX_CATALOG")
+        if path and os.path.exists(path):
+            snap = snapshot.load(path)
+            catalog, similar, text = snap.catalog, snap.similar, snap.text
+        else:
+            from primeflix.movies import bundled_catalog
+            catalog, similar, text = bundled_catalog(), None, None
+        model = os.environ.get("PRIMEFLIX_CF_MODEL")
+        return cls(catalog, similar, collab=load_collab(model, catalog) if model else None, text=text,
+                   shards=shards)
+
+    @property
+    def index(self):
+        with self._lock:
+            if self._index is None:
+                with metrics.timer("index_build_seconds", index="search"):
+                    index = SearchIndex(self.catalog)
+                self.catalog.subscribe(index.catalog_changed)
+                self._live = IncrementalSearch(index)
+                self._index = index
+            return self._index
+
+    @property
+    def live(self):
+        self.index  # built together
+        return self._live
+
+    @property
+    def similar_index(self):
+        with self._lock:
+            if self._similar is None:
+                with metrics.timer("index_build_seconds", index="similar"):
+                    self._similar = SimilarityIndex.build(self.catalog, k=10)
+            return self._similar
+
+    @property
+    def text_index(self):
+        """
+        The full-text index, rebuilt when a title or description changed since
+        it was built. The build holds its own lock, not the one the other
+        indexes wait on, and the new index is swapped in when done.
+        """
+        with self._text_lock:
+            if self._fresh_text() is None:
+                with metrics.timer("index_build_seconds", index="text"):
+                    self._text = TextIndex.build(self.catalog)
+            return self._text
+
+    def _fresh_text(self):
+        """The text index if it is built and covers every title and description now, else None."""
+        text = self._text
+        return text if text is not None and text.version == self.catalog.text_version else None
+
+    @property
+    def facets(self):
+        with self._lock:
+            if self._facets is None:
+                self._facets = FacetIndex(self.catalog)
+                self.catalog.subscribe(self._facets.catalog_changed)
+            return self._facets
+
+    def warm_up(self):
+        """
+        Build the search, similarity and full-text indexes, the search shards
+        and column sort orders on a background thread.
+        """
+        def build():
+            if self.shards is not None:
+                self.shards.build()
+            self.index
+            self.similar_index
+            self.text_index
+            for by in SORT_KEYS:
+                self.catalog.order(by, descending=by != "title")  # first click on each column
+        thread = threading.Thread(target=build, daemon=True)
+        thread.start()
+        return thread
+
+    # --- queries (ids) ---
+    def search_ids(self, query, limit=None):
+        """Title/genre substring matches for `query`, in catalog order."""
+        q = query.strip().lower()
+        if not q or q == "search...":
+            return []
+        return self.index.search_ids(q)[:limit]
+
+    def suggest_ids(self, query, limit=8):
+        """Search-as-you-type: the best `limit` matches (see search_page)."""
+        return self.search_page(query, limit).ids
+
+    def search_page(self, query, limit=20, cursor=None):
+        """
+        Matches ranked exact title > title prefix > title word > title substring
+        > genre > typo-tolerant word match ("drishym" -> Drishyam; see
+        primeflix.fuzzy), best rated first within a tier, then the best matches
+        of the words in descriptions (see text_search_ids), once that index is
+        built. Each page is a partial selection
+        (np.partition) of the next `limit` keys, so a query matching half the
+        catalog costs a linear pass, not a sort. Pass page.cursor back for the next page.
+        With shards, the tiers up to genre come from them (top `limit` of each
+        shard, merged) and the rest follow as usual.
+        """
+        q = normalize_query(query)
+        if not q or q == "search...":
+            return SearchPage([], 0, None)
+        with metrics.timer("query_seconds", op="search"):
+            if self.shards is not None:
+                return self._sharded_page(q, limit, cursor)
+            return self._page(self._ranked(q), limit, cursor)
+
+    def _sharded_page(self, q, limit, cursor):
+        rest = self._unsharded(q)
+        rest_total = sum(len(keys) for keys in rest.tiers)
+        start = _parse_cursor(cursor)[0] if cursor else 0
+        if start >= FUZZY:
+            _, total, _, _ = self.shards.search(q, 0)
+            page = self._page(rest, limit, cursor)
+            return SearchPage(page.ids, total + rest_total, page.cursor)
+        ids, total, last, more = self.shards.search(q, limit, cursor)
+        if more or (limit is not None and len(ids) == limit):
+            return SearchPage(ids, total + rest_total, last if more or rest_total else None)
+        page = self._page(rest, None if limit is None else limit - len(ids), None)
+        return SearchPage(ids + page.ids, total + rest_total, page.cursor)
+
+    def _unsharded(self, q):
+        """
+        The tiers after the shards' (typo-tolerant, once the index is built, and
+        description matches) as a _Ranked with the shards' tiers empty.
+        """
+        key = "\0" + q  # can't clash with a normalized query
+        ranked = self.query_cache.get(key)
+        if ranked is not None:
+            return ranked
+        version = self.catalog.version
+        fuzzy = ([], [])
+        if self._index is not None:
+            for i, edits in self._index.fuzzy_ids(q).items():
+                if not self._index.matches(i, q):
+                    fuzzy[edits > 1].append(i)
+        tiers = [np.zeros(0, np.int64)] * FUZZY + [_rank_keys(self.catalog, g) for g in fuzzy]
+        text = self._fresh_text()
+        if text is not None:
+            allowed = self.catalog.alive[:self.catalog.size].copy()
+            allowed[np.asarray(fuzzy[0] + fuzzy[1], np.int64)] = False
+            k = TEXT_HITS
+            while True:  # title / genre matches are the shards' and are skipped here
+                ids, _ = text.search(q, k, allowed)
+                hits = ids[~self._title_or_genre(ids, q)]
+                if len(hits) >= TEXT_HITS or len(ids) < k:
+                    break
+                k *= 4
+            hits = hits[:TEXT_HITS]
+            tiers.append((np.arange(len(hits), dtype=np.int64) << 32) | hits)
+        ranked = _Ranked([np.sort(keys) for keys in tiers])
+        ranked.sorted = True
+        if self._index is not None and text is not None:  # else missing tiers: not cached
+            self.query_cache.put(key, ranked, version)
+        return ranked
+
+    def _title_or_genre(self, ids, q):
+        """Bool per id: `q` is in its lowercase title or in one of its genres (what the shards match)."""
+        cat = self.catalog
+        bits = np.uint64(cat.genres_to_mask([g for g in cat.genre_names if q in g.lower()]))
+        in_title = np.array([q in cat.value(int(i), "title").lower() for i in ids], bool)
+        return in_title | ((cat.genre_mask[ids] & bits) != 0)
+
+    def _page(self, ranked, limit, cursor):
+        tiers = ranked.tiers
+        total = sum(len(keys) for keys in tiers)
+        start, after = _parse_cursor(cursor) if cursor else (0, None)
+        ids = []
+        last = None
+        for tier in range(start, len(tiers)):
+            keys = tiers[tier]
+            if tier == start and after is not None:
+                keys = keys[np.searchsorted(keys, after, "right"):] if ranked.sorted else keys[keys > after]
+            need = limit - len(ids) if limit is not None else len(keys)
+            if limit is not None and need <= 0:
+                break
+            if ranked.sorted:
+                keys = keys[:need]
+            else:
+                if len(keys) > need > 0:
+                    keys = np.partition(keys, need - 1)[:need]
+                keys = np.sort(keys)
+            if len(keys):
+                ids.extend(int(k) for k in keys & 0xFFFFFFFF)
+                last = (tier, int(keys[-1]))
+        more = last is not None and (np.count_nonzero(tiers[last[0]] > last[1]) > 0
+                                     or any(len(tiers[t]) for t in range(last[0] + 1, len(tiers))))
+        return SearchPage(ids, total, f"{last[0]}:{last[1]}" if more else None)
+
+    def _ranked(self, q):
+        """
+        Per-tier rank keys for every match of `q`, through the query cache. A
+        query asked for again gets its keys sorted once, so its pages are slices.
+        """
+        ranked = self.query_cache.get(q)
+        if ranked is None:
+            version = self.catalog.version
+            groups = self.index.tiers(q, self.live.ids(q))
+            tiers = [_rank_keys(self.catalog, g) for g in groups]
+            text = self._fresh_text()  # not waited for: warm_up() or text_index (re)builds it
+            if text is not None:
+                allowed = self.catalog.alive[:self.catalog.size].copy()
+                for g in groups:
+                    allowed[np.asarray(g, np.int64)] = False
+                ids, _ = text.search(q, TEXT_HITS, allowed)
+                tiers.append((np.arange(len(ids), dtype=np.int64) << 32) | ids)
+            ranked = _Ranked(tiers)
+            if text is not None:  # else asked again once the description tier can be added
+                self.query_cache.put(q, ranked, version)
+        elif not ranked.sorted:
+            ranked.tiers = [np.sort(keys) for keys in ranked.tiers]
+            ranked.sorted = True
+        return ranked
+
+    def text_search_ids(self, query, limit=20):
+        """Best full-text (BM25) matches of `query` in titles and descriptions, best first."""
+        with metrics.timer("query_seconds", op="text"):
+            ids, _ = self.text_index.search(query, limit, self.catalog.alive)
+        return [int(i) for i in ids]
+
+    def genre_ids(self, genre, limit=None):
+        return [int(i) for i in self.facets.query(genres=[genre]).ids[:limit]]
+
+    def browse(self, genres=(), any_genres=(), years=None, min_rating=None, max_rating=None,
+               limit=50, offset=0):
+        """
+        Movies with all of `genres`, any of `any_genres`, year in `years` = (lo, hi)
+        and rating in bounds, best rated first, with facet counts for the whole
+        result. Only the first offset + limit keys are partially sorted.
+        """
+        with metrics.timer("query_seconds", op="browse"):
+            return self._browse(genres, any_genres, years, min_rating, max_rating, limit, offset)
+
+    def _browse(self, genres, any_genres, years, min_rating, max_rating, limit, offset):
+        result = self.facets.query(genres, any_genres, years, min_rating, max_rating)
+        keys = _rank_keys(self.catalog, result.ids)
+        end = len(keys) if limit is None else min(offset + limit, len(keys))
+        if 0 < end < len(keys):
+            keys = np.partition(keys, end - 1)[:end]
+        keys = np.sort(keys)[offset:end]
+        return BrowsePage([int(k) for k in keys & 0xFFFFFFFF], result.total, result.as_dict())
+
+    def feed_page(self, favourite_ids=(), limit=100, offset=0, session="default"):
+        """
+        A page of the Browse feed for a user with `favourite_ids` (see
+        primeflix.feed): favourites-scored, diversified, in a fixed order for
+        `session` until its favourites or the catalog change, so scrolling and
+        reopening Browse only pay for pages not seen yet.
+        """
+        with metrics.timer("query_seconds", op="feed"):
+            feed = self._feed(session, favourite_ids)
+            return FeedPage([int(i) for i in feed.page(offset, limit)], feed.total)
+
+    def _feed(self, session, favourite_ids):
+        key = (frozenset(int(i) for i in favourite_ids), self.catalog.version)
+        with self._feed_lock:
+            feed = self._feeds.pop(session, None)
+            if feed is None or feed.key != key:
+                # the similarity table is used if it is there, not built for this
+                feed = Feed.build(self.catalog, sorted(key[0]), self._similar, self.collab)
+                feed.key = key
+            self._feeds[session] = feed
+            while len(self._feeds) > FEED_SESSIONS:
+                self._feeds.popitem(last=False)
+        return feed
+
+    def similar_ids(self, movie_id, n=5):
+        with metrics.timer("query_seconds", op="similar"):
+            return [int(i) for i in self.similar_index.neighbours(movie_id) if self.catalog.alive[i]][:n]
+
+    def recommend_ids(self, favourite_ids, k=5):
+        """Ids for "Recommended for you" given favourite ids ([] without a model)."""
+        if self.collab is None or not favourite_ids:
+            return []
+        with metrics.timer("query_seconds", op="recommend"):
+            ids, _ = self.collab.recommend_for(favourite_ids, k, allowed=self.catalog.alive)
+        return [int(i) for i in ids]
+
+    # --- rows ---
+    def find_movies(self, query, limit=20, cursor=None):
+        """Rows of one ranked search page (see search_page)."""
+        return self.catalog.rows(self.search_page(query, limit, cursor).ids)
+
+    def movie(self, movie_id):
+        """JSON-ready dict for one movie; KeyError if there is no such (live) id."""
+        row = self.catalog.row(movie_id)
+        return {"id": movie_id, **row}
+
+    def movies(self, ids):
+        return [self.movie(i) for i in ids]
+
+    def close(self):
+        """Stop the shard workers and free their shared memory (also done at exit)."""
+        if self.shards is not None:
+            self.shards.close()
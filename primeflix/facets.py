@@ -0,0 +1,182 @@
+import threading
+
+import numpy as np
+
+from primeflix import metrics
+
+# --- Faceted browsing ---
+#
+# Built once per catalog version from the genre mask column:
+#   bitsets   genre -> uint64 words, bit i set = live movie i has the genre
+#   postings  genre -> sorted int32 ids (the same sets as lists)
+# A query starts from the shortest posting list when a required genre is rare
+# (intersect a few hundred ids, then check year/rating on just those) and from
+# the bitsets otherwise (AND/OR whole words, then one pass over the year and
+# rating columns). Facet counts for the result come from popcounts of
+# result & genre bitset, so they cost the same for 10 or 500k matches.
+
+_POSTING_PATH = 1 / 32   # use the id lists when a required genre has <= 1/32 of the catalog
+
+if hasattr(np, "bitwise_count"):
+    _popcount = np.bitwise_count
+else:  # NumPy < 2.0
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], np.uint8)
+
+    def _popcount(words):
+        return _BYTE_COUNTS[words.view(np.uint8)]
+
+
+def to_bitset(flags):
+    """Pack a bool array into little-endian uint64 words."""
+    packed = np.packbits(flags, bitorder="little")
+    words = np.zeros(-(-len(flags) // 64), np.uint64)
+    words.view(np.uint8)[:len(packed)] = packed
+    return words
+
+
+def from_bitset(words, n):
+    """Ascending ids of the set bits among the first `n`."""
+    return np.flatnonzero(np.unpackbits(words.view(np.uint8), count=n, bitorder="little"))
+
+
+def count_bits(words):
+    return int(_popcount(words).sum())
+
+
+def popcount(words):
+    """Set bits in each word of a 1-d uint64 array."""
+    counts = _popcount(words)
+    return counts if len(counts) == len(words) else counts.reshape(-1, 8).sum(axis=1)
+
+
+class FacetResult:
+    """
+    ids: matches ascending; genres: {genre: matches that have it};
+    decades: {1990: n, ...}; ratings: {7: n, ...} (whole stars, rounded down).
+    """
+
+    __slots__ = ("ids", "genres", "decades", "ratings")
+
+    def __init__(self, ids, genres, decades, ratings):
+        self.ids = ids
+        self.genres = genres
+        self.decades = decades
+        self.ratings = ratings
+
+    @property
+    def total(self):
+        return len(self.ids)
+
+    def as_dict(self):
+        return {"genres": self.genres, "decades": self.decades, "ratings": self.ratings}
+
+
+class FacetIndex:
+    """
+    Genre bitsets + posting lists over a Catalog. Subscribe catalog_changed
+    to the catalog and the next query rebuilds them (one vectorized pass per genre).
+    """
+
+    def __init__(self, catalog):
+        self.catalog = catalog
+        self.version = 0
+        self._built = None
+        self._lock = threading.Lock()
+
+    def catalog_changed(self, event, movie_id, m):
+        """Listener for Catalog.subscribe()."""
+        self.version += 1
+
+    def _tables(self):
+        with self._lock:
+            if self._built is None or self._built[0] != self.version:
+                with metrics.timer("index_build_seconds", index="facets"):
+                    self._built = (self.version, *self._build())
+            return self._built[1:]
+
+    def _build(self):
+        cat = self.catalog
+        n = cat.size
+        alive = cat.alive[:n]
+        masks = cat.genre_mask[:n]
+        bitsets, postings = {}, {}
+        for bit, name in enumerate(cat.genre_names):
+            has = ((masks >> np.uint64(bit)) & np.uint64(1)).astype(bool) & alive
+            bitsets[name] = to_bitset(has)
+            postings[name] = np.flatnonzero(has).astype(np.int32)
+        return to_bitset(alive), bitsets, postings
+
+    def query(self, genres=(), any_genres=(), years=None, min_rating=None, max_rating=None):
+        """
+        FacetResult for movies with every genre in `genres`, at least one of
+        `any_genres`, year within `years` = (lo, hi) inclusive (either may be None)
+        and rating within bounds. Same filters as Catalog.mask().
+        """
+        alive, bitsets, postings = self._tables()
+        cat = self.catalog
+        n = cat.size
+        known = [g for g in any_genres if g in bitsets]
+        if any(g not in bitsets for g in genres) or (any_genres and not known):
+            return self._result(np.zeros(0, np.int64), None, bitsets)
+        any_genres = known
+
+        rarest = min((postings[g] for g in genres), key=len, default=None)
+        if rarest is not None and len(rarest) <= n * _POSTING_PATH:
+            ids = rarest.astype(np.int64)
+            for g in genres:
+                if postings[g] is not rarest:
+                    ids = np.intersect1d(ids, postings[g], assume_unique=True)
+            if any_genres:
+                want = np.uint64(cat.genres_to_mask(any_genres))
+                ids = ids[(cat.genre_mask[ids] & want) != 0]
+            keep = _in_ranges(cat, ids, years, min_rating, max_rating)
+            return self._result(ids if keep is None else ids[keep], None, bitsets)
+
+        words = alive.copy()
+        for g in genres:
+            words &= bitsets[g]
+        if any_genres:
+            union = np.zeros_like(words)
+            for g in any_genres:
+                union |= bitsets[g]
+            words &= union
+        keep = _in_ranges(cat, slice(0, n), years, min_rating, max_rating)
+        if keep is not None:
+            words &= to_bitset(keep)
+        return self._result(from_bitset(words, n), words, bitsets)
+
+    def _result(self, ids, words, bitsets):
+        cat = self.catalog
+        if words is not None:
+            genres = {g: count_bits(words & bits) for g, bits in bitsets.items()}
+        else:
+            masks = cat.genre_mask[ids]
+            genres = {g: int(np.count_nonzero((masks >> np.uint64(bit)) & np.uint64(1)))
+                      for bit, g in enumerate(cat.genre_names) if g in bitsets}
+        decades = np.bincount(cat.year[ids] // 10) if len(ids) else np.zeros(0, np.int64)
+        ratings = np.bincount(cat.rating10[ids] // 10) if len(ids) else np.zeros(0, np.int64)
+        return FacetResult(ids,
+                           {g: c for g, c in genres.items() if c},
+                           {int(d) * 10: int(c) for d, c in enumerate(decades) if c},
+                           {int(r): int(c) for r, c in enumerate(ratings) if c})
+
+
+def _in_ranges(cat, ids, years, min_rating, max_rating):
+    """Bool array over `ids` for the year/rating bounds, or None if there are none."""
+    keep = None
+
+    def both(cond):
+        return cond if keep is None else keep & cond
+
+    if years is not None:
+        lo, hi = years
+        year = cat.year[ids]
+        if lo is not None:
+            keep = both(year >= lo)
+        if hi is not None:
+            keep = both(year <= hi)
+    if min_rating is not None:
+        keep = both(cat.rating10[ids] >= round(min_rating * 10))
+    if max_rating is not None:
+        keep = both(cat.rating10[ids] <= round(max_rating * 10))
+    return keep
@@ -0,0 +1,240 @@
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from primeflix.catalog import fold_title
+
+log = logging.getLogger(__name__)
+
+# --- Persistent favourites ---
+#
+# One SQLite table for every profile, clustered on (profile, title key, year),
+# so a profile's list is a single index range read. Movies are saved by
+# (folded title, year), not by movie id: ids are catalog row numbers and move
+# when the catalog is rebuilt, reordered or re-ingested. The title as it was
+# shown is kept too, so loading finds most movies with one interned-string
+# lookup instead of folding every title in the catalog. In memory each
+# profile is a dict movie_id -> time added (O(1) membership, insertion order =
+# My List order); favourites whose movie is no longer in the catalog stay
+# saved but are not listed. Movies with the same folded title and year are
+# duplicates (see primeflix.ingest.dedupe_key) and count as one favourite:
+# adding the second is a no-op and a profile loads as the lowest such id. Changes apply to the dict at once and are written
+# behind by one thread that commits everything queued within `flush_interval`
+# as one transaction, so the UI never waits on the disk.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS favourite_titles (
+    profile    TEXT    NOT NULL,
+    title_key  TEXT    NOT NULL,
+    year       INTEGER NOT NULL,
+    title      TEXT    NOT NULL,
+    added_at   REAL    NOT NULL,
+    PRIMARY KEY (profile, title_key, year)
+) WITHOUT ROWID
+"""
+
+_ADD = "INSERT OR REPLACE INTO favourite_titles (profile, title_key, year, title, added_at) VALUES (?, ?, ?, ?, ?)"
+_REMOVE = "DELETE FROM favourite_titles WHERE profile = ? AND title_key = ? AND year = ?"
+
+
+def default_path():
+    return os.path.join(os.path.expanduser("~"), ".primeflix", "favourites.db")
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+def find_movies(catalog, saved):
+    """
+    {(title_key, year): movie id} for `saved` (title_key, year, title) rows
+    that match a live movie (the lowest id if several do).
+    """
+    n = catalog.size
+    found = {}
+    wanted = {}
+    for key, year, title in saved:
+        t = catalog.titles.get(title)
+        if t is not None:
+            wanted.setdefault(t, []).append((key, year))
+    if wanted:
+        hit = np.isin(catalog.title_id[:n], list(wanted)) & catalog.alive[:n]
+        for i in np.flatnonzero(hit).tolist():
+            year = int(catalog.year[i])
+            for key, y in wanted[int(catalog.title_id[i])]:
+                if y == year:
+                    found.setdefault((key, y), i)
+    missing = {(key, year) for key, year, _ in saved} - set(found)
+    if missing:  # renamed since it was saved: fold every title once
+        keys = {key for key, _ in missing}
+        folded = {t: fold_title(catalog.titles[t]) for t in range(len(catalog.titles))}
+        folded = {t: k for t, k in folded.items() if k in keys}
+        hit = np.isin(catalog.title_id[:n], list(folded)) & catalog.alive[:n]
+        for i in np.flatnonzero(hit).tolist():
+            key = (folded[int(catalog.title_id[i])], int(catalog.year[i]))
+            if key in missing:
+                found.setdefault(key, i)
+    return found
+
+
+class Favourites:
+    """One profile's favourites: a set of movie ids that remembers the order they were added."""
+
+    def __init__(self, store, profile, added):
+        self.store = store
+        self.profile = profile
+        self._added = added  # movie_id -> added_at, oldest first
+        self._keys = {}      # movie_id -> (title_key, year) it was saved under
+        self._ids = {}       # (title_key, year) -> movie_id
+
+    def _put(self, movie_id, key, added_at):
+        self._added[movie_id] = added_at
+        self._keys[movie_id] = key
+        self._ids[key] = movie_id
+
+    def add(self, movie_id):
+        """True if added, False if it (or a duplicate of it, see module comment) was already there."""
+        movie_id = int(movie_id)
+        if movie_id in self._added:
+            return False
+        catalog = self.store.catalog
+        title, year = catalog.value(movie_id, "title"), catalog.value(movie_id, "year")
+        key = (fold_title(title), year)
+        if key in self._ids:
+            return False
+        now = time.time()
+        self._put(movie_id, key, now)
+        self.store._write(_ADD, (self.profile, *key, title, now))
+        return True
+
+    def remove(self, movie_id):
+        movie_id = int(movie_id)
+        if self._added.pop(movie_id, None) is None:
+            return False
+        key = self._keys.pop(movie_id)
+        del self._ids[key]
+        self.store._write(_REMOVE, (self.profile, *key))
+        return True
+
+    def __contains__(self, movie_id):
+        return movie_id in self._added
+
+    def __iter__(self):
+        return iter(list(self._added))
+
+    def __len__(self):
+        return len(self._added)
+
+    def __bool__(self):
+        return bool(self._added)
+
+
+class FavouritesStore:
+    """
+    Favourites for any number of profiles in the SQLite file at `path`, as
+    movie ids of `catalog`. profile(name) loads a profile once and keeps it;
+    writes are batched (see module comment). Call flush() to wait for pending
+    writes, close() on exit.
+    """
+
+    def __init__(self, catalog, path=None, flush_interval=0.25):
+        self.catalog = catalog
+        self.path = path or default_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.flush_interval = flush_interval
+        with _connect(self.path) as conn:
+            conn.execute(SCHEMA)
+        self._profiles = {}
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._writer = threading.Thread(target=self._write_loop, name="favourites-writer", daemon=True)
+        self._writer.start()
+        self.commits = 0
+
+    def profile(self, name="default"):
+        with self._lock:
+            favs = self._profiles.get(name)
+            if favs is None:
+                conn = _connect(self.path)
+                try:
+                    rows = conn.execute("SELECT title_key, year, title, added_at FROM favourite_titles "
+                                        "WHERE profile = ? ORDER BY added_at", (name,)).fetchall()
+                finally:
+                    conn.close()
+                found = find_movies(self.catalog, [row[:3] for row in rows])
+                favs = self._profiles[name] = Favourites(self, name, {})
+                for key, year, _, added_at in rows:
+                    movie_id = found.get((key, year))
+                    if movie_id is not None:
+                        favs._put(movie_id, (key, year), added_at)
+            return favs
+
+    def profiles(self):
+        """Names of profiles with at least one saved favourite (flushes first)."""
+        self.flush()
+        conn = _connect(self.path)
+        try:
+            return [p for (p,) in conn.execute("SELECT DISTINCT profile FROM favourite_titles ORDER BY profile")]
+        finally:
+            conn.close()
+
+    # --- write-behind ---
+    def _write(self, sql, params):
+        if self._closed:
+            raise RuntimeError("favourites store is closed")
+        self._queue.put((sql, params))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far is committed (no-op once closed: nothing can be queued)."""
+        with self._lock:
+            if self._closed:
+                return True
+            done = threading.Event()
+            self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self):
+        """Commit what is queued and stop the writer; later calls do nothing."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)  # after everything queued so far
+        self._writer.join()
+
+    def _write_loop(self):
+        conn = _connect(self.path)
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            # group everything that arrives within flush_interval into one commit
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1] is not None and not isinstance(batch[-1], threading.Event):
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            ops = [op for op in batch if isinstance(op, tuple)]
+            if ops:
+                try:
+                    with conn:
+                        for sql, params in ops:
+                            conn.execute(sql, params)
+                    self.commits += 1
+                except sqlite3.Error:
+                    log.exception("Could not save %d favourites change(s)", len(ops))
+            for op in batch:
+                if op is None:
+                    running = False
+                elif isinstance(op, threading.Event):
+                    op.set()
+        conn.close()
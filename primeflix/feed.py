@@ -0,0 +1,216 @@
+import threading
+
+import numpy as np
+
+from primeflix.facets import popcount
+
+# --- Personalized Browse feed ---
+#
+# Every live movie gets one relevance score in a vectorized pass over the
+# catalog columns:
+#
+#   genre    cosine between the movie's genres and the favourites' genre
+#            counts (a catalog of dramas doesn't push dramas on a horror fan)
+#   year     closeness to the favourites' median year, in units of their spread
+#   rating   rating / 10
+#   similar  best "More like this" score linking it to a favourite (only when
+#            that table is already built or loaded)
+#   collab   rank in the favourites model's top COLLAB_HITS (when there is one)
+#
+# plus a little per-feed noise, so two sessions don't see the same wall of
+# posters. Without favourites it is rating and noise only.
+#
+# The head of the feed (the first `diverse` ids) is then re-ranked with
+# maximal marginal relevance: each pick maximizes
+#   lam * relevance - (1 - lam) * max similarity to the last `window` picks
+# over a pool of the `pool_size` best remaining movies, where similarity is
+# genre overlap (Jaccard) blended with closeness in years. The window is about
+# what is on screen, so neighbouring tiles differ while the feed as a whole
+# still follows relevance. Past the head, movies follow in score order.
+#
+# A Feed is built once per session (see Primeflix.feed_page) and extended a
+# page at a time, so scrolling only pays for the new page.
+
+WEIGHTS = {"genre": 0.45, "year": 0.15, "rating": 0.25, "similar": 0.15, "collab": 0.2}
+NOISE = 0.05              # uniform noise per movie, times this
+COLD_NOISE = 0.3          # ... when there are no favourites to go on
+COLLAB_HITS = 500
+YEAR_SPREAD = 5           # minimum spread of the favourites' years
+LAMBDA = 0.7
+GENRE_SIMILARITY = 0.7    # weight of genre overlap vs year closeness in MMR
+YEAR_SCALE = 5            # years apart at which year closeness is 1/2
+WINDOW = 8                # two grid rows
+POOL = 512
+DIVERSE = 5000
+STREAM = 8192             # ids drawn per partial sort of the remaining scores
+
+
+def feed_scores(catalog, favourite_ids=(), similar=None, collab=None, rng=None):
+    """
+    float32 relevance per movie id for a user with `favourite_ids`; -inf for
+    removed movies and the favourites themselves.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    n = catalog.size
+    alive = catalog.alive[:n]
+    fav = np.asarray([i for i in favourite_ids if 0 <= i < n and alive[i]], np.int64)
+    scores = catalog.rating10[:n].astype(np.float32) / 100 * WEIGHTS["rating"]
+    scores += rng.random(n, dtype=np.float32) * (NOISE if len(fav) else COLD_NOISE)
+    if len(fav):
+        scores += WEIGHTS["genre"] * _genre_affinity(catalog, fav)
+        years = catalog.year[fav].astype(np.float32)
+        middle = np.median(years)
+        spread = max(float(np.subtract(*np.percentile(years, [75, 25]))) / 2, YEAR_SPREAD)
+        scores += WEIGHTS["year"] / (1 + ((catalog.year[:n] - middle) / spread) ** 2)
+        # the table and the model only know the movies there were when they were built
+        known = fav[fav < len(similar.neighbours_table)] if similar is not None else fav[:0]
+        if len(known):
+            table = similar.neighbours_table[known]
+            linked = table >= 0
+            boost = np.zeros(n, np.float32)
+            np.maximum.at(boost, table[linked], similar.scores_table[known][linked].astype(np.float32))
+            scores += WEIGHTS["similar"] * boost
+        n_items = len(collab.item_factors) if collab is not None else 0
+        known = fav[fav < n_items]
+        if len(known):
+            ids, _ = collab.recommend_for(known, COLLAB_HITS, allowed=alive[:n_items])
+            scores[ids] += WEIGHTS["collab"] * (1 - np.arange(len(ids), dtype=np.float32) / COLLAB_HITS)
+    scores[~alive] = -np.inf
+    scores[fav] = -np.inf
+    return scores
+
+
+def _genre_affinity(catalog, fav):
+    """Cosine between each movie's genre set and the genre counts of `fav`."""
+    masks = catalog.genre_mask[:catalog.size]
+    fav_masks = catalog.genre_mask[fav]
+    weights = [(bit, int(np.count_nonzero((fav_masks >> np.uint64(bit)) & np.uint64(1))))
+               for bit in range(len(catalog.genre_names))]
+    weights = [(bit, w) for bit, w in weights if w]
+    out = np.zeros(len(masks), np.float32)
+    if not weights:
+        return out
+    for bit, w in weights:
+        out += np.float32(w) * ((masks >> np.uint64(bit)) & np.uint64(1)).astype(np.float32)
+    norm = np.sqrt(np.maximum(popcount(masks), 1).astype(np.float32))
+    out /= norm * np.float32(np.sqrt(sum(w * w for _, w in weights)))
+    return out
+
+
+def similarity(mask, year, masks, years):
+    """MMR similarity of one movie (genre mask, year) to arrays of others: 0 (nothing alike) .. 1."""
+    overlap = popcount(masks & mask) / np.maximum(popcount(masks | mask), 1)
+    apart = (years - year) / YEAR_SCALE
+    return GENRE_SIMILARITY * overlap + (1 - GENRE_SIMILARITY) / (1 + apart * apart)
+
+
+class Feed:
+    """
+    One user's ranked Browse feed: page(offset, limit) returns ids, computing
+    only as far as asked (see module comment). Thread-safe.
+    """
+
+    def __init__(self, catalog, scores, lam=LAMBDA, window=WINDOW, pool_size=POOL, diverse=DIVERSE):
+        self.catalog = catalog
+        self.lam = lam
+        self.window = window
+        self.pool_size = pool_size
+        self.diverse = diverse
+        self.total = int(np.count_nonzero(np.isfinite(scores)))
+        self.key = None
+        self._order = []
+        self._scores = scores
+        self._rest = scores.copy()  # -inf once drawn
+        self._drawn = 0
+        self._stream = np.zeros(0, np.int64)
+        self._top = None           # best score, relevance = score / best
+        self._pool = np.zeros(0, np.int64)
+        self._rel = np.zeros(0, np.float32)
+        self._masks = np.zeros(0, np.uint64)
+        self._years = np.zeros(0, np.float32)
+        self._recent = [None] * window  # (mask, year) of the last `window` picks, by _sim row
+        self._sim = np.zeros((window, 0), np.float32)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, catalog, favourite_ids=(), similar=None, collab=None, seed=None, **options):
+        rng = np.random.default_rng(seed)
+        return cls(catalog, feed_scores(catalog, favourite_ids, similar, collab, rng), **options)
+
+    def page(self, offset=0, limit=100):
+        """Ids at feed positions [offset, offset + limit), fewer at the end."""
+        end = self.total if limit is None else min(offset + limit, self.total)
+        with self._lock:
+            if len(self._order) < end:
+                self._extend(end - len(self._order))
+            return self._order[offset:end]
+
+    def _draw(self, count):
+        """The best `count` (or more) scores not drawn yet, best first."""
+        left = self.total - self._drawn
+        count = min(max(count, STREAM), left)
+        rest = self._rest
+        if count <= 0:
+            return np.zeros(0, np.int64)
+        if count < left:
+            top = np.argpartition(rest, len(rest) - count)[len(rest) - count:]
+        else:
+            top = np.flatnonzero(np.isfinite(rest))
+        top = top[np.lexsort((top, -rest[top]))]
+        if self._top is None:
+            self._top = max(float(rest[top[0]]), 1e-6)
+        rest[top] = -np.inf
+        self._drawn += len(top)
+        return top
+
+    def _take(self, count):
+        """Next `count` ids in score order (fewer at the end)."""
+        if len(self._stream) < count:
+            self._stream = np.concatenate([self._stream, self._draw(count - len(self._stream))])
+        out, self._stream = self._stream[:count], self._stream[count:]
+        return out
+
+    def _extend(self, count):
+        target = len(self._order) + count
+        while len(self._order) < min(target, self.diverse):
+            if len(self._pool) <= self.pool_size // 2:
+                self._refill()
+            if not len(self._pool):
+                break
+            self._pick()
+        if len(self._order) < target:
+            if len(self._pool):  # leaving the diversified head: the pool goes first, by relevance
+                best = np.lexsort((self._pool, -self._rel))
+                self._order.extend(self._pool[best].tolist())
+                self._pool = self._pool[:0]
+            self._order.extend(self._take(target - len(self._order)).tolist())
+
+    def _refill(self):
+        ids = self._take(self.pool_size - len(self._pool))
+        if self._top is None:
+            return
+        cat = self.catalog
+        self._pool = np.concatenate([self._pool, ids])
+        self._rel = np.concatenate([self._rel, self._scores[ids] / np.float32(self._top)])
+        self._masks = np.concatenate([self._masks, cat.genre_mask[ids]])
+        self._years = np.concatenate([self._years, cat.year[ids].astype(np.float32)])
+        self._sim = np.zeros((self.window, len(self._pool)), np.float32)
+        for row, recent in enumerate(self._recent):
+            if recent is not None:
+                self._sim[row] = similarity(*recent, self._masks, self._years)
+
+    def _pick(self):
+        mmr = self.lam * self._rel - (1 - self.lam) * self._sim.max(axis=0)
+        best = int(np.argmax(mmr))
+        mask, year = self._masks[best], self._years[best]
+        self._order.append(int(self._pool[best]))
+        last = len(self._pool) - 1  # swap-remove
+        for name in ("_pool", "_rel", "_masks", "_years"):
+            a = getattr(self, name)
+            a[best] = a[last]
+            setattr(self, name, a[:last])
+        self._sim[:, best] = self._sim[:, last]
+        self._sim = self._sim[:, :last]
+        row = (len(self._order) - 1) % self.window  # replaces the oldest of the window
+        self._sim[row] = similarity(mask, year, self._masks, self._years)
+        self._recent[row] = (mask, year)
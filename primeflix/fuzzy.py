@@ -0,0 +1,124 @@
+import re
+from array import array
+
+import numpy as np
+
+# --- Typo-tolerant word lookup ---
+#
+# Works on the title word vocabulary, not on titles: 1M titles share far fewer
+# distinct words. Each word is first folded to a rough phonetic key, so the
+# usual transliteration variants become identical or one edit apart:
+#   "bahuballi" / "baahubali" -> "bahubali",  "drishym" / "drishyam" -> "drisim" / "drisiam"
+# Keys are indexed by padded trigrams ("$$bah", ...). A lookup counts shared
+# trigrams per key with one np.bincount over the query's posting lists, keeps
+# the keys that could be within the edit budget (q-gram lemma + length filter)
+# and runs Levenshtein on all of those at once, one NumPy row per candidate.
+
+_RULES = [("igh", "i"), ("ck", "k"), ("gh", "g"), ("th", "t"), ("ph", "f"), ("sh", "s"), ("kh", "k"),
+          ("bh", "b"), ("dh", "d"), ("ee", "i"), ("oo", "u"), ("w", "v"), ("z", "j"), ("q", "k"), ("y", "i")]
+_REPEATS = re.compile(r"(.)\1+")
+_GRAM = 3
+
+
+def fold(word):
+    """Phonetic key for a lowercase word (see module comment)."""
+    for a, b in _RULES:
+        word = word.replace(a, b)
+    word = _REPEATS.sub(r"\1", word)
+    if len(word) > 3 and word.endswith("e"):
+        word = word[:-1]  # silent e: "nite" ~ "nit(s)"
+    return word
+
+
+def max_edits(word):
+    """Edit budget for a typed word: none below 4 letters, 1 up to 6, then 2."""
+    if len(word) < 4:
+        return 0
+    return 1 if len(word) < 7 else 2
+
+
+def key_grams(key):
+    padded = "$" * (_GRAM - 1) + key + "$" * (_GRAM - 1)
+    return {padded[i:i + _GRAM] for i in range(len(padded) - _GRAM + 1)}
+
+
+def distances(a, keys):
+    """Edit distance from `a` to each of `keys` (ASCII strings), as an int32 array."""
+    width = max(map(len, keys))
+    chars = np.frombuffer("".join(k.ljust(width, "\0") for k in keys).encode(), np.uint8)
+    chars = chars.reshape(len(keys), width)
+    steps = np.arange(width + 1, dtype=np.int32)
+    prev = np.broadcast_to(steps, (len(keys), width + 1))
+    for i, ch in enumerate(a.encode(), 1):
+        # substitution / deletion from the row above, then insertions as a running
+        # minimum along the row: cur[j] = min_k(best[k] + j - k)
+        best = np.empty_like(prev)
+        best[:, 0] = i
+        np.minimum(prev[:, :-1] + (chars != ch), prev[:, 1:] + 1, out=best[:, 1:])
+        prev = np.minimum.accumulate(best - steps, axis=1) + steps
+    lengths = np.fromiter(map(len, keys), np.intp, len(keys))
+    return prev[np.arange(len(keys)), lengths]
+
+
+class FuzzyIndex:
+    """
+    Folded keys of every word added, with trigram postings (array('i') of key
+    ids, append-only, read as NumPy arrays without copying). Words are never
+    removed; callers skip words that no longer match anything.
+    """
+
+    def __init__(self):
+        self.keys = []       # key id -> folded key
+        self.words = []      # key id -> set of original words
+        self._key_id = {}
+        self._lengths = array("h")  # key id -> len(key)
+        self._sizes = array("h")    # key id -> number of distinct trigrams
+        self.postings = {}   # trigram -> array('i') of key ids
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, word):
+        key = fold(word)
+        kid = self._key_id.get(key)
+        if kid is None:
+            kid = self._key_id[key] = len(self.keys)
+            self.keys.append(key)
+            self.words.append(set())
+            grams = key_grams(key)
+            self._lengths.append(len(key))
+            self._sizes.append(len(grams))
+            for g in grams:
+                posting = self.postings.get(g)
+                if posting is None:
+                    posting = self.postings[g] = array("i")
+                posting.append(kid)
+        self.words[kid].add(word)
+
+    def lookup(self, word, max_dist=None):
+        """{original word: edit distance between folded keys} for words close to `word`."""
+        key = fold(word)
+        budget = max_edits(word) if max_dist is None else max_dist
+        exact = self._key_id.get(key)
+        out = {w: 0 for w in self.words[exact]} if exact is not None else {}
+        if budget == 0:
+            return out
+        grams = key_grams(key)
+        lists = [np.frombuffer(self.postings[g], np.int32) for g in grams if g in self.postings]
+        if not lists:
+            return out
+        counts = np.bincount(np.concatenate(lists), minlength=len(self.keys))
+        # each edit changes at most _GRAM padded grams of either word
+        kids = np.flatnonzero(counts >= len(grams) - _GRAM * budget)
+        sizes = np.frombuffer(self._sizes, np.int16)[kids]
+        lengths = np.frombuffer(self._lengths, np.int16)[kids]
+        kids = kids[(counts[kids] >= sizes - _GRAM * budget) & (np.abs(lengths - len(key)) <= budget)]
+        candidates = [kid for kid in kids.tolist() if kid != exact]
+        if not candidates:
+            return out
+        dist = distances(key, [self.keys[kid] for kid in candidates])
+        for kid, d in zip(candidates, dist.tolist()):
+            if d <= budget:
+                for w in self.words[kid]:
+                    out[w] = d
+        return out
@@ -0,0 +1,293 @@
+import argparse
+import csv
+import functools
+import gzip
+import hashlib
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+
+import numpy as np
+
+from primeflix import snapshot
+from primeflix.catalog import MAX_GENRES, Catalog, fold_title
+from primeflix.textsearch import TextIndex
+
+log = logging.getLogger(__name__)
+
+# --- Streaming catalog ingestion ---
+#
+# Generators all the way down, so memory doesn't grow with the input file:
+#
+#   read_records(path)  -> raw dicts, one line at a time (CSV / JSONL, .gz ok)
+#   normalize(raw)      -> {"title", "year", "rating", "genres", "image", "description"} or RejectedRecord
+#   Ingestor.run()      -> dedupe by (title, year), append to a Catalog chunk by chunk
+#
+# Field names are matched loosely, so MovieLens movies.csv ("Toy Story (1995)",
+# "Adventure|Animation") and TMDB-style dumps (name / release_date / vote_average /
+# poster_path / overview) load without a mapping file. The only state kept across the
+# whole input is one 8-byte hash per accepted movie for the dedupe check.
+
+FIELD_ALIASES = {
+    "title": ("title", "name", "primary_title", "original_title"),
+    "year": ("year", "release_year", "start_year", "release_date"),
+    "rating": ("rating", "vote_average", "avg_rating", "average_rating", "imdb_rating"),
+    "genres": ("genres", "genre"),
+    "image": ("image", "poster", "poster_path", "image_path"),
+    "description": ("description", "overview", "synopsis", "plot", "summary"),
+}
+MIN_YEAR, MAX_YEAR = 1870, 2100
+_TITLE_YEAR = re.compile(r"^(.*?)\s*\((\d{4})\)\s*$")
+_GENRE_SPLIT = re.compile(r"\s*[|,;]\s*")
+NO_GENRES = {"", "(no genres listed)", "\\n", "n/a"}
+
+
+class RejectedRecord(ValueError):
+    """A record that failed validation: `reason` is the category, str(e) adds the value."""
+
+    def __init__(self, reason, value=None):
+        super().__init__(reason if value is None else f"{reason}: {value!r}")
+        self.reason = reason
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, encoding="utf-8", newline="")
+
+
+def detect_format(path):
+    name = path[:-3] if path.endswith(".gz") else path
+    ext = os.path.splitext(name)[1].lower()
+    if ext in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if ext in (".csv", ".tsv"):
+        return ext[1:]
+    raise ValueError(f"can't tell the format of {path} (use --format)")
+
+
+def read_records(path, fmt=None):
+    """
+    Yield (line_number, raw dict) from a CSV/TSV/JSONL file, streaming.
+    Lines that aren't valid JSON objects come through as (line, RejectedRecord).
+    """
+    fmt = fmt or detect_format(path)
+    with _open_text(path) as f:
+        if fmt == "jsonl":
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    raw = json.loads(line)
+                except ValueError as e:
+                    yield line_no, RejectedRecord("invalid JSON", str(e))
+                    continue
+                yield line_no, raw if isinstance(raw, dict) else RejectedRecord("not a JSON object")
+        else:
+            reader = csv.DictReader(f, delimiter="\t" if fmt == "tsv" else ",")
+            for raw in reader:
+                yield reader.line_num, raw
+
+
+@functools.lru_cache(maxsize=64)
+def _columns(keys):
+    """Field name -> record keys that may hold it, best alias first (once per header)."""
+    lowered = {str(k).strip().lower(): k for k in keys if k is not None}
+    return {name: [lowered[a] for a in aliases if a in lowered] for name, aliases in FIELD_ALIASES.items()}
+
+
+def _field(raw, keys):
+    for key in keys:
+        value = raw.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def normalize(raw):
+    """Validated movie dict in catalog form; raises RejectedRecord."""
+    if isinstance(raw, RejectedRecord):
+        raise raw
+    columns = _columns(tuple(raw))
+
+    title = _field(raw, columns["title"])
+    title = " ".join(str(title).split()) if title is not None else ""
+    year = _field(raw, columns["year"])
+    if year is None:
+        # MovieLens keeps the year in the title: "Heat (1995)"
+        match = _TITLE_YEAR.match(title)
+        if match:
+            title, year = match.group(1), match.group(2)
+    if not title:
+        raise RejectedRecord("missing title")
+
+    try:
+        year = int(str(year)[:4]) if year is not None else 0
+    except ValueError:
+        raise RejectedRecord("bad year", year)
+    if year and not MIN_YEAR <= year <= MAX_YEAR:
+        raise RejectedRecord("year out of range", year)
+
+    rating = _field(raw, columns["rating"])
+    try:
+        rating = round(float(rating), 1) if rating is not None else 0.0
+    except ValueError:
+        raise RejectedRecord("bad rating", rating)
+    if not 0 <= rating <= 10:
+        raise RejectedRecord("rating out of range", rating)
+
+    genres = _field(raw, columns["genres"]) or []
+    if isinstance(genres, str):
+        genres = _GENRE_SPLIT.split(genres.strip())
+    genres = [g for g in dict.fromkeys(str(g).strip() for g in genres) if g.lower() not in NO_GENRES]
+
+    image = _field(raw, columns["image"])
+    description = _field(raw, columns["description"])
+    return {"title": title, "year": year, "rating": rating, "genres": genres,
+            "image": str(image).strip() if image else None,
+            "description": " ".join(str(description).split()) if description else None}
+
+
+def dedupe_key(m):
+    """8-byte hash of (case/space/punctuation-folded title, year)."""
+    digest = hashlib.blake2b(f"{fold_title(m['title'])}\0{m['year']}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class IngestReport:
+    """Outcome of one Ingestor.run()."""
+
+    MAX_SAMPLES = 100
+
+    def __init__(self):
+        self.read = 0
+        self.accepted = 0
+        self.duplicates = 0
+        self.rejected = Counter()  # RejectedRecord.reason -> count
+        self.samples = []          # first MAX_SAMPLES rejections: file, line, error
+        self.elapsed = 0.0
+
+    def reject(self, path, line_no, error):
+        self.rejected[error.reason] += 1
+        if len(self.samples) < self.MAX_SAMPLES:
+            self.samples.append({"file": path, "line": line_no, "error": str(error)})
+
+    @property
+    def throughput(self):
+        """Input rows per second."""
+        return self.read / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "read": self.read,
+            "accepted": self.accepted,
+            "duplicates": self.duplicates,
+            "rejected": sum(self.rejected.values()),
+            "rejected_by_reason": dict(self.rejected),
+            "elapsed_s": round(self.elapsed, 3),
+            "rows_per_s": round(self.throughput, 1),
+            "samples": self.samples,
+        }
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def summary(self):
+        return (f"read {self.read}, accepted {self.accepted}, duplicates {self.duplicates}, "
+                f"rejected {sum(self.rejected.values())} in {self.elapsed:.2f}s ({self.throughput:,.0f} rows/s)")
+
+
+class Ingestor:
+    """
+    Loads records into `catalog` (a new one by default) in chunks of `chunk_size`.
+    Movies whose dedupe_key is already in the catalog are counted as duplicates
+    and skipped (the first occurrence wins).
+    """
+
+    def __init__(self, catalog=None, chunk_size=50000, log_every=1000000):
+        self.catalog = catalog if catalog is not None else Catalog()
+        self.chunk_size = chunk_size
+        self.log_every = log_every
+        self.seen = {dedupe_key(m) for m in self.catalog}
+
+    def _accepted(self, records, report, source):
+        for line_no, raw in records:
+            report.read += 1
+            if report.read % self.log_every == 0:
+                rate = report.read / (time.perf_counter() - self._start)
+                log.info("%s: %d rows (%.0f rows/s)", source, report.read, rate)
+            try:
+                m = normalize(raw)
+                key = dedupe_key(m)
+                if key in self.seen:
+                    report.duplicates += 1
+                    continue
+                # the whole record must be accepted before its new genres get catalog bits
+                new = [g for g in m["genres"] if g not in self.catalog.genre_names]
+                if len(self.catalog.genre_names) + len(new) > MAX_GENRES:
+                    raise RejectedRecord("too many genres", ", ".join(new))
+                m["mask"] = self.catalog.genres_to_mask(m["genres"], add=True)
+            except RejectedRecord as e:
+                report.reject(source, line_no, e)
+                continue
+            self.seen.add(key)
+            yield m
+
+    def _write_chunk(self, chunk, report):
+        self.catalog.extend_columns([m["title"] for m in chunk], [m["year"] for m in chunk],
+                                    [m["rating"] for m in chunk], np.array([m["mask"] for m in chunk], np.uint64),
+                                    self.catalog.genre_names, [m["image"] for m in chunk],
+                                    [m["description"] for m in chunk])
+        report.accepted += len(chunk)
+
+    def run(self, records, source="<records>", report=None):
+        """
+        Ingest (line_number, raw) pairs or plain dicts. Returns the IngestReport
+        (pass one in to accumulate over several files).
+        """
+        report = report if report is not None else IngestReport()
+        self._start = time.perf_counter() - report.elapsed
+        records = (r if isinstance(r, tuple) else (i, r) for i, r in enumerate(records, 1))
+        accepted = self._accepted(records, report, source)
+        while True:
+            chunk = list(itertools.islice(accepted, self.chunk_size))
+            if not chunk:
+                break
+            self._write_chunk(chunk, report)
+        report.elapsed = time.perf_counter() - self._start
+        return report
+
+    def ingest_file(self, path, fmt=None, report=None):
+        return self.run(read_records(path, fmt), source=path, report=report)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream CSV/JSONL movie files into a catalog snapshot.")
+    parser.add_argument("inputs", nargs="+", help="CSV, TSV or JSONL files (optionally .gz)")
+    parser.add_argument("--out", required=True, help="snapshot file to write (see primeflix.snapshot)")
+    parser.add_argument("--format", choices=("csv", "tsv", "jsonl"), help="default: from the file extension")
+    parser.add_argument("--chunk", type=int, default=50000, help="records per catalog append")
+    parser.add_argument("--report", help="write the JSON report (incl. sample rejections) here")
+    parser.add_argument("--no-text", action="store_true", help="don't build the full-text (description) index")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    ingestor = Ingestor(chunk_size=args.chunk)
+    report = IngestReport()
+    for path in args.inputs:
+        ingestor.ingest_file(path, args.format, report)
+    text = None if args.no_text else TextIndex.build(ingestor.catalog)
+    snapshot.save(ingestor.catalog, args.out, text=text)
+    log.info(report.summary())
+    if args.report:
+        report.write_json(args.report)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,202 @@
+import atexit
+import bisect
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# --- Hot-path instrumentation ---
+#
+# Off unless PRIMEFLIX_METRICS is set (1 / true / yes). While off, timer() hands
+# back one shared no-op context manager and inc() returns at once, so the
+# instrumented call sites cost a function call and a flag check.
+#
+#   with metrics.timer("query_seconds", op="search"):  ...     # histogram
+#   metrics.inc("poster_cache_hits_total")                     # counter
+#
+# Histograms use fixed buckets (0.1 ms .. 10 s) and also keep the last RECENT
+# samples for the on-screen overlay. Export: snapshot() (JSON-able dict),
+# prometheus() (text exposition format), or PRIMEFLIX_METRICS_FILE=path to
+# write the JSON snapshot when the process exits.
+
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds
+RECENT = 256
+PREFIX = "primeflix_"
+
+ENABLED = os.environ.get("PRIMEFLIX_METRICS", "").lower() in ("1", "true", "yes", "on")
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)  # last = above the top bucket
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=RECENT)
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.recent.append(seconds)
+
+    def quantile(self, q):
+        """q-quantile of the recent samples (seconds), or None."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def as_dict(self):
+        return {"count": self.count, "sum": self.sum,
+                "buckets": {str(le): c for le, c in zip(BUCKETS + ("+Inf",), self.counts)},
+                "recent_p50": self.quantile(0.5), "recent_p95": self.quantile(0.95)}
+
+
+class Registry:
+    """Counters and histograms by (name, labels). Thread-safe."""
+
+    def __init__(self):
+        self.counters = {}
+        self.histograms = {}
+        self.started = time.time()
+        self._lock = threading.Lock()
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = Histogram()
+            hist.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "uptime_s": time.time() - self.started,
+                "counters": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(self.counters.items())],
+                "histograms": [{"name": n, "labels": dict(l), **h.as_dict()}
+                               for (n, l), h in sorted(self.histograms.items())],
+            }
+
+    def prometheus(self):
+        lines = []
+        with self._lock:
+            for name in sorted({n for n, _ in self.counters}):
+                lines.append(f"# TYPE {PREFIX}{name} counter")
+                for (n, labels), value in sorted(self.counters.items()):
+                    if n == name:
+                        lines.append(f"{PREFIX}{name}{_labels(labels)} {value}")
+            for name in sorted({n for n, _ in self.histograms}):
+                lines.append(f"# TYPE {PREFIX}{name} histogram")
+                for (n, labels), hist in sorted(self.histograms.items()):
+                    if n != name:
+                        continue
+                    cumulative = 0
+                    for le, count in zip(BUCKETS + ("+Inf",), hist.counts):
+                        cumulative += count
+                        lines.append(f"{PREFIX}{name}_bucket{_labels(labels + (('le', le),))} {cumulative}")
+                    lines.append(f"{PREFIX}{name}_sum{_labels(labels)} {hist.sum!r}")
+                    lines.append(f"{PREFIX}{name}_count{_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def recent(self):
+        """[(name, labels, p50 s, p95 s, count)] for every histogram, for the overlay."""
+        with self._lock:
+            return [(n, dict(l), h.quantile(0.5), h.quantile(0.95), h.count)
+                    for (n, l), h in sorted(self.histograms.items())]
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = ((k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+REGISTRY = Registry()
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullTimer()
+
+
+def enabled():
+    return ENABLED
+
+
+def enable(on=True):
+    """Switch recording on/off at runtime (tests, benchmarks); the env var sets the default."""
+    global ENABLED
+    ENABLED = on
+
+
+def timer(name, **labels):
+    """Context manager recording its duration in histogram `name` (a no-op while disabled)."""
+    return _Timer(name, labels) if ENABLED else _NULL
+
+
+def inc(name, amount=1, **labels):
+    if ENABLED:
+        REGISTRY.inc(name, amount, **labels)
+
+
+def observe(name, seconds, **labels):
+    if ENABLED:
+        REGISTRY.observe(name, seconds, **labels)
+
+
+def snapshot():
+    return REGISTRY.snapshot()
+
+
+def prometheus():
+    return REGISTRY.prometheus()
+
+
+def write_json(path):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(snapshot(), f, indent=2)
+    os.replace(tmp, path)
+
+
+if ENABLED and os.environ.get("PRIMEFLIX_METRICS_FILE"):
+    atexit.register(write_json, os.environ["PRIMEFLIX_METRICS_FILE"])
@@ -0,0 +1,130 @@
+from primeflix.catalog import Catalog
+
+# --- Bundled movie list ---
+# The titles shipped with the app. Poster paths point at the original author's
+# machine; missing files fall back to placeholders.
+
+BUNDLED_MOVIES = [
+    {"title": "Space Warriors", "year": 2018, "rating": 8.0, "genres": ["Action", "Sci-Fi"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 22 AM.jpeg"},
+    {"title": "Bangalore Days", "year": 2014, "rating": 8.2, "genres": ["Romance", "Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/Bangalore Days Poster.jpg"},
+    {"title": "Kahaani", "year": 2012, "rating": 8.1, "genres": ["Thriller", "Mystery"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (1).jpeg"},
+    {"title": "Premam", "year": 2015, "rating": 8.2, "genres": ["Romance", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/1d0248dfb942f6ea6a75d4130c01b727.jpg"},
+    {"title": "Sairat", "year": 2016, "rating": 8.6, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 27 AM.jpeg"},
+    {"title": "Lucifer", "year": 2019, "rating": 8.0, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (3).jpeg"},
+    {"title": "Andhadhun", "year": 2018, "rating": 8.3, "genres": ["Thriller", "Comedy"], "image": "//Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (4).jpeg"},
+    {"title": "Uyare", "year": 2019, "rating": 8.2, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 22 AM.jpeg"},
+    {"title": "Thappad", "year": 2020, "rating": 7.6, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (5).jpeg"},
+    {"title": "Soorarai Pottru", "year": 2020, "rating": 8.7, "genres": ["Drama", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (6).jpeg"},
+    {"title": "Drishyam 2", "year": 2021, "rating": 8.5, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (7).jpeg"},
+    {"title": "Joji", "year": 2021, "rating": 8.0, "genres": ["Drama", "Crime"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (8).jpeg"},
+    {"title": "Minnal Murali", "year": 2021, "rating": 7.9, "genres": ["Action", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApuhweg2).jpeg"},
+    {"title": "C U Soon", "year": 2020, "rating": 7.8, "genres": ["Thriller", "Mystery"], "image":"/Users/ralphblesson/Desktop/selsnium/nb .jpeg"},
+    {"title": "Kumbalangi Nights", "year": 2019, "rating": 8.6, "genres": ["Drama", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 22 AM.jpeg"},
+    {"title": "Bahubali: The Beginning", "year": 2015, "rating": 8.1, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/seyfg.jpeg"},
+    {"title": "Bahubali 2: The Conclusion", "year": 2017, "rating": 8.2, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/sefs.jpeg"},
+    {"title": "Tumbbad", "year": 2018, "rating": 8.3, "genres": ["Horror", "Fantasy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 46 AM.jpeg"},
+    {"title": "Gully Boy", "year": 2019, "rating": 8.0, "genres": ["Drama", "Music"], "image": "/Users/ralphblesson/Desktop/selsnium/sefsg.jpeg"},
+    {"title": "Stree", "year": 2018, "rating": 7.6, "genres": ["Horror", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/rn.jpeg"},
+    {"title": "Virus", "year": 2019, "rating": 8.4, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/jej.jpeg"},
+    {"title": "Maheshinte Prathikaaram", "year": 2016, "rating": 8.2, "genres": ["Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 49 AM.jpeg"},
+    {"title": "Take Off", "year": 2017, "rating": 8.0, "genres": ["Drama", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (9).jpeg"},
+    {"title": "Kaithi", "year": 2019, "rating": 8.5, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 copy 2.jpeg"},
+    {"title": "Master", "year": 2021, "rating": 7.6, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/56WhatsApp Image Nov 4 2025 (1).jpeg"},
+    {"title": "Pushpa: The Rise", "year": 2021, "rating": 7.3, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WiihatsApp Image Nov 4 2025 (2).jpeg"},
+    {"title": "Eega", "year": 2012, "rating": 7.9, "genres": ["Fantasy", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/675879.jpeg"},
+    {"title": "Mahanati", "year": 2018, "rating": 8.5, "genres": ["Biography", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/34567.jpeg"},
+
+    # Additional movies added for balance
+
+    # Comedy (total 15)
+    {"title": "Bheeshma", "year": 2020, "rating": 7.1, "genres": ["Comedy", "Romance"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 10 59 AM.jpeg"},
+    {"title": "Chhichhore", "year": 2019, "rating": 8.2, "genres": ["Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/34567.jpeg"},
+    {"title": "Delhi Belly", "year": 2011, "rating": 7.5, "genres": ["Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/34567.jpeg"},
+    {"title": "Piku", "year": 2015, "rating": 7.6, "genres": ["Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/e5768.jpeg"},
+    {"title": "Queen", "year": 2013, "rating": 8.2, "genres": ["Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/786fgu.jpeg"},
+    {"title": "Angry Indian Goddesses", "year": 2015, "rating": 7.0, "genres": ["Comedy", "Drama"], "image": "//Users/ralphblesson/Desktop/selsnium/354stdyui.jpeg"},
+    {"title": "Bareilly Ki Barfi", "year": 2017, "rating": 7.7, "genres": ["Comedy", "Romance"], "image": "/Users/ralphblesson/Desktop/selsnium/ytufi.jpeg"},
+    {"title": "Tamasha", "year": 2015, "rating": 7.6, "genres": ["Romance", "Drama", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (11).jpeg"},
+    {"title": "OMG! Oh My God", "year": 2012, "rating": 8.1, "genres": ["Comedy", "Drama"],'image':'/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025.jpeg'},
+    {"title": "Jaane Bhi Do Yaaro", "year": 1983, "rating": 8.4, "genres": ["Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (12).jpeg"},
+
+    # Romance (total 15)
+    {"title": "Kuch Kuch Hota Hai", "year": 1998, "rating": 7.6, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (13).jpeg"},
+    {"title": "Barfi!", "year": 2012, "rating": 8.1, "genres": ["Romance", "Comedy", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (14).jpeg"},
+    {"title": "Love Aaj Kal", "year": 2009, "rating": 6.6, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (15).jpeg"},
+    {"title": "Veer-Zaara", "year": 2004, "rating": 7.8, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (16).jpeg"},
+    {"title": "Saathiya", "year": 2002, "rating": 7.6, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (17).jpeg"},
+    {"title": "Lootera", "year": 2013, "rating": 7.4, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (18).jpeg"},
+    {"title": "Raja Hindustani", "year": 1996, "rating": 6.8, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (19).jpeg"},
+    {"title": "Jab We Met", "year": 2007, "rating": 7.9, "genres": ["Romance", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (20).jpeg"},
+    {"title": "Rehnaa Hai Terre Dil Mein", "year": 2001, "rating": 7.4, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (21).jpeg"},
+    {"title": "Ek Ladki Ko Dekha To Aisa Laga", "year": 2019, "rating": 7.4, "genres": ["Romance", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (22).jpeg"},
+
+    # Thriller (total 15)
+    {"title": "Talaash", "year": 2012, "rating": 7.2, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (23).jpeg"},
+    {"title": "Pink", "year": 2016, "rating": 8.1, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (24).jpeg"},
+    {"title": "Kahaani 2", "year": 2016, "rating": 6.6, "genres": ["Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (25).jpeg"},
+    {"title": "A Wednesday!", "year": 2008, "rating": 8.1, "genres": ["Thriller", "Crime"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (26).jpeg"},
+    {"title": "Badlapur", "year": 2015, "rating": 7.6, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (27).jpeg"},
+    {"title": "Drishyam (Hindi)", "year": 2015, "rating": 7.7, "genres": ["Thriller", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (28).jpeg"},
+    {"title": "NH10", "year": 2015, "rating": 7.0, "genres": ["Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (29).jpeg"},
+    {"title": "Special 26", "year": 2013, "rating": 7.8, "genres": ["Thriller", "Crime"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (30).jpeg"},
+    {"title": "Talvar", "year": 2015, "rating": 8.1, "genres": ["Mystery", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (31).jpeg"},
+
+    # Action (total 15)
+    {"title": "KGF", "year": 2018, "rating": 8.2, "genres": ["Action", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (32).jpeg"},
+    {"title": "War", "year": 2019, "rating": 6.5, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (33).jpeg"},
+    {"title": "Saaho", "year": 2019, "rating": 5.5, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (34).jpeg"},
+    {"title": "Raees", "year": 2017, "rating": 7.2, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (35).jpeg"},
+    {"title": "Ghajini", "year": 2008, "rating": 7.6, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (36).jpeg"},
+    {"title": "Dhoom 2", "year": 2006, "rating": 7.2, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (37).jpeg"},
+    {"title": "Holiday", "year": 2014, "rating": 7.9, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (38).jpeg"},
+    {"title": "Ra.One", "year": 2011, "rating": 4.9, "genres": ["Sci-Fi", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (39).jpeg"},
+    {"title": "Don", "year": 2006, "rating": 7.8, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (40).jpeg"},
+    {"title": "Gabbar Is Back", "year": 2015, "rating": 6.6, "genres": ["Action", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (41).jpeg"},
+
+    # Horror (total 10)
+    {"title": "Pari", "year": 2018, "rating": 6.0, "genres": ["Horror"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (42).jpeg"},
+    {"title": "Raaz", "year": 2002, "rating": 6.2, "genres": ["Horror", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (43).jpeg"},
+    {"title": "Pizza", "year": 2012, "rating": 7.0, "genres": ["Horror", "Mystery"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (44).jpeg"},
+    {"title": "1920", "year": 2008, "rating": 5.6, "genres": ["Horror", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (45).jpeg"},
+    {"title": "Ragini MMS", "year": 2011, "rating": 5.4, "genres": ["Horror"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (46).jpeg"},
+
+    # Drama (total 20)
+    {"title": "Anand", "year": 1971, "rating": 9.0, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (47).jpeg"},
+    {"title": "Stanley Ka Dabba", "year": 2011, "rating": 8.0, "genres": ["Drama", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (48).jpeg"},
+    {"title": "Masaan", "year": 2015, "rating": 8.1, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (49).jpeg"},
+    {"title": "October", "year": 2018, "rating": 7.7, "genres": ["Drama", "Romance"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (50).jpeg"},
+    {"title": "Kapoor & Sons", "year": 2016, "rating": 7.7, "genres": ["Drama", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (51).jpeg"},
+    {"title": "Taare Zameen Par", "year": 2007, "rating": 8.4, "genres": ["Drama", "Family"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (52).jpeg"},
+    {"title": "Lunchbox", "year": 2013, "rating": 8.0, "genres": ["Drama", "Romance"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (53).jpeg"},
+    {"title": "Chhapaak", "year": 2020, "rating": 7.1, "genres": ["Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (54).jpeg"},
+
+    # Sci-Fi (total 6)
+    {"title": "PK", "year": 2014, "rating": 8.1, "genres": ["Sci-Fi", "Comedy"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (55).jpeg"},
+    {"title": "Cargo", "year": 2019, "rating": 7.3, "genres": ["Sci-Fi", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (56).jpeg"},
+    {"title": "Tik Tik Tik", "year": 2018, "rating": 6.1, "genres": ["Sci-Fi", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (59).jpeg"},
+
+    # Mystery (total 6)
+    {"title": "Badla", "year": 2019, "rating": 7.8, "genres": ["Mystery", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (58).jpeg"},
+    {"title": "Ittefaq", "year": 2017, "rating": 7.0, "genres": ["Mystery", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (59).jpeg"},
+
+    # Fantasy (total 5)
+    {"title": "Miruthan", "year": 2016, "rating": 6.1, "genres": ["Fantasy", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (60).jpeg"},
+    {"title": "7aum Arivu", "year": 2011, "rating": 6.3, "genres": ["Fantasy", "Thriller"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (61).jpeg"},
+    {"title": "Raavan", "year": 2010, "rating": 6.2, "genres": ["Fantasy", "Action"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (62).jpeg"},
+
+    # Biography (total 3)
+    {"title": "Neerja", "year": 2016, "rating": 8.0, "genres": ["Biography", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (63).jpeg"},
+    {"title": "Dangal", "year": 2016, "rating": 8.4, "genres": ["Biography", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (64).jpeg"},
+    {"title": "MS Dhoni: The Untold Story", "year": 2016, "rating": 9.7, "genres": ["Biography", "Drama"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (65).jpeg"},
+
+    # Music (total 3)
+    {"title": "Rockstar", "year": 2011, "rating": 7.9, "genres": ["Drama", "Music"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (66).jpeg"},
+    {"title": "Aashiqui 2", "year": 2013, "rating": 7.1, "genres": ["Drama", "Music"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (67).jpeg"},
+    {"title": "Secret Superstar", "year": 2017, "rating": 7.8, "genres": ["Drama", "Music"], "image": "/Users/ralphblesson/Desktop/selsnium/WhatsApp Image Nov 4 2025 (68).jpeg"},
+]
+
+
+def bundled_catalog():
+    return Catalog.from_dicts(BUNDLED_MOVIES)
@@ -0,0 +1,415 @@
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from primeflix import metrics
+from primeflix.catalog import MovieRow
+
+log = logging.getLogger(__name__)
+
+# --- Poster preprocessing pipeline ---
+#
+# Resizes source posters into dest_dir, fanning the work out over a process pool.
+# dest_dir/manifest.json remembers, per output file, which source it came from
+# (path, size, mtime, sha1), so a rerun only touches new or changed posters:
+#   - same path/size/mtime as last time        -> skipped without reading it
+#   - stat changed but same sha1 (touched/copy) -> skipped, manifest refreshed
+#   - anything else                            -> resized again
+
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+
+
+def poster_filename(title, year, ext=".jpg"):
+    """Filesystem-safe output name for a movie poster, e.g. Premam_2015.jpg."""
+    safe_name = f"{title.strip().replace(' ', '_')}_{year}"
+    return "".join(ch for ch in safe_name if ch.isalnum() or ch in ("_", "-")) + ext
+
+
+def file_sha1(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _process_poster(job):
+    """
+    Worker: hash the source and resize it unless the hash matches the manifest.
+    Returns (status, sha1, error) with status in "processed" / "unchanged" / "failed".
+    Runs in a pool process, so it must stay a top-level function.
+    """
+    src, out_path, size, quality, known_sha1 = job
+    try:
+        sha1 = file_sha1(src)
+        if sha1 == known_sha1 and os.path.exists(out_path):
+            return "unchanged", sha1, None
+        from PIL import Image
+        with Image.open(src) as img:
+            img = img.convert("RGB").resize(tuple(size), Image.LANCZOS)
+            tmp_path = out_path + ".tmp"
+            img.save(tmp_path, format="JPEG", quality=quality)
+        os.replace(tmp_path, out_path)
+        return "processed", sha1, None
+    except Exception as e:
+        return "failed", None, f"failed to process: {e}"
+
+
+class PipelineReport:
+    """Outcome of one PosterPipeline.run()."""
+
+    def __init__(self):
+        self.processed = 0
+        self.unchanged = 0
+        self.skipped = 0
+        self.bytes_read = 0
+        self.failures = []  # dicts: title, source, reason
+        self.elapsed = 0.0
+
+    def fail(self, title, source, reason):
+        self.failures.append({"title": title, "source": source, "reason": reason})
+
+    @property
+    def throughput(self):
+        """Posters resized per second."""
+        return self.processed / self.elapsed if self.elapsed else 0.0
+
+    def as_dict(self):
+        return {
+            "processed": self.processed,
+            "unchanged": self.unchanged,
+            "skipped": self.skipped,
+            "failed": len(self.failures),
+            "elapsed_s": round(self.elapsed, 3),
+            "posters_per_s": round(self.throughput, 2),
+            "mb_per_s": round(self.bytes_read / 1e6 / self.elapsed, 2) if self.elapsed else 0.0,
+            "failures": self.failures,
+        }
+
+    def write_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+
+    def summary(self):
+        return (f"processed {self.processed}, unchanged {self.unchanged}, skipped {self.skipped}, "
+                f"failed {len(self.failures)} in {self.elapsed:.2f}s ({self.throughput:.1f} posters/s)")
+
+
+def _repoint(done):
+    """Set movie["image"] for (movie, path) pairs: one column update per Catalog, dicts directly."""
+    by_catalog = {}  # id(catalog) -> (catalog, {movie id: path})
+    for m, path in done:
+        if isinstance(m, MovieRow):
+            by_catalog.setdefault(id(m.catalog), (m.catalog, {}))[1][m.id] = path
+        else:
+            m["image"] = path
+    for catalog, paths in by_catalog.values():
+        catalog.set_column("image", list(paths), list(paths.values()))
+
+
+class PosterPipeline:
+    """
+    Incremental, parallel poster resizer.
+    - workers: pool size (None = os.cpu_count(), 1 = run inline, no pool)
+    - movies passed to run() get movie["image"] pointed at the resized file
+      (catalog rows in one Catalog.set_column once every job is back)
+    - movies sharing an output file share its one job
+    """
+
+    def __init__(self, dest_dir, size=(200, 300), workers=None, quality=90):
+        self.dest_dir = dest_dir
+        self.size = tuple(size)
+        self.workers = workers
+        self.quality = quality
+        self.manifest_path = os.path.join(dest_dir, MANIFEST_NAME)
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        # a different target size invalidates every output
+        if manifest.get("version") != MANIFEST_VERSION or tuple(manifest.get("size", ())) != self.size:
+            return {}
+        return manifest.get("entries", {})
+
+    def save_manifest(self, entries):
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": MANIFEST_VERSION, "size": list(self.size), "entries": entries}, f)
+        os.replace(tmp_path, self.manifest_path)
+
+    def run(self, movies, overwrite=False):
+        report = PipelineReport()
+        try:
+            import PIL  # noqa: F401  (only checking it is installed)
+        except ImportError:
+            log.warning("Pillow not available — skipping poster preprocessing.")
+            return report
+
+        start = time.perf_counter()
+        os.makedirs(self.dest_dir, exist_ok=True)
+        entries = self.load_manifest()
+
+        jobs, pending = [], []
+        claimed = {}  # out_path -> (source, pending index or None if up to date); one job per file
+        done = []     # (movie, out_path) to repoint once every job is back
+        for m in movies:
+            title = m.get("title", "<unknown>")
+            p = m.get("image")
+            if not p:
+                report.fail(title, None, "no path set")
+                continue
+            src = os.path.abspath(os.path.expanduser(p))
+            out_path = os.path.join(self.dest_dir, poster_filename(m["title"], m.get("year", "")))
+            if src == out_path:
+                report.skipped += 1
+                continue
+            if out_path in claimed:
+                other, job = claimed[out_path]
+                if other != src:
+                    report.fail(title, src, f"same output file as {other}")
+                elif job is None:
+                    done.append((m, out_path))
+                    report.skipped += 1
+                else:
+                    pending[job][0].append(m)
+                continue
+            try:
+                st = os.stat(src)
+            except OSError:
+                report.fail(title, src, "missing")
+                continue
+
+            entry = entries.get(out_path)
+            same_source = entry is not None and entry["source"] == src and os.path.exists(out_path)
+            if not overwrite and same_source and entry["size"] == st.st_size and entry["mtime"] == st.st_mtime:
+                claimed[out_path] = (src, None)
+                done.append((m, out_path))
+                report.skipped += 1
+                continue
+
+            known_sha1 = entry["sha1"] if same_source and not overwrite else None
+            claimed[out_path] = (src, len(pending))
+            jobs.append((src, out_path, self.size, self.quality, known_sha1))
+            pending.append(([m], title, src, out_path, st))
+
+        for (group, title, src, out_path, st), (status, sha1, error) in zip(pending, self._map(jobs)):
+            if status == "failed":
+                for m in group:
+                    report.fail(m.get("title", title), src, error)
+                continue
+            entries[out_path] = {"source": src, "size": st.st_size, "mtime": st.st_mtime, "sha1": sha1}
+            done.extend((m, out_path) for m in group)
+            report.bytes_read += st.st_size
+            if status == "processed":
+                report.processed += 1
+            else:
+                report.unchanged += 1
+        _repoint(done)
+
+        if jobs:
+            self.save_manifest(entries)
+        report.elapsed = time.perf_counter() - start
+        metrics.observe("poster_pipeline_seconds", report.elapsed)
+        metrics.inc("posters_processed_total", report.processed)
+        metrics.inc("posters_failed_total", len(report.failures))
+        log.info("Poster preprocessing: %s", report.summary())
+        for failure in report.failures:
+            log.warning("Poster failed: %(title)s (%(source)s) -> %(reason)s", failure)
+        return report
+
+    def _map(self, jobs):
+        workers = self.workers or os.cpu_count() or 1
+        if workers == 1 or len(jobs) < 2:
+            return [_process_poster(job) for job in jobs]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(_process_poster, jobs, chunksize=max(1, len(jobs) // (workers * 8))))
+
+
+# --- Shared poster cache ---
+
+def load_poster_image(path, size):
+    """Decode `path` and LANCZOS-resize it to `size` (RGB PIL image)."""
+    from PIL import Image
+    with metrics.timer("poster_decode_seconds"), Image.open(path) as img:
+        # JPEG only: let the decoder downscale by 1/2..1/8 first, far cheaper than a full decode
+        img.draft("RGB", size)
+        img = img.convert("RGB")
+    with metrics.timer("poster_resize_seconds"):
+        return img.resize(size, Image.LANCZOS)
+
+
+class PosterCache:
+    """
+    Process-wide LRU of decoded + resized posters, keyed by (path, size, mtime)
+    so an edited file is picked up again. Bounded by `max_bytes` of pixel data.
+    Thread-safe; get() raises the usual OSError/PIL errors for unreadable files.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+        self._latest = {}  # (path, size) -> key of the newest cached version
+        self._lock = threading.Lock()
+
+    def get(self, path, size):
+        size = tuple(size)
+        key = (path, size, os.stat(path).st_mtime)
+        with self._lock:
+            img = self._items.get(key)
+            if img is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                metrics.inc("poster_cache_hits_total")
+                return img
+            self.misses += 1
+        metrics.inc("poster_cache_misses_total")
+        img = load_poster_image(path, size)
+        self.put(key, img)
+        return img
+
+    def peek(self, path, size):
+        """
+        Newest cached image for (path, size) or None, without touching the disk
+        (no stat), so it is safe to call from the UI thread.
+        """
+        with self._lock:
+            img = self._items.get(self._latest.get((path, tuple(size))))
+            if img is not None:
+                self._items.move_to_end(self._latest[(path, tuple(size))])
+                self.hits += 1
+                metrics.inc("poster_cache_hits_total")
+            return img
+
+    def put(self, key, img):
+        nbytes = img.width * img.height * len(img.getbands())
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old.width * old.height * len(old.getbands())
+            self._items[key] = img
+            self._latest[key[:2]] = key
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes and len(self._items) > 1:
+                old_key, evicted = self._items.popitem(last=False)
+                if self._latest.get(old_key[:2]) == old_key:
+                    del self._latest[old_key[:2]]
+                self.bytes -= evicted.width * evicted.height * len(evicted.getbands())
+                self.evictions += 1
+                metrics.inc("poster_cache_evictions_total")
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._latest.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"entries": len(self._items), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                    "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+# budget in MB can be set with PRIMEFLIX_POSTER_CACHE_MB (default 64)
+POSTER_CACHE = PosterCache(int(os.environ.get("PRIMEFLIX_POSTER_CACHE_MB", "64")) * 1024 * 1024)
+
+
+# --- Background poster loading ---
+
+class PosterLoader:
+    """
+    Decodes posters on a thread pool (through a PosterCache) so the UI thread never
+    waits on disk or PIL. Finished loads are queued; the UI calls drain() from its
+    own loop (e.g. every few ms via root.after) and the callbacks run there as
+    callback(image, error).
+    Every request has a key (typically the widget it is for): a new request for the
+    same key, or cancel(key), cancels the old one if it has not started yet and
+    drops its result if it has.
+    """
+
+    def __init__(self, cache=None, workers=4):
+        self.cache = cache or POSTER_CACHE
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="poster")
+        self._done = queue.SimpleQueue()
+        self._pending = {}  # key -> (token, future); only touched on the UI thread
+        self._tokens = itertools.count()
+
+    def request(self, key, path, size, callback, load=None):
+        """Load `path` at `size` (or call `load()` instead, e.g. to try a poster atlas first) on a worker."""
+        self.cancel(key)
+        token = next(self._tokens)
+        future = self._pool.submit(self._load, key, token, path, tuple(size), callback, load)
+        self._pending[key] = (token, future)
+        return token
+
+    def _load(self, key, token, path, size, callback, load=None):
+        try:
+            img, error = (load() if load is not None else self.cache.get(path, size)), None
+        except Exception as e:
+            img, error = None, e
+        self._done.put((key, token, callback, img, error))
+
+    def cancel(self, key):
+        entry = self._pending.pop(key, None)
+        if entry is not None:
+            entry[1].cancel()
+
+    def pending(self):
+        return len(self._pending)
+
+    def drain(self):
+        """Run callbacks of loads that are still wanted. Call from the UI thread only."""
+        while True:
+            try:
+                key, token, callback, img, error = self._done.get_nowait()
+            except queue.Empty:
+                return
+            entry = self._pending.get(key)
+            if entry is None or entry[0] != token:
+                continue  # cancelled or superseded
+            del self._pending[key]
+            callback(img, error)
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resize movie posters (only new or changed ones).")
+    parser.add_argument("movies", help="JSON file with a list of movie dicts (title, year, image)")
+    parser.add_argument("--dest", default="/tmp/primeflix_posters")
+    parser.add_argument("--size", default="200x300", help="WIDTHxHEIGHT")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--overwrite", action="store_true")
+    parser.add_argument("--report", help="write the JSON report (incl. failures) here")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    with open(args.movies) as f:
+        movies = json.load(f)
+    size = tuple(int(v) for v in args.size.lower().split("x"))
+    report = PosterPipeline(args.dest, size=size, workers=args.workers).run(movies, overwrite=args.overwrite)
+    if args.report:
+        report.write_json(args.report)
+    return 1 if report.failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
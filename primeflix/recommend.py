@@ -0,0 +1,170 @@
+import numpy as np
+
+# --- Content-based "More like this" ---
+#
+# Every movie becomes a small float vector (one block per feature below, each
+# scaled by sqrt(weight)), and its neighbours are the movies at the smallest
+# squared distance. The top-k per movie is computed once as a batch job and kept
+# in two arrays indexed by movie id, so the UI lookup is a single row read:
+#   neighbours  int32   (ids, k)  -1 = no neighbour
+#   scores      float16 (ids, k)  1 / (1 + distance^2), higher = more similar
+#
+# Small catalogs are searched exactly. Big ones use an inverted-file search:
+# movies are clustered with k-means and each cluster only compares against
+# its `nprobe` nearest clusters.
+
+
+def genre_features(catalog, ids):
+    """Multi-hot genres, L2-normalized (a movie with 3 genres isn't 'further' than one with 1)."""
+    masks = catalog.genre_mask[ids]
+    bits = np.arange(len(catalog.genre_names), dtype=np.uint64)
+    x = ((masks[:, None] >> bits[None, :]) & np.uint64(1)).astype(np.float32)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1)
+
+
+def year_feature(catalog, ids):
+    """Year in units of 25 years."""
+    return (catalog.year[ids].astype(np.float32)[:, None] - 1900) / 25
+
+
+def rating_feature(catalog, ids):
+    """Rating in units of 2 stars."""
+    return catalog.rating10[ids].astype(np.float32)[:, None] / 20
+
+
+# (name, fn(catalog, ids) -> (len(ids), d) array, weight); add new features here
+FEATURES = [
+    ("genres", genre_features, 1.0),
+    ("year", year_feature, 0.5),
+    ("rating", rating_feature, 0.25),
+]
+
+
+def feature_matrix(catalog, ids, features=FEATURES):
+    blocks = [fn(catalog, ids) * np.float32(np.sqrt(weight)) for _, fn, weight in features]
+    return np.ascontiguousarray(np.hstack(blocks), dtype=np.float32)
+
+
+def _topk(q, q_pos, c, c_pos, k, max_elems=1 << 24):
+    """
+    For each row of `q` the k nearest rows of `c` (excluding itself, matched by position).
+    Returns (positions, squared distances), padded with -1 / inf. Works in row blocks
+    so the distance matrix never exceeds `max_elems` floats.
+    """
+    out_pos = np.full((len(q), k), -1, np.int64)
+    out_d = np.full((len(q), k), np.inf, np.float32)
+    if len(c) == 0:
+        return out_pos, out_d
+    c_sq = np.einsum("ij,ij->i", c, c)
+    kk = min(k, len(c))
+    step = max(1, max_elems // len(c))
+    for lo in range(0, len(q), step):
+        hi = min(lo + step, len(q))
+        d = q[lo:hi] @ c.T
+        d *= -2
+        d += c_sq[None, :]
+        d += np.einsum("ij,ij->i", q[lo:hi], q[lo:hi])[:, None]
+        d[q_pos[lo:hi, None] == c_pos[None, :]] = np.inf
+        if kk < len(c):
+            part = np.argpartition(d, kk - 1, axis=1)[:, :kk]
+        else:
+            part = np.broadcast_to(np.arange(len(c)), (hi - lo, len(c)))
+        part_d = np.take_along_axis(d, part, axis=1)
+        order = np.argsort(part_d, axis=1)
+        out_pos[lo:hi, :kk] = c_pos[np.take_along_axis(part, order, axis=1)]
+        out_d[lo:hi, :kk] = np.take_along_axis(part_d, order, axis=1)
+    out_pos[~np.isfinite(out_d)] = -1
+    return out_pos, out_d
+
+
+def _assign(x, centroids, block=65536):
+    c_sq = np.einsum("ij,ij->i", centroids, centroids)
+    out = np.empty(len(x), np.int64)
+    for lo in range(0, len(x), block):
+        d = c_sq[None, :] - 2 * (x[lo:lo + block] @ centroids.T)
+        out[lo:lo + block] = np.argmin(d, axis=1)
+    return out
+
+
+def kmeans(x, n_clusters, rng, iters=8, sample=50000):
+    """Plain Lloyd's k-means on a sample of `x`; returns centroids."""
+    s = x[rng.choice(len(x), min(sample, len(x)), replace=False)]
+    centroids = s[rng.choice(len(s), n_clusters, replace=False)].copy()
+    for _ in range(iters):
+        labels = _assign(s, centroids)
+        counts = np.bincount(labels, minlength=n_clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, s)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+    return centroids
+
+
+class SimilarityIndex:
+    """Precomputed top-k content neighbours per movie id (see module comment)."""
+
+    def __init__(self, neighbours, scores):
+        self.neighbours_table = neighbours
+        self.scores_table = scores
+
+    @classmethod
+    def build(cls, catalog, k=10, features=FEATURES, exact_limit=20000, nprobe=6, seed=0):
+        ids = catalog.ids()
+        neighbours = np.full((catalog.size, k), -1, np.int32)
+        scores = np.zeros((catalog.size, k), np.float16)
+        if len(ids) < 2:
+            return cls(neighbours, scores)
+
+        x = feature_matrix(catalog, ids, features)
+        pos = np.arange(len(ids))
+        if len(ids) <= exact_limit:
+            near, dist = _topk(x, pos, x, pos, k)
+            cls._store(neighbours, scores, ids, ids, near, dist)
+            return cls(neighbours, scores)
+
+        rng = np.random.default_rng(seed)
+        centroids = kmeans(x, int(np.sqrt(len(ids))), rng)
+        labels = _assign(x, centroids)
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(len(centroids) + 1))
+        probes, _ = _topk(centroids, np.full(len(centroids), -1), centroids,
+                          np.arange(len(centroids)), min(nprobe, len(centroids)))
+        for c in range(len(centroids)):
+            members = order[bounds[c]:bounds[c + 1]]
+            if len(members) == 0:
+                continue
+            cand = np.concatenate([order[bounds[p]:bounds[p + 1]] for p in probes[c] if p >= 0])
+            near, dist = _topk(x[members], members, x[cand], cand, k)
+            cls._store(neighbours, scores, ids[members], ids, near, dist)
+        return cls(neighbours, scores)
+
+    @staticmethod
+    def _store(neighbours, scores, row_ids, ids, near, dist):
+        valid = near >= 0
+        neighbours[row_ids] = np.where(valid, ids[np.maximum(near, 0)], -1)
+        scores[row_ids] = np.where(valid, 1 / (1 + dist), 0)
+
+    def neighbours(self, movie_id):
+        """Ids most similar to `movie_id`, best first (O(1) row lookup)."""
+        if not 0 <= movie_id < len(self.neighbours_table):
+            return self.neighbours_table[:0, 0]
+        row = self.neighbours_table[movie_id]
+        return row[row >= 0]
+
+    def similar(self, catalog, movie_id, n=None):
+        """Rows of the neighbours still present in `catalog`."""
+        ids = [int(i) for i in self.neighbours(movie_id) if catalog.alive[i]]
+        return catalog.rows(ids[:n])
+
+    @property
+    def nbytes(self):
+        return self.neighbours_table.nbytes + self.scores_table.nbytes
+
+    def save(self, path):
+        np.savez(path, neighbours=self.neighbours_table, scores=self.scores_table)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data["neighbours"], data["scores"])
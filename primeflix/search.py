@@ -0,0 +1,256 @@
+import re
+import threading
+from collections import OrderedDict
+
+from primeflix.fuzzy import FuzzyIndex
+
+# --- Search index used by find_movies ---
+
+_TOKEN_RE = re.compile(r"[0-9a-z]+")
+
+# relevance tiers, best first (see SearchIndex.tiers)
+EXACT, PREFIX, WORD, SUBSTRING, GENRE_MATCH, FUZZY, FUZZY_FAR = range(7)
+TIERS = 7
+
+
+def tokenize(text):
+    """Lowercase `text` and split it into alphanumeric words."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def grams(text, n=3):
+    """All distinct substrings of `text` with length 1..n."""
+    out = set()
+    for size in range(1, n + 1):
+        for i in range(len(text) - size + 1):
+            out.add(text[i:i + size])
+    return out
+
+
+class SearchIndex:
+    """
+    Inverted index over a movie list, keyed by movie id (position in the list,
+    or the catalog id when built from a Catalog).
+    - `tokens`: title word -> ids, `genres`: lowercase genre -> ids
+    - `grams`: every 1..3 char substring of a lowercase title -> ids, so a
+      substring query only looks at movies that contain all of its grams
+    - `fuzzy`: the title word vocabulary for typo-tolerant lookups (fuzzy_ids)
+    Call add/remove/update when single movies change, rebuild() for a new list,
+    or subscribe catalog_changed to a Catalog to keep it in sync automatically.
+    """
+
+    GRAM = 3
+
+    def __init__(self, movies=()):
+        self.rebuild(movies)
+
+    def rebuild(self, movies):
+        self.version = 0  # bumped whenever the indexed titles/genres change
+        self.movies = {}
+        self.titles = {}
+        self.movie_genres = {}
+        self.tokens = {}
+        self.genres = {}
+        self.grams = {}
+        self.fuzzy = FuzzyIndex()
+        items = movies.items() if hasattr(movies, "items") else enumerate(movies)
+        for movie_id, m in items:
+            self.add(movie_id, m)
+
+    def __len__(self):
+        return len(self.movies)
+
+    def add(self, movie_id, m):
+        if movie_id in self.movies:
+            self.remove(movie_id)
+        title = m["title"].lower()
+        genres = tuple(g.lower() for g in m.get("genres", []))
+        self.version += 1
+        self.movies[movie_id] = m
+        self.titles[movie_id] = title
+        self.movie_genres[movie_id] = genres
+        for tok in tokenize(title):
+            posting = self.tokens.get(tok)
+            if posting is None:
+                posting = self.tokens[tok] = set()
+                self.fuzzy.add(tok)
+            posting.add(movie_id)
+        for g in genres:
+            self.genres.setdefault(g, set()).add(movie_id)
+        for gram in grams(title, self.GRAM):
+            self.grams.setdefault(gram, set()).add(movie_id)
+
+    def remove(self, movie_id):
+        if self.movies.pop(movie_id, None) is None:
+            return
+        self.version += 1
+        title = self.titles.pop(movie_id)
+        _discard(self.tokens, tokenize(title), movie_id)
+        _discard(self.genres, self.movie_genres.pop(movie_id), movie_id)
+        _discard(self.grams, grams(title, self.GRAM), movie_id)
+
+    def update(self, movie_id, m):
+        if (self.titles.get(movie_id) == m["title"].lower()
+                and self.movie_genres.get(movie_id) == tuple(g.lower() for g in m.get("genres", []))):
+            self.movies[movie_id] = m
+            return
+        self.add(movie_id, m)
+
+    def catalog_changed(self, event, movie_id, m):
+        """Listener for Catalog.subscribe()."""
+        if event == "remove":
+            self.remove(movie_id)
+        else:
+            self.update(movie_id, m)
+
+    def title_ids(self, q):
+        """Ids whose lowercase title contains `q`."""
+        if len(q) <= self.GRAM:
+            return set(self.grams.get(q, ()))
+        postings = sorted((self.grams.get(q[i:i + self.GRAM], ()) for i in range(len(q) - self.GRAM + 1)), key=len)
+        if not postings[0]:
+            return set()
+        candidates = set(postings[0])
+        for p in postings[1:]:
+            candidates &= p
+            if not candidates:
+                return candidates
+        return {i for i in candidates if q in self.titles[i]}
+
+    def genre_ids(self, q):
+        """Ids with a genre whose lowercase name contains `q`."""
+        ids = set()
+        for g, posting in self.genres.items():
+            if q in g:
+                ids |= posting
+        return ids
+
+    def matches(self, movie_id, q):
+        """Same test as search(), for a single movie."""
+        return q in self.titles[movie_id] or any(q in g for g in self.movie_genres[movie_id])
+
+    def fuzzy_ids(self, q):
+        """
+        {id: total edits} for titles that have, for every word of `q`, a word
+        within its typo budget (see primeflix.fuzzy), in any order.
+        """
+        per_word = []
+        for w in tokenize(q):
+            near = self.fuzzy.lookup(w)
+            if w in self.tokens:
+                near[w] = 0
+            near = [(d, self.tokens[tok]) for tok, d in near.items() if tok in self.tokens]
+            if not near:
+                return {}
+            per_word.append(sorted(near, key=lambda p: p[0]))
+        # start from the rarest word, then only narrow
+        per_word.sort(key=lambda near: sum(len(ids) for _, ids in near))
+        found = {}
+        for d, ids in reversed(per_word[0]) if per_word else ():
+            found.update(dict.fromkeys(ids, d))
+        for near in per_word[1:]:
+            narrowed = {}
+            for i, total in found.items():
+                for d, ids in near:
+                    if i in ids:
+                        narrowed[i] = total + d
+                        break
+            found = narrowed
+            if not found:
+                break
+        return found
+
+    def search_ids(self, q):
+        return sorted(self.title_ids(q) | self.genre_ids(q))
+
+    def tiers(self, q, ids):
+        """
+        Split matching `ids` into relevance tiers for lowercase `q`:
+        [exact title, title prefix, whole title word(s), title substring, genre only],
+        then titles that don't contain `q` but match it word by word with at most
+        one typo overall, and with more.
+        """
+        words = tokenize(q)
+        word_ids = set.intersection(*(self.tokens.get(w, set()) for w in words)) if words else set()
+        out = [[] for _ in range(TIERS)]
+        for i in ids:
+            title = self.titles[i]
+            if q not in title:
+                out[GENRE_MATCH].append(i)
+            elif title == q:
+                out[EXACT].append(i)
+            elif title.startswith(q):
+                out[PREFIX].append(i)
+            elif i in word_ids:
+                out[WORD].append(i)
+            else:
+                out[SUBSTRING].append(i)
+        matched = set(ids)
+        for i, edits in self.fuzzy_ids(q).items():
+            if i not in matched:
+                out[FUZZY if edits <= 1 else FUZZY_FAR].append(i)
+        return out
+
+    def search(self, q):
+        """Movies matching lowercase `q` by title or genre substring, in catalog order."""
+        return [self.movies[i] for i in self.search_ids(q)]
+
+
+class IncrementalSearch:
+    """
+    Search-as-you-type on top of a SearchIndex.
+    - if the new query extends the previous one ("bah" -> "bahu") the previous
+      ids are filtered instead of querying the index again: anything containing
+      "bahu" contains "bah", so the answer is a subset
+    - recent query -> ids lists are kept in a bounded LRU (backspacing is free)
+    Both are dropped when the index changes. Thread-safe.
+    """
+
+    def __init__(self, index, cache_size=256):
+        self.index = index
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._version = index.version
+        self._last_q = None
+        self._last_ids = []
+        self._lock = threading.Lock()
+
+    def ids(self, query):
+        q = query.strip().lower()
+        if not q:
+            return []
+        with self._lock:
+            return self._ids(q)
+
+    def _ids(self, q):
+        if self._version != self.index.version:
+            self._cache.clear()
+            self._last_q = None
+            self._version = self.index.version
+
+        ids = self._cache.get(q)
+        if ids is not None:
+            self._cache.move_to_end(q)
+        elif self._last_q and q.startswith(self._last_q):
+            ids = [i for i in self._last_ids if self.index.matches(i, q)]
+        else:
+            ids = self.index.search_ids(q)
+        self._cache[q] = ids
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        self._last_q, self._last_ids = q, ids
+        return ids
+
+    def search(self, query, limit=None):
+        ids = self.ids(query)
+        return [self.index.movies[i] for i in ids[:limit]]
+
+
+def _discard(index, keys, movie_id):
+    for key in keys:
+        posting = index.get(key)
+        if posting is None:
+            continue
+        posting.discard(movie_id)
+        if not posting:
+            del index[key]
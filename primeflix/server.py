@@ -0,0 +1,324 @@
+import argparse
+import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from primeflix import metrics
+from primeflix.core import Primeflix
+
+log = logging.getLogger(__name__)
+
+# --- JSON API over asyncio ---
+#
+# A small HTTP/1.1 server (stdlib only, keep-alive) in front of a Primeflix core:
+#
+#   GET  /health                          {"movies": n, "version": v, "query_cache": {entries, hit_rate, ...}}
+#   GET  /search?q=...&limit=20&cursor=.. {"query", "total", "cursor", "results": [movie, ...]}
+#                 &fields=id              results are just [{"id"}, ...] (big pages)
+#   POST /search   {"queries": [...], "limit": 20}      batch: {"results": [search, ...]}
+#   GET  /suggest?q=...&limit=8           {"query", "results": [movie, ...]}
+#   GET  /text?q=...&limit=20             {"query", "results": [movie, ...]}  titles + descriptions (BM25)
+#   GET  /movies/<id>                     movie
+#   GET  /similar/<id>?n=5                {"id", "results": [movie, ...]}
+#   POST /similar  {"ids": [...], "n": 5}               batch: {"results": [similar, ...]}
+#   GET  /genres/<name>?limit=50          {"genre", "total", "results": [movie, ...]}
+#   GET  /browse?genre=..&any=..&from=..&to=..&min_rating=..&max_rating=..&limit=50&offset=0
+#                                         {"total", "facets", "results": [movie, ...]}
+#   POST /recommend {"favourites": [ids], "k": 5}       {"results": [movie, ...]}
+#   POST /feed {"favourites": [ids], "session": "..", "limit": 100, "offset": 0}
+#                                         {"total", "results": [movie, ...]}  personalized Browse feed
+#   GET  /metrics[?format=prometheus]     metrics snapshot (see primeflix.metrics)
+#
+# A movie is {"id", "title", "year", "rating", "genres", "image", "description"}. Search results
+# are ranked (see Primeflix.search_page); pass "cursor" back for the next page,
+# it is null on the last one. Browse takes repeated genre= (all of) / any= (one of)
+# and returns facet counts for the whole result: {"genres", "decades", "ratings"}
+# (see primeflix.facets). Requests are handled on a small thread pool
+# (loop.run_in_executor; the core is thread-safe), so a slow query, a
+# first-use index build or a sharded scatter doesn't stall the event loop or
+# the other clients. main() builds the indexes before it starts serving.
+
+MAX_BODY = 1 << 20
+MAX_BATCH = 1000
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+def _int(params, name, default):
+    value = params.get(name, [default])[0]
+    if value is None or value == "all":
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(400, f"'{name}' must be an integer")
+
+
+def _float(params, name):
+    value = params.get(name, [None])[0]
+    try:
+        return float(value) if value not in (None, "") else None
+    except ValueError:
+        raise HTTPError(400, f"'{name}' must be a number")
+
+
+def _batch(body, key):
+    items = body.get(key)
+    if not isinstance(items, list):
+        raise HTTPError(400, f"'{key}' must be a list")
+    if len(items) > MAX_BATCH:
+        raise HTTPError(413, f"at most {MAX_BATCH} {key} per request")
+    return items
+
+
+class API:
+    """Routes requests to a Primeflix core; handle() returns a JSON-able body or raises HTTPError."""
+
+    def __init__(self, core):
+        self.core = core
+
+    def handle(self, method, target, body):
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.strip("/").split("/")]
+        params = parse_qs(url.query)
+        route = getattr(self, f"{method.lower()}_{parts[0]}", None) if parts[0] else None
+        if route is None:
+            known = any(hasattr(self, f"{m}_{parts[0]}") for m in ("get", "post"))
+            raise HTTPError(405 if known else 404, f"no route for {method} {url.path}")
+        with metrics.timer("http_request_seconds", route=f"{method} /{parts[0]}"):
+            return route(parts[1:], params, body)
+
+    def search(self, query, limit, cursor=None, ids_only=False):
+        page = self.core.search_page(query, limit, cursor)
+        results = [{"id": i} for i in page.ids] if ids_only else self.core.movies(page.ids)
+        return {"query": query, "total": page.total, "cursor": page.cursor, "results": results}
+
+    def similar(self, movie_id, n):
+        if not (0 <= movie_id < self.core.catalog.size and self.core.catalog.alive[movie_id]):
+            raise HTTPError(404, f"no movie {movie_id}")
+        return {"id": movie_id, "results": self.core.movies(self.core.similar_ids(movie_id, n))}
+
+    def get_health(self, path, params, body):
+        return {"movies": len(self.core.catalog), "version": self.core.index.version,
+                "query_cache": self.core.query_cache.stats()}
+
+    def get_search(self, path, params, body):
+        return self.search(params.get("q", [""])[0], _int(params, "limit", 20), params.get("cursor", [None])[0],
+                           params.get("fields", [""])[0] == "id")
+
+    def post_search(self, path, params, body):
+        limit = int(body.get("limit", 20))
+        return {"results": [self.search(str(q), limit) for q in _batch(body, "queries")]}
+
+    def get_suggest(self, path, params, body):
+        query = params.get("q", [""])[0]
+        ids = self.core.suggest_ids(query, _int(params, "limit", 8))
+        return {"query": query, "results": self.core.movies(ids)}
+
+    def get_text(self, path, params, body):
+        query = params.get("q", [""])[0]
+        ids = self.core.text_search_ids(query, _int(params, "limit", 20))
+        return {"query": query, "results": self.core.movies(ids)}
+
+    def get_movies(self, path, params, body):
+        movie_id = self._id(path)
+        try:
+            return self.core.movie(movie_id)
+        except KeyError:
+            raise HTTPError(404, f"no movie {movie_id}")
+
+    def get_similar(self, path, params, body):
+        return self.similar(self._id(path), _int(params, "n", 5))
+
+    def post_similar(self, path, params, body):
+        n = int(body.get("n", 5))
+        results = []
+        for movie_id in _batch(body, "ids"):
+            try:
+                results.append(self.similar(int(movie_id), n))
+            except HTTPError:
+                results.append({"id": movie_id, "results": []})
+        return {"results": results}
+
+    def get_genres(self, path, params, body):
+        if len(path) != 1:
+            raise HTTPError(404, "expected /genres/<name>")
+        ids = self.core.genre_ids(path[0])
+        return {"genre": path[0], "total": len(ids),
+                "results": self.core.movies(ids[:_int(params, "limit", 50)])}
+
+    def get_browse(self, path, params, body):
+        years = (_int(params, "from", None), _int(params, "to", None))
+        offset = _int(params, "offset", 0) or 0
+        if offset < 0:
+            raise HTTPError(400, "'offset' must not be negative")
+        page = self.core.browse(params.get("genre", []), params.get("any", []),
+                                years if years != (None, None) else None,
+                                _float(params, "min_rating"), _float(params, "max_rating"),
+                                _int(params, "limit", 50), offset)
+        return {"total": page.total, "facets": page.facets, "results": self.core.movies(page.ids)}
+
+    def get_metrics(self, path, params, body):
+        if params.get("format", ["json"])[0] == "prometheus":
+            return metrics.prometheus()  # sent as text/plain
+        return {"enabled": metrics.enabled(), **metrics.snapshot()}
+
+    def post_recommend(self, path, params, body):
+        favourites = [int(i) for i in _batch(body, "favourites")]
+        return {"results": self.core.movies(self.core.recommend_ids(favourites, int(body.get("k", 5))))}
+
+    def post_feed(self, path, params, body):
+        favourites = [int(i) for i in _batch(body, "favourites")]
+        offset = int(body.get("offset", 0))
+        if offset < 0:
+            raise HTTPError(400, "'offset' must not be negative")
+        limit = body.get("limit", 100)
+        page = self.core.feed_page(favourites, None if limit is None else int(limit), offset,
+                                   str(body.get("session", "default")))
+        return {"total": page.total, "results": self.core.movies(page.ids)}
+
+    @staticmethod
+    def _id(path):
+        if len(path) != 1 or not path[0].isdigit():
+            raise HTTPError(404, "expected a numeric movie id")
+        return int(path[0])
+
+
+async def _read_request(reader):
+    """(method, target, headers, body) or None when the client closed the connection."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+    length = int(headers.get("content-length", 0) or 0)
+    if length > MAX_BODY:
+        raise HTTPError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target, headers, body
+
+
+def _response(status, payload, keep_alive):
+    if isinstance(payload, str):
+        data, content_type = payload.encode(), "text/plain; version=0.0.4"
+    else:
+        data, content_type = json.dumps(payload, ensure_ascii=False).encode(), "application/json"
+    head = (f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+            f"Content-Type: {content_type}; charset=utf-8\r\n"
+            f"Content-Length: {len(data)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode() + data
+
+
+class Server:
+    """
+    Serves API(core) on host:port; one coroutine per connection, requests on
+    a connection handled in order, on a pool of `threads` worker threads.
+    """
+
+    def __init__(self, core, host="127.0.0.1", port=8765, threads=4):
+        self.api = API(core)
+        self.host = host
+        self.port = port
+        self._server = None
+        self._executor = ThreadPoolExecutor(threads, thread_name_prefix="primeflix-api")
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        log.info("PRIMEFLIX API on http://%s:%d", self.host, self.port)
+        return self
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        self._server.close()
+        await self._server.wait_closed()
+        self._executor.shutdown()
+
+    async def _connection(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await _read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, raw = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    body = json.loads(raw) if raw else {}
+                    if not isinstance(body, dict):
+                        raise HTTPError(400, "request body must be a JSON object")
+                    status, payload = 200, await loop.run_in_executor(self._executor, self.api.handle,
+                                                                      method, target, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (ValueError, TypeError) as e:
+                    status, payload = 400, {"error": str(e)}
+                except Exception:
+                    log.exception("error handling request")
+                    status, payload = 500, {"error": "internal error"}
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve PRIMEFLIX search and recommendations as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--synthetic", type=int, metavar="N", help="serve N generated movies instead (load tests)")
+    parser.add_argument("--shards", type=int, default=0, metavar="N",
+                        help="search N shared memory shards on a process pool (see primeflix.shards)")
+    parser.add_argument("--threads", type=int, default=4, help="threads answering requests")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.synthetic:
+        from primeflix.synthetic import synthetic_catalog
+        core = Primeflix(synthetic_catalog(args.synthetic, descriptions=True), shards=args.shards)
+    else:
+        core = Primeflix.bundled(shards=args.shards)
+    log.info("Building indexes...")
+    core.warm_up().join()  # before serving: no client waits on a first-use build
+    server = Server(core, args.host, args.port, args.threads)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        core.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,312 @@
+import atexit
+import json
+import logging
+import os
+import signal
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from primeflix import metrics
+from primeflix.search import EXACT, GENRE_MATCH, PREFIX, SUBSTRING, WORD, tokenize
+
+log = logging.getLogger(__name__)
+
+# --- Sharded title search over shared memory ---
+#
+# The catalog's live movies are split into `shards` contiguous id ranges. Each
+# shard is one shared memory segment holding packed arrays (same layout idea
+# as primeflix.snapshot: a JSON header of (dtype, offset, shape) per section):
+#
+#   blob    lowercase UTF-8 titles, each followed by "\n"
+#   starts  int64 offset of each title in blob, plus the end
+#   base    int64 ((100 - rating10) << 32) | id, the rank of a match inside its tier
+#           (rating10 clamped to 0..100 to fit its 8 bits)
+#   masks   uint64 genre bits
+#
+# Pool workers attach to every segment once (by name, nothing is copied) and
+# answer one (query, shard) task at a time with a vectorized scan: candidate
+# positions of the query's rarest byte, narrowed byte by byte, mapped to titles
+# with searchsorted (each query word is found the same way, for the word tier).
+# A match is keyed
+#
+#   (tier << 40) | base      tier: exact, prefix, word, substring, genre
+#
+# so one int64 sort orders matches the way Primeflix.search_page does (tier,
+# best rated, lowest id). Each shard sends back only its best `limit` keys
+# after the cursor and its counts; the caller merges those top-N lists. Typo
+# tolerant and description matches need the in-process indexes and are not
+# sharded (see Primeflix.search_page).
+
+_TIER_SHIFT = 40
+_SEGMENTS = {}  # worker side: segment name -> (SharedMemory, {section: array}, genre names)
+_ALNUM = np.zeros(256, bool)
+_ALNUM[np.frombuffer(b"0123456789abcdefghijklmnopqrstuvwxyz", np.uint8)] = True
+ALIGN = 64
+
+
+def shard_bounds(ids, shards):
+    """Split ascending `ids` into `shards` contiguous runs of (nearly) equal length."""
+    return np.linspace(0, len(ids), shards + 1).astype(np.int64)
+
+
+def cursor_key(cursor):
+    """Primeflix cursor "<tier>:<rank key>" -> shard key (see module comment)."""
+    tier, key = (int(v) for v in cursor.split(":"))
+    rating10 = -(key >> 32)
+    return (tier << _TIER_SHIFT) | ((100 - rating10) << 32) | (key & 0xFFFFFFFF)
+
+
+def to_cursor(key):
+    """Shard key -> Primeflix cursor."""
+    rating10 = 100 - ((key >> 32) & 0xFF)
+    return f"{key >> _TIER_SHIFT}:{(-rating10 << 32) | (key & 0xFFFFFFFF)}"
+
+
+def _pack(catalog, ids):
+    """{section: array} of one shard (see module comment)."""
+    titles = [catalog.value(int(i), "title").lower().encode() + b"\n" for i in ids]
+    blob = np.frombuffer(b"".join(titles), np.uint8)
+    starts = np.zeros(len(ids) + 1, np.int64)
+    np.cumsum([len(t) for t in titles], out=starts[1:])
+    # 8 bits for the rating in a key (see module comment); ratings are 0..10 (primeflix.ingest)
+    rating10 = np.clip(catalog.rating10[ids].astype(np.int64), 0, 100)
+    base = ((100 - rating10) << 32) | ids.astype(np.int64)
+    return {"blob": blob, "starts": starts, "base": base, "masks": catalog.genre_mask[ids],
+            "byte_counts": np.bincount(blob, minlength=256).astype(np.int64)}
+
+
+def _create(sections, genre_names):
+    """A new shared memory segment holding `sections`; returns (segment, layout)."""
+    layout, offset = {}, 0
+    for name, array in sections.items():
+        offset = -(-offset // ALIGN) * ALIGN
+        layout[name] = [array.dtype.str, offset, list(array.shape)]
+        offset += array.nbytes
+    segment = shared_memory.SharedMemory(create=True, size=offset + ALIGN)  # room for empty sections
+    for name, array in sections.items():
+        dtype, start, shape = layout[name]
+        np.ndarray(shape, np.dtype(dtype), segment.buf, start)[...] = array
+    return segment, json.dumps({"name": segment.name, "sections": layout, "genres": genre_names})
+
+
+def _attach(layouts, worker=False):
+    """Pool initializer: map every shard segment into this process."""
+    if worker:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C is for the parent, which shuts the pool down
+    for layout in layouts:
+        _open(layout)
+
+
+def _open(layout):
+    header = json.loads(layout)
+    if header["name"] not in _SEGMENTS:
+        segment = shared_memory.SharedMemory(name=header["name"])
+        arrays = {name: np.ndarray(shape, np.dtype(dtype), segment.buf, offset)
+                  for name, (dtype, offset, shape) in header["sections"].items()}
+        _SEGMENTS[header["name"]] = (segment, arrays, header["genres"])
+
+
+def _detach(name):
+    segment, arrays, _ = _SEGMENTS.pop(name, (None, None, None))
+    if segment is not None:
+        arrays.clear()  # views into segment.buf: drop them before closing it
+        segment.close()
+
+
+def search_shard(task):
+    """
+    Worker: (segment name, q, limit, after) -> (best `limit` keys > after,
+    ascending; matches in the shard; matches after the cursor).
+    """
+    name, q, limit, after = task
+    _, a, genres = _SEGMENTS[name]
+    keys = _shard_keys(a, genres, q)
+    total = len(keys)
+    if after is not None:
+        keys = keys[keys > after]
+    remaining = len(keys)
+    if limit is not None and len(keys) > limit:
+        keys = np.partition(keys, limit - 1)[:limit] if limit else keys[:0]
+    return np.sort(keys), total, remaining
+
+
+def _find(a, needle):
+    """Positions in the shard's blob where the bytes `needle` start."""
+    blob = a["blob"]
+    n = len(needle)
+    if not 0 < n <= len(blob):
+        return np.zeros(0, np.int64)
+    # start from the needle's rarest byte in this shard, then check the others
+    first = int(np.argmin(a["byte_counts"][needle]))
+    pos = np.flatnonzero(blob[first:len(blob) - n + 1 + first] == needle[first])
+    for k in range(n):
+        if k != first and len(pos):
+            pos = pos[blob[pos + k] == needle[k]]
+    return pos
+
+
+def _word_titles(a, word):
+    """Bool per shard title: `word` is one of its tokens (primeflix.search.tokenize)."""
+    blob, starts = a["blob"], a["starts"]
+    pos = _find(a, np.frombuffer(word.encode(), np.uint8))
+    before = np.where(pos > 0, blob[np.maximum(pos - 1, 0)], ord("\n"))
+    pos = pos[~_ALNUM[before] & ~_ALNUM[blob[pos + len(word)]]]
+    return np.bincount(np.searchsorted(starts, pos, "right") - 1, minlength=len(starts)).astype(bool)
+
+
+def _shard_keys(a, genres, q):
+    starts, base = a["starts"], a["base"]
+    n = len(q.encode())
+    titles = np.zeros(0, np.int64)
+    keys = np.zeros(0, np.int64)
+    pos = _find(a, np.frombuffer(q.encode(), np.uint8))
+    if len(pos):
+        # a title's first match decides exact / prefix; word as SearchIndex.tiers:
+        # every word of the query is a word of the title
+        owner = np.searchsorted(starts, pos, "right") - 1
+        titles, first_pos = np.unique(owner, return_index=True)
+        words = tokenize(q)
+        word = np.zeros(len(titles), bool)
+        if words:
+            word[:] = True
+            for w in words:
+                word &= _word_titles(a, w)[titles]
+        at_start = pos[first_pos] == starts[titles]
+        length = starts[titles + 1] - starts[titles] - 1
+        tier = np.full(len(titles), SUBSTRING, np.int64)
+        tier[word] = WORD
+        tier[at_start] = PREFIX
+        tier[at_start & (length == n)] = EXACT
+        keys = (tier << _TIER_SHIFT) | base[titles]
+    bits = np.uint64(sum(1 << bit for bit, g in enumerate(genres) if q in g.lower()))
+    if bits:
+        hit = (a["masks"] & bits) != 0
+        hit[titles] = False
+        keys = np.concatenate([keys, (np.int64(GENRE_MATCH) << _TIER_SHIFT) | base[hit]])
+    return keys
+
+
+class ShardedSearch:
+    """
+    Title / genre search over a Catalog split into `shards` shared memory
+    segments, scattered over a pool of `workers` processes (default: one per
+    shard, up to the CPU count; 0 = answer in this process). Re-partitions on
+    the first query after the catalog changes. close() (or exit) frees the segments.
+    """
+
+    def __init__(self, catalog, shards=None, workers=None):
+        self.catalog = catalog
+        self.shards = max(int(shards or os.cpu_count() or 1), 1)
+        self.workers = min(self.shards, os.cpu_count() or 1) if workers is None else workers
+        self.version = None
+        self._segments = []
+        self._layouts = []
+        self._pool = None
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)  # notified when a scatter ends
+        self._scattering = 0
+        self._at_exit = False  # close() registered with atexit while there are segments
+
+    def _build(self):
+        self._release()
+        with metrics.timer("index_build_seconds", index="shards"):
+            ids = self.catalog.ids()
+            bounds = shard_bounds(ids, self.shards)
+            for s in range(self.shards):
+                segment, layout = _create(_pack(self.catalog, ids[bounds[s]:bounds[s + 1]]),
+                                          list(self.catalog.genre_names))
+                self._segments.append(segment)
+                self._layouts.append(layout)
+            if self.workers:
+                self._pool = ProcessPoolExecutor(self.workers, initializer=_attach,
+                                                 initargs=(self._layouts, True))
+            else:
+                _attach(self._layouts)
+        self.version = self.catalog.version
+        if not self._at_exit:
+            atexit.register(self.close)
+            self._at_exit = True
+        log.info("Search split into %d shards (%.1f MB shared, %d workers)", self.shards,
+                 sum(s.size for s in self._segments) / 1e6, self.workers)
+
+    def build(self):
+        """Partition the catalog now instead of on the next query."""
+        with self._scatter():
+            pass
+
+    @contextmanager
+    def _scatter(self):
+        """
+        (segment names, pool) of the catalog as it is now. They stay up until
+        the block ends: a rebuild or close() waits for every scatter in flight.
+        """
+        with self._lock:
+            if self.version != self.catalog.version:
+                self._idle.wait_for(lambda: not self._scattering)
+                if self.version != self.catalog.version:
+                    self._build()
+            self._scattering += 1
+            names, pool = [s.name for s in self._segments], self._pool
+        try:
+            yield names, pool
+        finally:
+            with self._lock:
+                self._scattering -= 1
+                self._idle.notify_all()
+
+    def search(self, q, limit=20, cursor=None):
+        """
+        (ids, total, last, more) for normalized `q`, ranked like
+        Primeflix.search_page over tiers exact..genre: `last` is the cursor of
+        the last id (None if there are none), `more` whether matches follow it.
+        """
+        return self.search_many([q], limit, cursor)[0]
+
+    def search_many(self, queries, limit=20, cursor=None):
+        """search() for every query; all (query, shard) tasks are in flight at once."""
+        after = cursor_key(cursor) if cursor else None
+        with self._scatter() as (names, pool):
+            tasks = [(name, q, limit, after) for q in queries for name in names]
+            if pool is not None:
+                results = list(pool.map(search_shard, tasks, chunksize=max(1, len(tasks) // (self.workers * 4))))
+            else:
+                results = [search_shard(t) for t in tasks]
+        out = []
+        for i in range(len(queries)):
+            parts = results[i * len(names):(i + 1) * len(names)]
+            keys = np.concatenate([p[0] for p in parts])
+            if limit is not None and len(keys) > limit:
+                keys = np.partition(keys, limit - 1)[:limit] if limit else keys[:0]
+            keys = np.sort(keys)
+            out.append(([int(k) for k in keys & 0xFFFFFFFF], sum(p[1] for p in parts),
+                        to_cursor(int(keys[-1])) if len(keys) else None, sum(p[2] for p in parts) > len(keys)))
+        return out
+
+    @property
+    def nbytes(self):
+        return sum(s.size for s in self._segments)
+
+    def _release(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        for layout in self._layouts:
+            _detach(json.loads(layout)["name"])
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments, self._layouts = [], []
+        self.version = None
+
+    def close(self):
+        with self._lock:
+            self._idle.wait_for(lambda: not self._scattering)
+            self._release()
+            if self._at_exit:
+                atexit.unregister(self.close)  # or the instance lives until exit
+                self._at_exit = False
+
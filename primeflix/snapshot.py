@@ -0,0 +1,137 @@
+import argparse
+import json
+import mmap
+import os
+import time
+
+import numpy as np
+
+from primeflix.catalog import Catalog, PathTable, StringTable
+from primeflix.recommend import SimilarityIndex
+from primeflix.textsearch import TextIndex
+
+# --- Binary catalog snapshots ---
+#
+# One file that opens with a single mmap, instead of building the catalog from
+# Python literals at every start:
+#
+#   b"PRIMEFLX" | u64 header length | JSON header | arrays, each 64-byte aligned
+#
+# The header maps section names to [dtype, offset, count]: the catalog columns,
+# the title and description tables (blob + offsets), the poster paths
+# (directory and file name tables + a pair of ids per path) and optionally the
+# "More like this" table and the full-text index (primeflix.textsearch).
+# Description sections are optional on reading: files written before they
+# existed open with no descriptions. Sections become NumPy views on the mapping, so opening costs the same
+# for 100 or 1M movies, and pages are read only when touched. The mapping is
+# copy-on-write: edits to a loaded catalog never reach the file.
+
+MAGIC = b"PRIMEFLX"
+VERSION = 2
+ALIGN = 64
+COLUMNS = ("title_id", "image_id", "desc_id", "year", "rating10", "genre_mask", "alive")
+
+
+def save(catalog, path, similar=None, text=None):
+    """Write `catalog` (and optionally a SimilarityIndex and a TextIndex) to `path` atomically."""
+    sections = dict(catalog.columns())
+    for name, table in (("titles", catalog.titles), ("descriptions", catalog.descriptions)):
+        blob, offsets = table.pack()
+        sections[name + "_blob"] = np.frombuffer(blob, np.uint8)
+        sections[name + "_offsets"] = offsets
+    for name, array in catalog.images.sections().items():
+        sections["images_" + name] = array
+    if similar is not None:
+        sections["neighbours"] = similar.neighbours_table[:catalog.size]
+        sections["scores"] = similar.scores_table[:catalog.size]
+    if text is not None:
+        for name, array in text.sections().items():
+            sections["text_" + name] = array
+
+    header = {"version": VERSION, "genre_names": catalog.genre_names, "sections": {}}
+    offset = 0
+    for name, array in sections.items():
+        offset = -(-offset // ALIGN) * ALIGN
+        header["sections"][name] = [array.dtype.str, offset, list(array.shape)]
+        offset += array.nbytes
+    raw = json.dumps(header).encode()
+    base = -(-(len(MAGIC) + 8 + len(raw)) // ALIGN) * ALIGN
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC + len(raw).to_bytes(8, "little") + raw)
+        for name, array in sections.items():
+            f.seek(base + header["sections"][name][1])
+            f.write(np.ascontiguousarray(array).tobytes())
+    os.replace(tmp, path)
+
+
+class Snapshot:
+    """An opened snapshot file: .catalog, .similar and .text (None if the file has no such table)."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a PRIMEFLIX snapshot")
+        size = int.from_bytes(self._map[len(MAGIC):len(MAGIC) + 8], "little")
+        start = len(MAGIC) + 8
+        header = json.loads(self._map[start:start + size])
+        if header["version"] != VERSION:
+            raise ValueError(f"{path}: snapshot version {header['version']}, expected {VERSION}")
+        self._base = -(-(start + size) // ALIGN) * ALIGN
+        self._sections = header["sections"]
+
+        descriptions = None
+        if "descriptions_blob" in self._sections:
+            descriptions = StringTable.from_packed(self._array("descriptions_blob"),
+                                                   self._array("descriptions_offsets"))
+        self.catalog = Catalog.from_columns(
+            {name: self._array(name) for name in COLUMNS if name in self._sections},
+            StringTable.from_packed(self._array("titles_blob"), self._array("titles_offsets")),
+            PathTable.from_sections(lambda name: self._array("images_" + name)),
+            header["genre_names"], descriptions)
+        self.similar = None
+        if "neighbours" in self._sections:
+            self.similar = SimilarityIndex(self._array("neighbours"), self._array("scores"))
+        self.text = None
+        if "text_indptr" in self._sections:
+            self.text = TextIndex.from_sections(lambda name: self._array("text_" + name))
+
+    def _array(self, name):
+        dtype, offset, shape = self._sections[name]
+        count = int(np.prod(shape))
+        if count == 0:  # may sit past the end of the file: nothing was written for it
+            return np.zeros(shape, np.dtype(dtype))
+        return np.frombuffer(self._map, np.dtype(dtype), count, self._base + offset).reshape(shape)
+
+
+def load(path):
+    return Snapshot(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a binary catalog snapshot for fast startup.")
+    parser.add_argument("out", help="snapshot file to write (e.g. catalog.pfx)")
+    parser.add_argument("--synthetic", type=int, metavar="N", help="N generated movies instead of the bundled list")
+    parser.add_argument("--no-similar", action="store_true", help="leave out the 'More like this' table")
+    parser.add_argument("--no-text", action="store_true", help="leave out the full-text (description) index")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.synthetic:
+        from primeflix.synthetic import synthetic_catalog
+        catalog = synthetic_catalog(args.synthetic, descriptions=True)
+    else:
+        from primeflix.movies import bundled_catalog
+        catalog = bundled_catalog()
+    similar = None if args.no_similar else SimilarityIndex.build(catalog, k=10)
+    text = None if args.no_text else TextIndex.build(catalog)
+    save(catalog, args.out, similar, text)
+    print(f"{len(catalog)} movies -> {args.out} ({os.path.getsize(args.out) / 1e6:.1f} MB) "
+          f"in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
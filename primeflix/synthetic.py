@@ -0,0 +1,111 @@
+import numpy as np
+
+from primeflix.catalog import Catalog
+
+# --- Synthetic catalogs for benchmarks ---
+#
+# Genre shares, year spread and rating curve are loosely modelled on the real
+# MOVIES list: lots of Drama/Thriller/Action/Comedy, few Music/Biography, most
+# titles from the last 25 years, ratings around 6.5-7.
+
+GENRE_WEIGHTS = {
+    "Drama": 0.26, "Thriller": 0.14, "Action": 0.11, "Comedy": 0.11, "Romance": 0.09,
+    "Horror": 0.04, "Mystery": 0.04, "Crime": 0.04, "Sci-Fi": 0.03, "Fantasy": 0.03,
+    "Family": 0.03, "Biography": 0.02, "Music": 0.02, "Animation": 0.02, "Adventure": 0.02,
+}
+GENRES = list(GENRE_WEIGHTS)
+
+_SYLLABLES = ["ka", "ra", "ma", "dhi", "lu", "shy", "am", "ba", "hu", "ri", "na", "ti", "vi", "ja",
+              "ya", "pre", "mam", "dri", "sai", "rat", "kum", "bal", "an", "gi", "ni", "tha", "la",
+              "sur", "ya", "pot", "tru", "dan", "gal", "raa", "zi", "joh", "ki", "sha", "de", "vo"]
+_WORDS = ["The", "Return", "Night", "Days", "Story", "Love", "City", "War", "Last", "Secret",
+          "Journey", "Legend", "House", "Rise", "King", "2", "Part", "Dreams", "Road", "Rain"]
+
+
+def title_queries(pairs=12):
+    """Search queries that hit synthetic titles: every syllable and word, plus pairs of the first `pairs` syllables."""
+    return sorted(set(_SYLLABLES + [w.lower() for w in _WORDS] +
+                      [a + b for a in _SYLLABLES[:pairs] for b in _SYLLABLES[:pairs]]))
+
+
+def description_words():
+    """Every word synthetic descriptions are made of (see synthetic_descriptions)."""
+    return sorted(set(" ".join(_GENRE_WORDS.values()).split() + _PLOT_WORDS))
+
+
+def synthetic_titles(n, rng):
+    """Pseudo-transliterated titles: 1-3 words of 2-4 syllables, some English words mixed in."""
+    syl = np.array(_SYLLABLES)
+    words = np.array(_WORDS)
+    n_words = rng.choice([1, 2, 3], size=n, p=[0.45, 0.4, 0.15])
+    titles = []
+    for count in n_words:
+        parts = []
+        for _ in range(count):
+            if rng.random() < 0.25:
+                parts.append(str(words[rng.integers(len(words))]))
+            else:
+                parts.append("".join(syl[rng.integers(len(syl), size=rng.integers(2, 5))]).capitalize())
+        titles.append(" ".join(parts))
+    return titles
+
+
+def synthetic_columns(n, seed=0):
+    """Column arrays for `n` random movies: titles, years, ratings, genre masks (bits = GENRES)."""
+    rng = np.random.default_rng(seed)
+    titles = synthetic_titles(n, rng)
+    # most films are recent: 1950 + 75 * beta(4, 1.5)
+    years = (1950 + 75 * rng.beta(4, 1.5, size=n)).astype(np.int16)
+    ratings = np.clip(np.round(rng.normal(6.6, 1.1, size=n), 1), 1.0, 10.0)
+    p = np.array(list(GENRE_WEIGHTS.values()))
+    p = p / p.sum()
+    n_genres = rng.choice([1, 2, 3], size=n, p=[0.3, 0.5, 0.2])
+    masks = np.zeros(n, np.uint64)
+    for extra in range(3):
+        picked = rng.choice(len(GENRES), size=n, p=p).astype(np.uint64)
+        masks |= np.where(n_genres > extra, np.uint64(1) << picked, np.uint64(0))
+    return titles, years, ratings, masks
+
+
+# ten plot words per genre (its own name included) plus thirty shared ones
+_GENRE_WORDS = {
+    "Drama": "drama family struggle dreams father mother sacrifice village society tears",
+    "Thriller": "thriller revenge murder conspiracy hostage killer chase secret police escape",
+    "Action": "action fight gangster mission army battle hero smuggler mafia rescue",
+    "Comedy": "comedy friends wedding prank confusion roommates hilarious neighbours trip bet",
+    "Romance": "romance love wedding heart college couple letters proposal monsoon first",
+    "Horror": "horror ghost haunted curse spirit forest night possessed mansion ritual",
+    "Mystery": "mystery detective disappearance clue secret island investigation past twist diary",
+    "Crime": "crime police heist drugs underworld lawyer corruption inspector court gang",
+    "Sci-Fi": "scifi space future robot time experiment planet scientist alien machine",
+    "Fantasy": "fantasy kingdom magic prince sword legend curse dragon prophecy queen",
+    "Family": "family children grandfather festival home vacation dog school brothers sisters",
+    "Biography": "biography life true story athlete freedom leader champion career legend",
+    "Music": "music singer band song concert musician guitar stage voice dance",
+    "Animation": "animation animals adventure forest friendship talking toys magic journey kids",
+    "Adventure": "adventure treasure jungle expedition map island journey mountain quest sea",
+}
+_PLOT_WORDS = ("young man woman city town village small life past world journey home years "
+               "old new friend brother sister son daughter group lives changes must finds "
+               "after when story against").split()
+
+
+def synthetic_descriptions(masks, rng, length=(12, 30)):
+    """One pseudo-synopsis per movie: words of its first genre mixed with everyday plot words."""
+    pools = np.array([_GENRE_WORDS[g].split() + _PLOT_WORDS for g in GENRES], dtype=object)
+    first = np.zeros(len(masks), np.int64)
+    for bit in reversed(range(len(GENRES))):
+        first[(masks >> np.uint64(bit)) & np.uint64(1) == 1] = bit
+    lengths = rng.integers(length[0], length[1] + 1, size=len(masks))
+    words = pools[np.repeat(first, lengths), rng.integers(pools.shape[1], size=int(lengths.sum()))].tolist()
+    ends = np.cumsum(lengths).tolist()
+    return [" ".join(words[end - count:end]).capitalize() + "."
+            for end, count in zip(ends, lengths.tolist())]
+
+
+def synthetic_catalog(n, seed=0, descriptions=False):
+    titles, years, ratings, masks = synthetic_columns(n, seed)
+    catalog = Catalog(capacity=n)
+    text = synthetic_descriptions(masks, np.random.default_rng(seed + 1)) if descriptions else None
+    catalog.extend_columns(titles, years, ratings, masks, GENRES, descriptions=text)
+    return catalog
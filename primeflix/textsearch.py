@@ -0,0 +1,159 @@
+import re
+from array import array
+from collections import Counter
+
+import numpy as np
+
+from primeflix.catalog import StringTable
+
+# --- Full-text search over titles and descriptions (BM25) ---
+#
+# Built offline (written into catalog snapshots, or built by the core on first
+# use) as a term x movie sparse matrix in CSR form: for term t,
+# docs[indptr[t]:indptr[t + 1]] are the movies containing it, ascending, and
+# weights[...] their BM25 weights with the idf folded in:
+#
+#   w(t, d) = idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(d) / avg_len))
+#
+# A query is a sparse vector of term counts; its scores are the sparse
+# matrix-vector product over just the query's rows (one np.bincount with
+# weights), then np.argpartition picks the top k. Title words count TITLE_BOOST
+# times. Everything is local: words and counts, no model.
+
+_WORD = re.compile(r"\w+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have he her his in into is it its of on or s she so t "
+    "that the their them they this to was were who whose with".split())
+TITLE_BOOST = 2
+K1, B = 1.2, 0.75
+
+
+def analyze(text):
+    """Index terms of `text`: lowercase words without stopwords, a plural "s" folded ("villages" -> "village")."""
+    terms = []
+    for word in _WORD.findall(text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        terms.append(word)
+    return terms
+
+
+class TextIndex:
+    """
+    BM25 index over a Catalog's titles and descriptions. build() makes one;
+    sections() / from_sections() are the snapshot form. Movies added after the
+    build are not in it; removed ones are filtered out by search(allowed=...).
+    """
+
+    def __init__(self, terms, indptr, docs, weights, n_docs, version=None):
+        self.terms = terms        # StringTable: term id -> term
+        self.indptr = indptr      # int64, len = terms + 1
+        self.docs = docs          # int32 movie ids
+        self.weights = weights    # float32
+        self.n_docs = n_docs
+        self.version = version    # catalog.text_version it was built from (None: loaded)
+        self._term_id = None
+
+    @classmethod
+    def build(cls, catalog, k1=K1, b=B):
+        version, n = catalog.text_version, catalog.size  # as of the start: a later edit makes it stale
+        vocab = {}
+        doc_of, term_of = array("i"), array("i")
+        for i in range(n):
+            if not catalog.alive[i]:
+                continue
+            terms = analyze(catalog.value(i, "title")) * TITLE_BOOST
+            description = catalog.value(i, "description")
+            if description:
+                terms += analyze(description)
+            term_of.extend([vocab.setdefault(t, len(vocab)) for t in terms])
+            doc_of.extend([i] * len(terms))
+        doc = np.frombuffer(doc_of, np.int32)
+        term = np.frombuffer(term_of, np.int32)
+
+        # one (term, doc) pair per posting, term-major, with its count
+        pairs, tf = np.unique(term.astype(np.int64) * max(n, 1) + doc, return_counts=True)
+        t, d = pairs // max(n, 1), pairs % max(n, 1)
+        df = np.bincount(t, minlength=len(vocab))
+        doc_len = np.bincount(doc, minlength=n)
+        live = max(int(np.count_nonzero(catalog.alive[:n])), 1)
+        avg_len = max(len(doc) / live, 1.0)
+        idf = np.log1p((live - df + 0.5) / (df + 0.5))
+        weights = idf[t] * tf * (k1 + 1) / (tf + k1 * (1 - b + b * doc_len[d] / avg_len))
+
+        terms = StringTable()
+        for word in vocab:
+            terms.intern(word)
+        indptr = np.zeros(len(vocab) + 1, np.int64)
+        np.cumsum(df, out=indptr[1:])
+        index = cls(terms, indptr, d.astype(np.int32), weights.astype(np.float32), n, version)
+        index._term_id = vocab
+        return index
+
+    @classmethod
+    def from_sections(cls, get):
+        """Index over arrays from a snapshot: get(name) for every name in sections()."""
+        terms = StringTable.from_packed(get("terms_blob"), get("terms_offsets"))
+        return cls(terms, get("indptr"), get("docs"), get("weights"), int(get("n_docs")[0]))
+
+    def sections(self):
+        """{name: array} as stored in snapshots."""
+        blob, offsets = self.terms.pack()
+        return {"terms_blob": np.frombuffer(blob, np.uint8), "terms_offsets": offsets, "indptr": self.indptr,
+                "docs": self.docs, "weights": self.weights, "n_docs": np.array([self.n_docs], np.int64)}
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.docs.nbytes + self.weights.nbytes + self.terms.nbytes()
+
+    def term_id(self, term):
+        if self._term_id is None:
+            self._term_id = {self.terms[i]: i for i in range(len(self.terms))}
+        return self._term_id.get(term)
+
+    def search(self, query, k=20, allowed=None):
+        """
+        (ids, scores) of the best `k` movies for `query` (k=None: all that match
+        any term), best first, ties by id. Only ids where the bool array
+        `allowed` is True count (e.g. Catalog.alive).
+        """
+        rows = [(self.term_id(t), count) for t, count in Counter(analyze(query)).items()]
+        rows = [(t, count) for t, count in rows if t is not None]
+        if not rows or (k is not None and k <= 0):
+            return np.zeros(0, np.int64), np.zeros(0, np.float32)
+        docs = np.concatenate([self.docs[self.indptr[t]:self.indptr[t + 1]] for t, _ in rows])
+        weights = np.concatenate([self.weights[self.indptr[t]:self.indptr[t + 1]] * np.float32(count)
+                                  if count > 1 else self.weights[self.indptr[t]:self.indptr[t + 1]]
+                                  for t, count in rows])
+        if len(docs) * 16 < self.n_docs:
+            ids, slot = np.unique(docs, return_inverse=True)  # few postings: accumulate per distinct id
+            scores = np.bincount(slot, weights)
+            if allowed is not None:
+                keep = allowed[ids]
+                ids, scores = ids[keep], scores[keep]
+        else:
+            scores = np.bincount(docs, weights, minlength=self.n_docs)
+            if allowed is not None:
+                scores[~allowed[:self.n_docs]] = 0
+            ids = np.flatnonzero(scores >= self._floor(scores, k))
+            scores = scores[ids]
+        if k is not None and len(ids) > k:
+            kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+            top = np.flatnonzero(scores >= kth)  # every tie of the k-th stays, so ties are cut by id
+            ids, scores = ids[top], scores[top]
+        order = np.lexsort((ids, -scores))[:k]
+        return ids[order].astype(np.int64), scores[order].astype(np.float32)
+
+    @staticmethod
+    def _floor(scores, k, stride=16):
+        """
+        A score every top-k hit reaches: the k-th best of every `stride`-th score
+        can't beat the k-th best overall. Keeps the final selection small when
+        most movies match.
+        """
+        if k is None or k * stride * 4 > len(scores):
+            return np.nextafter(0, 1)
+        sample = scores[::stride]
+        return max(np.partition(sample, len(sample) - k)[len(sample) - k], np.nextafter(0, 1))
@@ -0,0 +1,57 @@
+import os
+
+import pytest
+
+from primeflix.atlas import open_atlas, write_atlas
+from primeflix.catalog import Catalog
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _poster(path, color):
+    Image.new("RGB", (60, 90), color).save(path, quality=95)
+    return path
+
+
+def _catalog(paths):
+    return Catalog.from_dicts([{"title": f"Movie {i}", "year": 2000, "rating": 7.0, "genres": ["Drama"], "image": p}
+                               for i, p in enumerate(paths)])
+
+
+def test_movies_sharing_a_poster(tmp_path):
+    red = _poster(str(tmp_path / "red.jpg"), (255, 0, 0))
+    blue = _poster(str(tmp_path / "blue.jpg"), (0, 0, 255))
+    green = _poster(str(tmp_path / "green.jpg"), (0, 255, 0))
+    paths = [red, red, blue, green]  # 4 movies, 3 distinct posters
+    out = str(tmp_path / "posters.atlas")
+    report = write_atlas(_catalog(paths), out, workers=1)
+    assert report.processed == 3 and not report.failures  # one job per source
+
+    atlas = open_atlas(out)
+    for movie_id, path in enumerate(paths):
+        assert atlas.source(movie_id) == os.path.abspath(path)
+        img = atlas.get(movie_id, (200, 300), source=path)
+        assert img is not None and img.size == (200, 300)
+    assert atlas.get(3, (200, 300)).getpixel((100, 150))[1] > 200  # green, not another movie's poster
+    assert atlas.read(0, (200, 300)).tobytes() == atlas.read(1, (200, 300)).tobytes()
+    assert atlas.index[0, 0, 0] == atlas.index[1, 0, 0]  # stored once
+    atlas.close()
+
+    # incremental rebuild reuses every poster, also with a pool
+    report = write_atlas(_catalog(paths + [blue]), out, workers=2)
+    assert report.unchanged == 3 and report.processed == 0
+    atlas = open_atlas(out)
+    assert atlas.get(4, (200, 300), source=blue).getpixel((100, 150))[2] > 200
+    atlas.close()
+
+
+def test_replaced_source_is_not_served(tmp_path):
+    path = _poster(str(tmp_path / "p.jpg"), (255, 0, 0))
+    out = str(tmp_path / "posters.atlas")
+    write_atlas(_catalog([path]), out, workers=1)
+    atlas = open_atlas(out)
+    assert atlas.get(0, (200, 300), source=path) is not None
+    _poster(path, (0, 0, 255))
+    os.utime(path, (1, 1))  # same path, different mtime
+    assert atlas.get(0, (200, 300), source=path) is None
+    atlas.close()
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from primeflix import facets
+from primeflix.core import Primeflix
+from primeflix.facets import FacetIndex, count_bits, from_bitset, popcount, to_bitset
+from primeflix.synthetic import synthetic_catalog
+
+QUERIES = [
+    {},
+    {"genres": ["Drama"]},
+    {"genres": ["Drama", "Romance"], "years": (1990, None)},
+    {"genres": ["Music"], "min_rating": 6.0, "max_rating": 7.5},
+    {"any_genres": ["Horror", "Mystery"], "years": (2000, 2010)},
+    {"genres": ["Crime"], "any_genres": ["Action", "Thriller"], "max_rating": 6.9},
+    {"genres": ["Western"]},
+    {"any_genres": ["Western"]},
+]
+
+
+def test_bitset_round_trip():
+    rng = np.random.default_rng(3)
+    for n in (1, 63, 64, 65, 1000):
+        flags = rng.random(n) < 0.3
+        words = to_bitset(flags)
+        assert len(words) == -(-n // 64)
+        assert from_bitset(words, n).tolist() == np.flatnonzero(flags).tolist()
+        assert count_bits(words) == int(flags.sum())
+        assert popcount(words).tolist() == [bin(int(w)).count("1") for w in words]
+
+
+def _expected(cat, ids):
+    genres, decades, ratings = {}, {}, {}
+    for i in ids:
+        for g in cat.mask_to_genres(cat.genre_mask[i]):
+            genres[g] = genres.get(g, 0) + 1
+        decade = int(cat.year[i]) // 10 * 10
+        decades[decade] = decades.get(decade, 0) + 1
+        stars = int(cat.rating10[i]) // 10
+        ratings[stars] = ratings.get(stars, 0) + 1
+    return genres, decades, ratings
+
+
+@pytest.mark.parametrize("posting_path", [0, 1])   # bitsets only / id lists whenever a genre is required
+def test_query_matches_catalog_mask(monkeypatch, posting_path):
+    monkeypatch.setattr(facets, "_POSTING_PATH", posting_path)
+    cat = synthetic_catalog(5000)
+    for movie_id in range(0, 5000, 7):
+        cat.remove(movie_id)
+    index = FacetIndex(cat)
+    cat.subscribe(index.catalog_changed)
+    for filters in QUERIES:
+        result = index.query(**filters)
+        want = cat.where(**filters)
+        assert result.ids.tolist() == want.tolist(), filters
+        assert (result.genres, result.decades, result.ratings) == _expected(cat, want), filters
+
+
+def test_counts_follow_catalog_changes():
+    cat = synthetic_catalog(500)
+    index = FacetIndex(cat)
+    cat.subscribe(index.catalog_changed)
+    before = index.query(genres=["Drama"]).total
+    cat.append({"title": "Ekam", "year": 2020, "rating": 7.0, "genres": ["Drama", "Western"]})
+    assert index.query(genres=["Drama"]).total == before + 1
+    assert index.query(genres=["Western"]).genres == {"Drama": 1, "Western": 1}
+
+
+def test_browse_pages_best_rated_first():
+    core = Primeflix(synthetic_catalog(3000))
+    full = core.browse(genres=["Thriller"], limit=None)
+    ids = core.catalog.where(genres=["Thriller"])
+    order = sorted(ids.tolist(), key=lambda i: (-int(core.catalog.rating10[i]), i))
+    assert full.ids == order and full.total == len(order)
+    page = core.browse(genres=["Thriller"], limit=25, offset=50)
+    assert page.ids == order[50:75] and page.facets == full.facets
@@ -0,0 +1,48 @@
+from primeflix.catalog import Catalog
+from primeflix.favourites import FavouritesStore
+
+MOVIES = [
+    {"title": "Heat", "year": 1995, "rating": 8.3, "genres": ["Crime"]},
+    {"title": "Alien", "year": 1979, "rating": 8.5, "genres": ["Horror"]},
+    {"title": "Heat", "year": 1986, "rating": 5.5, "genres": ["Action"]},
+    {"title": "Drishyam", "year": 2013, "rating": 8.2, "genres": ["Thriller"]},
+]
+
+
+def test_favourites_follow_movies_not_rows(tmp_path):
+    path = str(tmp_path / "favourites.db")
+    store = FavouritesStore(Catalog.from_dicts(MOVIES), path, flush_interval=0)
+    favs = store.profile("ana")
+    for movie_id in (3, 0, 1):
+        favs.add(movie_id)
+    favs.remove(1)
+    store.close()
+
+    # rebuilt in another order, one title re-cased, one movie gone
+    moved = [MOVIES[1], dict(MOVIES[3], title="DRISHYAM"), MOVIES[2], MOVIES[0]]
+    catalog = Catalog.from_dicts(moved)
+    store = FavouritesStore(catalog, path, flush_interval=0)
+    assert [catalog.value(i, "title") for i in store.profile("ana")] == ["DRISHYAM", "Heat"]
+    assert list(store.profile("ana")) == [1, 3]
+    store.close()
+
+    catalog.remove(3)
+    store = FavouritesStore(catalog, path, flush_interval=0)
+    assert list(store.profile("ana")) == [1]
+    store.close()
+
+
+def test_duplicates_are_one_favourite(tmp_path):
+    path = str(tmp_path / "favourites.db")
+    catalog = Catalog.from_dicts(MOVIES + [dict(MOVIES[0], title="heat.")])  # id 4: same movie as 0
+    store = FavouritesStore(catalog, path, flush_interval=0)
+    favs = store.profile()
+    assert favs.add(4) and not favs.add(0)
+    assert favs.remove(4) and favs.add(0)
+    store.close()
+    store.close()
+    assert store.flush(timeout=1)
+
+    store = FavouritesStore(catalog, path, flush_interval=0)
+    assert list(store.profile()) == [0]
+    store.close()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from primeflix.collab import ImplicitALS, Interactions
+from primeflix.core import Primeflix
+from primeflix.feed import Feed, similarity
+from primeflix.synthetic import synthetic_catalog
+
+
+def test_favourites_added_after_the_tables_were_built():
+    catalog = synthetic_catalog(300)
+    rng = np.random.default_rng(0)
+    model = ImplicitALS(factors=4, iterations=2).fit(
+        Interactions.from_pairs(rng.integers(0, 20, 400), rng.integers(0, 300, 400), n_items=300))
+    core = Primeflix(catalog, collab=model)
+    core.similar_index
+    new_id = catalog.append({"title": "Newcomer", "year": 2020, "rating": 7.0, "genres": ["Drama"]})
+    page = core.feed_page([new_id, 5], limit=20)
+    assert len(page.ids) == 20 and new_id not in page.ids and 5 not in page.ids
+    assert page.total == catalog.size - 2
+
+
+def _adjacent_similarity(catalog, ids):
+    ids = np.asarray(ids)
+    masks, years = catalog.genre_mask[ids], catalog.year[ids].astype(np.float32)
+    return np.mean([similarity(masks[i], years[i], masks[i + 1:i + 2], years[i + 1:i + 2])[0]
+                    for i in range(len(ids) - 1)])
+
+
+def test_similarity_bounds():
+    masks = np.array([0b011, 0b011, 0b100], np.uint64)
+    years = np.array([2000, 2000, 1950], np.float32)
+    sims = similarity(masks[0], years[0], masks, years)
+    assert sims[0] == pytest.approx(1.0) and 0 < sims[2] < 0.1
+
+
+def test_neighbours_differ_more_than_in_score_order():
+    catalog = synthetic_catalog(3000)
+    scores = catalog.rating10[:catalog.size].astype(np.float32)
+    plain = Feed(catalog, scores, lam=1.0).page(0, 200)
+    by_score = np.lexsort((np.arange(len(scores)), -scores))[:200]
+    assert plain == by_score.tolist()
+    mixed = Feed(catalog, scores).page(0, 200)
+    assert _adjacent_similarity(catalog, mixed) < 0.8 * _adjacent_similarity(catalog, plain)
+    assert np.mean(scores[mixed]) > np.mean(scores)  # still the better rated part of the catalog
+
+
+def test_pages_are_one_fixed_order():
+    catalog = synthetic_catalog(2000)
+    scores = catalog.rating10[:catalog.size].astype(np.float32)
+    scores[::10] = -np.inf  # e.g. favourites
+    whole = Feed(catalog, scores, diverse=300, pool_size=64).page(0, None)
+    assert len(whole) == len(set(whole)) == 1800 and not set(whole) & set(range(0, 2000, 10))
+    feed = Feed(catalog, scores, diverse=300, pool_size=64)
+    paged = []
+    for offset in range(0, 1800, 170):
+        paged += feed.page(offset, 170)
+    assert paged == whole and feed.page(50, 20) == whole[50:70]
@@ -0,0 +1,46 @@
+import random
+
+from primeflix.catalog import Catalog
+from primeflix.core import Primeflix
+from primeflix.fuzzy import FuzzyIndex, distances, fold, max_edits
+
+
+def _levenshtein(a, b):
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+def test_vectorized_distances_match_levenshtein():
+    rng = random.Random(0)
+    words = ["".join(rng.choice("abcde") for _ in range(rng.randint(1, 9))) for _ in range(200)]
+    for a in words[:20]:
+        assert distances(a, words).tolist() == [_levenshtein(a, b) for b in words]
+
+
+def test_transliterations_fold_together():
+    assert fold("bahuballi") == fold("baahubali") == "bahubali"
+    assert max_edits("ram") == 0 and max_edits("drishym") == 2 and max_edits("drisym") == 1
+
+
+def test_lookup_keeps_to_the_edit_budget():
+    index = FuzzyIndex()
+    for word in ("drishyam", "dreams", "drive", "bahubali"):
+        index.add(word)
+    assert index.lookup("drishym") == {"drishyam": 1}
+    assert index.lookup("baahubali") == {"bahubali": 0}
+    assert index.lookup("drv") == {}  # too short for any typo
+
+
+def test_typo_tiers_rank_after_real_matches():
+    core = Primeflix(Catalog.from_dicts([
+        {"title": "Drishyam", "year": 2013, "rating": 8.2, "genres": ["Thriller"]},
+        {"title": "Drishyam 2", "year": 2021, "rating": 8.4, "genres": ["Thriller"]},
+        {"title": "Drishym Diaries", "year": 2020, "rating": 3.0, "genres": ["Drama"]},
+    ]))
+    # "drishym" is a substring of id 2; the two Drishyams are one edit away, best rated first
+    assert core.search_page("drishym", 10).ids == [2, 1, 0]
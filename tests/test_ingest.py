@@ -0,0 +1,15 @@
+from primeflix.catalog import MAX_GENRES, Catalog
+from primeflix.ingest import Ingestor
+
+
+def test_rejected_record_adds_no_genres():
+    catalog = Catalog.from_dicts([{"title": "Filler", "year": 2000, "rating": 5.0,
+                                   "genres": [f"g{i}" for i in range(MAX_GENRES - 1)]}])
+    report = Ingestor(catalog).run([
+        {"title": "Heat", "year": 1995, "rating": 8.3, "genres": ["g0", "Crime", "Heist"]},  # one bit left
+        {"title": "Alien", "year": 1979, "rating": 8.5, "genres": ["g1", "Horror"]},
+    ])
+    assert report.accepted == 1 and sum(report.rejected.values()) == 1
+    assert len(catalog.genre_names) == MAX_GENRES
+    assert "Crime" not in catalog.genre_names and "Horror" in catalog.genre_names
+    assert catalog.value(1, "genres") == ["g1", "Horror"]
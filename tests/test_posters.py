@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+from primeflix.catalog import Catalog
+from primeflix.posters import PosterPipeline
+
+Image = pytest.importorskip("PIL.Image")
+
+
+def _poster(path, color):
+    Image.new("RGB", (60, 90), color).save(path)
+    return str(path)
+
+
+def test_one_version_bump_and_one_job_per_output(tmp_path):
+    red = _poster(tmp_path / "red.png", (255, 0, 0))
+    blue = _poster(tmp_path / "blue.png", (0, 0, 255))
+    catalog = Catalog.from_dicts([
+        {"title": "Heat", "year": 1995, "rating": 8.3, "genres": ["Crime"], "image": red},
+        {"title": "Heat", "year": 1995, "rating": 8.3, "genres": ["Crime"], "image": red},  # same file out
+        {"title": "Alien", "year": 1979, "rating": 8.5, "genres": ["Horror"], "image": blue},
+        {"title": "Alien", "year": 1979, "rating": 8.5, "genres": ["Horror"], "image": red},  # clashes
+    ])
+    version = catalog.version
+    dest = tmp_path / "out"
+    report = PosterPipeline(str(dest), size=(20, 30), workers=1).run(list(catalog))
+    assert report.processed == 2
+    assert [f["title"] for f in report.failures] == ["Alien"]
+    assert catalog.version == version + 1
+    heat = catalog.value(0, "image")
+    assert heat == catalog.value(1, "image") and os.path.dirname(heat) == str(dest)
+    assert catalog.value(3, "image") == red
+    assert sorted(os.listdir(dest)) == sorted([os.path.basename(heat), os.path.basename(catalog.value(2, "image")),
+                                               "manifest.json"])
@@ -0,0 +1,63 @@
+from primeflix.catalog import Catalog
+from primeflix.core import Primeflix, QueryCache
+
+
+class Value:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+
+def _catalog():
+    return Catalog.from_dicts([{"title": "Heat", "year": 1995, "rating": 8.3, "genres": ["Crime"]}])
+
+
+def test_least_recently_used_goes_first():
+    cat = _catalog()
+    cache = QueryCache(cat, max_entries=2)
+    a, b, c = Value(1), Value(1), Value(1)
+    cache.put("a", a, cat.version)
+    cache.put("b", b, cat.version)
+    assert cache.get("a") is a          # "b" is now the oldest
+    cache.put("c", c, cat.version)
+    assert cache.get("b") is None
+    assert cache.get("a") is a and cache.get("c") is c
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_bound():
+    cat = _catalog()
+    cache = QueryCache(cat, max_entries=100, max_bytes=100)
+    for i in range(4):
+        cache.put(i, Value(40), cat.version)
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["bytes"] == 80 and stats["evictions"] == 2
+    assert cache.get(0) is None and cache.get(3) is not None
+    cache.put("big", Value(101), cat.version)     # never fits: not stored, nothing evicted
+    assert cache.get("big") is None and cache.stats()["entries"] == 2
+    cache.put(3, Value(10), cat.version)          # replacing an entry frees its old size
+    assert cache.stats()["bytes"] == 50
+
+
+def test_catalog_change_drops_everything():
+    cat = _catalog()
+    cache = QueryCache(cat)
+    version = cat.version
+    cache.put("heat", Value(8), version)
+    cat.append({"title": "Heatwave", "year": 2001, "rating": 5.0, "genres": ["Drama"]})
+    assert cache.get("heat") is None
+    assert cache.stats()["invalidations"] == 1 and cache.stats()["bytes"] == 0
+    cache.put("heat", Value(8), version)          # computed before the change
+    assert cache.get("heat") is None
+    cache.put("heat", Value(8), cat.version)
+    assert cache.get("heat") is not None
+
+
+def test_search_results_are_cached_until_the_catalog_changes():
+    core = Primeflix(_catalog())
+    core.warm_up().join()  # results are cached once the description tier exists
+    assert core.search_page("heat", 10).ids == [0]
+    hits = core.query_cache.hits
+    assert core.search_page("heat", 10).ids == [0]
+    assert core.query_cache.hits == hits + 1
+    core.catalog.append({"title": "Heatwave", "year": 2001, "rating": 5.0, "genres": ["Drama"]})
+    assert core.search_page("heat", 10).ids == [0, 1]
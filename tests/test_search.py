@@ -0,0 +1,43 @@
+import pytest
+
+from primeflix.catalog import Catalog
+from primeflix.core import Primeflix, _parse_cursor
+from primeflix.synthetic import synthetic_catalog
+
+MOVIES = [
+    {"title": "Heat", "year": 1995, "rating": 8.3, "genres": ["Crime"]},                # exact
+    {"title": "Heatwave", "year": 2001, "rating": 5.0, "genres": ["Drama"]},            # prefix
+    {"title": "Heat Lightning", "year": 1934, "rating": 6.5, "genres": ["Drama"]},      # prefix, better rated
+    {"title": "The Heat", "year": 2013, "rating": 6.6, "genres": ["Comedy"]},           # word
+    {"title": "Wheatfield", "year": 1999, "rating": 9.0, "genres": ["Drama"]},          # substring
+    {"title": "Cold", "year": 2000, "rating": 7.0, "genres": ["Heat Drama"]},           # genre only
+]
+
+
+def test_tiers_then_rating_then_id():
+    core = Primeflix(Catalog.from_dicts(MOVIES))
+    assert core.search_page("HEAT ", 10).ids == [0, 2, 1, 3, 4, 5]
+
+
+def test_pages_follow_the_cursor_to_the_end():
+    core = Primeflix(synthetic_catalog(3000))
+    full = core.search_page("ka", None)
+    for limit in (1, 7, 100):
+        ids, cursor = [], None
+        while True:
+            page = core.search_page("ka", limit, cursor)
+            assert page.total == full.total and len(page.ids) <= limit
+            ids += page.ids
+            cursor = page.cursor
+            if cursor is None:
+                break
+        assert ids == full.ids and len(set(ids)) == full.total
+
+
+def test_cursor_is_checked():
+    assert _parse_cursor("3:-42") == (3, -42)
+    with pytest.raises(ValueError):
+        _parse_cursor("page-2")
+    core = Primeflix(Catalog.from_dicts(MOVIES))
+    assert core.search_page("heat", 2).cursor is not None
+    assert core.search_page("heat", 6).cursor is None  # last page
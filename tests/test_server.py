@@ -0,0 +1,43 @@
+import asyncio
+import json
+import threading
+import time
+
+from primeflix.catalog import Catalog
+from primeflix.core import Primeflix
+from primeflix.server import Server
+
+MOVIES = [{"title": "Heat", "year": 1995, "rating": 8.3, "genres": ["Crime"]},
+          {"title": "Alien", "year": 1979, "rating": 8.5, "genres": ["Horror"]}]
+
+
+async def _get(port, target):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {target} HTTP/1.1\r\nConnection: close\r\n\r\n".encode())
+    data = await reader.read()
+    writer.close()
+    return json.loads(data.split(b"\r\n\r\n", 1)[1])
+
+
+def test_slow_request_does_not_hold_up_other_clients():
+    core = Primeflix(Catalog.from_dicts(MOVIES))
+    core.index
+    release = threading.Event()
+    search_page = core.search_page
+    core.search_page = lambda *args: (release.wait(5), search_page(*args))[1]
+
+    async def run():
+        server = await Server(core, port=0).start()
+        slow = asyncio.ensure_future(_get(server.port, "/search?q=heat"))
+        await asyncio.sleep(0.05)
+        start = time.perf_counter()
+        health = await _get(server.port, "/health")
+        waited = time.perf_counter() - start
+        release.set()
+        found = await slow
+        await server.close()
+        return health, waited, found
+
+    health, waited, found = asyncio.run(run())
+    assert health["movies"] == 2 and waited < 1
+    assert [m["title"] for m in found["results"]] == ["Heat"]
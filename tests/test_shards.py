@@ -0,0 +1,54 @@
+from multiprocessing import shared_memory
+
+import pytest
+
+from primeflix.core import Primeflix
+from primeflix.shards import ShardedSearch
+from primeflix.synthetic import synthetic_catalog
+
+QUERIES = ["a", "ka", "king", "the king", "drama", "road t", "on the", "zzz", "kingg"]
+
+
+@pytest.fixture(scope="module")
+def cores():
+    catalog = synthetic_catalog(3000, descriptions=True)
+    for title in ("On the Road to Tulsa", "Road Trip", "Road T", "A Road T-Shirt", "Sea Road, Tide", "The Road Tour and T"):
+        catalog.append({"title": title, "year": 2001, "rating": 7.0, "genres": ["Drama"]})
+    plain, sharded = Primeflix(catalog), Primeflix(catalog)
+    sharded.shards = ShardedSearch(catalog, shards=3, workers=0)
+    for core in (plain, sharded):
+        core.index, core.text_index
+    yield plain, sharded
+    sharded.close()
+
+
+@pytest.mark.parametrize("q", QUERIES)
+@pytest.mark.parametrize("limit", [7, 50])
+def test_sharded_pages_match_unsharded(cores, q, limit):
+    plain, sharded = cores
+    cursors = [None, None]
+    for _ in range(4):
+        a = plain.search_page(q, limit, cursors[0])
+        b = sharded.search_page(q, limit, cursors[1])
+        assert (a.ids, a.total, a.cursor) == (b.ids, b.total, b.cursor)
+        cursors = [a.cursor, b.cursor]
+        if a.cursor is None:
+            break
+    assert plain.search_page(q, None).ids == sharded.search_page(q, None).ids
+
+
+def test_pool_workers_over_shared_memory(cores):
+    plain, _ = cores
+    search = ShardedSearch(plain.catalog, shards=3, workers=2)
+    inline = ShardedSearch(plain.catalog, shards=3, workers=0)
+    try:
+        for limit, cursor in [(20, None), (5, "1:0"), (None, None)]:
+            assert search.search_many(QUERIES, limit, cursor) == inline.search_many(QUERIES, limit, cursor)
+        names = [segment.name for segment in search._segments]
+        assert names and search._pool is not None
+    finally:
+        search.close()
+        inline.close()
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
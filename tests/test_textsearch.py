@@ -0,0 +1,44 @@
+from primeflix.catalog import Catalog
+from primeflix.core import Primeflix
+from primeflix.textsearch import TextIndex
+
+MOVIES = [
+    {"title": "Love Story", "year": 1970, "rating": 6.9, "genres": ["Romance"], "description": "A love that lasts."},
+    {"title": "Heat", "year": 1995, "rating": 8.3, "genres": ["Crime"], "description": "A thief falls in love."},
+    {"title": "Alien", "year": 1979, "rating": 8.5, "genres": ["Horror"], "description": "A crew in space."},
+]
+
+
+def test_zero_hits_asked_for():
+    index = TextIndex.build(Catalog.from_dicts(MOVIES))
+    ids, scores = index.search("love", 0)
+    assert len(ids) == 0 and len(scores) == 0
+    assert len(index.search("love", 1)[0]) == 1
+
+
+def test_description_tier_once_the_index_is_built():
+    core = Primeflix(Catalog.from_dicts(MOVIES))
+    assert core.search_page("thief", 10).ids == []  # text index not built yet
+    core.text_index
+    assert core.search_page("thief", 10).ids == [1]
+
+
+def test_appended_description_found_after_rebuild():
+    catalog = Catalog.from_dicts(MOVIES)
+    core = Primeflix(catalog)
+    core.text_index
+    new_id = catalog.append({"title": "Zed", "year": 2020, "rating": 6.0, "genres": ["Drama"],
+                             "description": "A qwertyflux machine."})
+    assert core.search_page("qwertyflux", 10).ids == []  # index is stale: no description tier yet
+    assert core.text_search_ids("qwertyflux") == [new_id]  # rebuilds
+    assert core.search_page("qwertyflux", 10).ids == [new_id]
+
+
+def test_rating_edit_keeps_the_text_index():
+    catalog = Catalog.from_dicts(MOVIES)
+    core = Primeflix(catalog)
+    text = core.text_index
+    catalog.set(0, "rating", 7.5)
+    assert core.text_index is text
+    catalog.set(0, "description", "A love that ends.")
+    assert core.text_index is not text